@@ -9,11 +9,11 @@ from markupsafe import Markup
 import markdown
 from . import database
 from . import cli
+from .models import User
 from .utils import format_datetime_simple, format_milliseconds
 
 login_manager = LoginManager()
 
-print("DEBUG: Starting create_app() in app/__init__.py")
 def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
 
@@ -34,10 +34,11 @@ def create_app(test_config=None):
         REMEMBER_COOKIE_SECURE=is_production,
         REMEMBER_COOKIE_HTTPONLY=True,
         REMEMBER_COOKIE_SAMESITE='Lax',
+        # Internal nginx location that maps onto app/static. When set, cached
+        # images found by the image proxy are handed to nginx to send.
+        IMAGE_ACCEL_REDIRECT_PREFIX=os.environ.get('IMAGE_ACCEL_REDIRECT_PREFIX'),
     )
 
-    print("DEBUG: Finished configuration setup")
-
     if test_config is None:
         # Load the instance config, if it exists, when not testing
         app.config.from_pyfile('config.py', silent=True)
@@ -45,16 +46,12 @@ def create_app(test_config=None):
         # Load the test config if passed in
         app.config.from_mapping(test_config)
 
-    print("DEBUG: Finished loading config")
-
     # Ensure the instance folder exists
     try:
         os.makedirs(app.instance_path)
     except OSError:
         pass # Already exists
 
-    print("DEBUG: Instance folder exists")
-
     # --- Logging Configuration ---
     # Place logs in a 'logs' directory at the project root
     log_dir = os.path.join(os.path.dirname(app.root_path), 'logs') 
@@ -67,20 +64,40 @@ def create_app(test_config=None):
         '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
     )
     file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO) # Set level for the handler
+    # LOG_LEVEL=DEBUG turns on the debug-level diagnostics; the default INFO
+    # level skips them before any message formatting happens.
+    log_level = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    file_handler.setLevel(log_level) # Set level for the handler
     
     # Add handler to Flask's logger and the root logger
     app.logger.addHandler(file_handler)
-    app.logger.setLevel(logging.INFO)
-    print(f"DEBUG: Logging enabled to file: {log_file}")
-
-    print("DEBUG: Finished logging setup")
+    app.logger.setLevel(log_level)
+    app.logger.debug("Logging enabled to file: %s", log_file)
+
+    # --- Server-side Sessions (optional) ---
+    # With SESSION_REDIS_URL set, session data is kept in Redis and the cookie
+    # only carries a signed session id. Needs the Flask-Session and redis
+    # packages; without them the default signed-cookie sessions are used.
+    session_redis_url = os.environ.get('SESSION_REDIS_URL')
+    if session_redis_url:
+        try:
+            import redis
+            from flask_session import Session
+        except ImportError:
+            app.logger.warning("SESSION_REDIS_URL is set but Flask-Session/redis are not installed; using cookie sessions.")
+        else:
+            app.config.update(
+                SESSION_TYPE='redis',
+                SESSION_REDIS=redis.Redis.from_url(session_redis_url, socket_keepalive=True),
+                SESSION_USE_SIGNER=True,
+            )
+            Session(app)
+            app.logger.info("Using Redis-backed server-side sessions.")
 
     # --- Database Setup ---
     # The init_app function in database_clean.py will register CLI commands like 'init-db'
     # It does NOT automatically create the database on app start anymore.
     database.init_app(app)
-    print("DEBUG: Finished database setup")
 
     cli.init_app(app) # Register CLI commands from app/cli.py
 
@@ -88,33 +105,16 @@ def create_app(test_config=None):
     login_manager.init_app(app)
     login_manager.login_view = 'main.login' # The route for the login page
 
-    # Define a simple User class for Flask-Login
-    # In a real app, this would likely be a more complex model (e.g., from SQLAlchemy)
-    class User:
-        # Basic User model for Flask-Login
-        def __init__(self, id, username, is_admin=False, plex_username=None):
-            self.id = id
-            self.username = username
-            self.plex_username = plex_username
-            self.is_admin = bool(is_admin) # Ensure it's a boolean
-            self.is_authenticated = True
-            self.is_active = True
-            self.is_anonymous = False
-
-        def get_id(self):
-            return str(self.id)
-
     @login_manager.user_loader
     def load_user(user_id):
         # This function is called by Flask-Login to get a User object for a given user_id
         try:
             db = database.get_db()
             user_data = db.execute(
-                'SELECT * FROM users WHERE id = ?', (user_id,)
+                'SELECT id, username, is_admin, plex_username FROM users WHERE id = ?', (user_id,)
             ).fetchone()
             if user_data:
-                plex_username = user_data['plex_username'] if 'plex_username' in user_data.keys() else None
-                return User(id=user_data['id'], username=user_data['username'], is_admin=user_data['is_admin'], plex_username=plex_username)
+                return User.from_row(user_data)
         except Exception as e:
             # Log the error if the database query fails (e.g., table not yet created)
             app.logger.error(f"Error loading user {user_id} from database: {e}")
@@ -195,10 +195,12 @@ def create_app(test_config=None):
                 response.cache_control.public = True
             return response
 
-        # Cache image proxy responses (poster, background, cast images)
-        if '/image-proxy/' in request_path or '/cast-image/' in request_path:
-            response.cache_control.max_age = 604800  # 1 week - images rarely change
-            response.cache_control.public = True
+        # Cache image proxy responses (poster, background, cast images).
+        # The proxy sets its own max-age (short for placeholders), so only fill it in if missing.
+        if request_path.startswith('/image_proxy/'):
+            if response.cache_control.max_age is None:
+                response.cache_control.max_age = 604800  # 1 week - images rarely change
+                response.cache_control.public = True
             return response
 
         # Cache calendar API responses (already cached server-side, but add browser cache)
@@ -207,6 +209,19 @@ def create_app(test_config=None):
             response.cache_control.public = True
             return response
 
+        # Search-as-you-type repeats the same query; let the browser reuse the
+        # per-user JSON briefly instead of re-hitting the database.
+        if request_path == '/search' and response.status_code == 200:
+            response.cache_control.max_age = 30
+            response.cache_control.private = True
+            return response
+
+        # The homepage is per-user: never share it, always revalidate.
+        if request_path == '/' and response.status_code == 200:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
         return response
 
     app.logger.info('ShowNotes application successfully created.')
@@ -4,6 +4,7 @@ import time
 import os
 import requests
 from . import database # Assuming database.py is in the same directory or app package
+from .http_client import http_session, if_modified_since_headers, stream_to_file
 from flask import current_app
 
 image_cli = AppGroup('image', help='Image processing commands.')
@@ -15,9 +16,7 @@ def get_required_api_key(service_name):
     # For now, let's assume direct image URLs from Sonarr/Radarr don't always need API keys
     # in the URL itself, but the proxy fetches them if needed.
     # The worker will need to replicate the proxy's fetching logic.
-    settings = database.get_db().execute(
-        'SELECT radarr_url, sonarr_url, radarr_api_key, sonarr_api_key FROM settings LIMIT 1'
-    ).fetchone()
+    settings = database._get_settings_row()
     if service_name == 'sonarr' and settings and settings['sonarr_api_key']:
         return settings['sonarr_api_key'], settings['sonarr_url']
     elif service_name == 'radarr' and settings and settings['radarr_api_key']:
@@ -62,6 +61,11 @@ def process_image_queue(limit, delay, max_attempts):
     os.makedirs(poster_dir, exist_ok=True)
     os.makedirs(background_dir, exist_ok=True)
 
+    # Service URLs and API keys don't change during a run; read them once
+    settings = database._get_settings_row()
+    radarr_base = settings['radarr_url'].rstrip('/') if settings and settings['radarr_url'] else None
+    sonarr_base = settings['sonarr_url'].rstrip('/') if settings and settings['sonarr_url'] else None
+
     for task in tasks:
         task_id = task['id']
         image_url = task['image_url']
@@ -102,10 +106,6 @@ def process_image_queue(limit, delay, max_attempts):
             # Now, replicate image_proxy's logic for adding API key if the URL matches service base.
             # (This was simplified in placeholder get_required_api_key, let's make it more direct here)
 
-            settings = db.execute('SELECT radarr_url, sonarr_url, radarr_api_key, sonarr_api_key FROM settings LIMIT 1').fetchone()
-            radarr_base = settings['radarr_url'].rstrip('/') if settings and settings['radarr_url'] else None
-            sonarr_base = settings['sonarr_url'].rstrip('/') if settings and settings['sonarr_url'] else None
-
             if sonarr_base and image_url.startswith(sonarr_base) and settings['sonarr_api_key']:
                 headers['X-Api-Key'] = settings['sonarr_api_key']
                 click.echo(f"Using Sonarr API key for {image_url}")
@@ -113,21 +113,24 @@ def process_image_queue(limit, delay, max_attempts):
                 headers['X-Api-Key'] = settings['radarr_api_key']
                 click.echo(f"Using Radarr API key for {image_url}")
 
-            response = requests.get(image_url, stream=True, headers=headers, timeout=20) # Increased timeout for downloads
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-
             if image_kind == 'background':
                 dest_dir = background_dir
             else:
                 dest_dir = poster_dir
 
             image_path = os.path.join(dest_dir, target_filename)
+            # Re-queued images that are already cached are only re-downloaded
+            # if the source has changed since
+            headers.update(if_modified_since_headers(image_path))
+
+            with http_session.get(image_url, stream=True, headers=headers, timeout=20) as response: # Increased timeout for downloads
+                response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+                if response.status_code == 304:
+                    click.echo(f"{target_filename} is unchanged, keeping the cached copy")
+                else:
+                    stream_to_file(response, image_path)
+                    click.echo(f"Successfully downloaded and cached {target_filename}")
 
-            with open(image_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            click.echo(f"Successfully downloaded and cached {target_filename}")
             success = True
 
         except requests.exceptions.RequestException as e:
@@ -4,6 +4,20 @@ import pytz
 from flask import current_app, g
 from . import database
 
+# Patterns for the LLM markdown parsers below
+_MD_SECTION_HEADER_RE = re.compile(r"^##\s+(.+)")
+_RELATIONSHIP_RE = re.compile(r'relationship_\d+: name: "([^"]*)" role: "([^"]*)" description: "([^"]*)"')
+_QUOTE_RE = re.compile(r'quote: "([^"]+)"')
+_DESCRIPTION_RE = re.compile(r'description: (.+)')
+
+# Strips HTML tags from episode and show summaries fetched from TVMaze and
+# TheTVDB; shared by the enrichment services.
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Parses the "S01E02" strings stored in plex_activity_log.season_episode.
+# Compiled once here because it runs per row when building history/detail links.
+SEASON_EPISODE_RE = re.compile(r'S(\d+)E(\d+)')
+
 def format_datetime_simple(value, format_str='%b %d, %Y %H:%M'):
     """
     Jinja2 filter to format a datetime object into a more readable string.
@@ -42,8 +56,7 @@ def format_datetime_simple(value, format_str='%b %d, %Y %H:%M'):
         try:
             from flask import g
             if not hasattr(g, '_timezone_setting'):
-                db = database.get_db()
-                settings = db.execute('SELECT timezone FROM settings LIMIT 1').fetchone()
+                settings = database._get_settings_row()
                 g._timezone_setting = settings['timezone'] if settings and settings['timezone'] else 'UTC'
             tz_name = g._timezone_setting
         except Exception:
@@ -89,11 +102,10 @@ def parse_llm_markdown_sections(md):
     Parse markdown output from LLM into a dict of sections.
     Each '## Section Name' becomes a key, and its content is the value.
     """
-    import re
     sections = {}
     current = None
     for line in md.splitlines():
-        header_match = re.match(r"^##\s+(.+)", line)
+        header_match = _MD_SECTION_HEADER_RE.match(line)
         if header_match:
             current = header_match.group(1).strip()
             sections[current] = ''
@@ -106,10 +118,8 @@ def parse_llm_markdown_sections(md):
 
 def parse_relationships_section(md):
     # Expects lines like: relationship_1: name: "X" role: "Y" description: "Z"
-    import re
     relationships = []
-    pattern = re.compile(r'relationship_\d+: name: "([^"]*)" role: "([^"]*)" description: "([^"]*)"')
-    for match in pattern.finditer(md):
+    for match in _RELATIONSHIP_RE.finditer(md):
         relationships.append({
             'name': match.group(1),
             'role': match.group(2),
@@ -119,7 +129,6 @@ def parse_relationships_section(md):
 
 def parse_traits_section(md):
     # Expects lines like: traits: - "Trait1" - "Trait2"
-    import re
     traits = []
     lines = md.splitlines()
     for line in lines:
@@ -130,7 +139,6 @@ def parse_traits_section(md):
 
 def parse_events_section(md):
     # Expects lines like: events: - "Event1" - "Event2"
-    import re
     events = []
     lines = md.splitlines()
     for line in lines:
@@ -141,20 +149,17 @@ def parse_events_section(md):
 
 def parse_quote_section(md):
     # Expects: quote: "..."
-    import re
-    match = re.search(r'quote: "([^"]+)"', md)
+    match = _QUOTE_RE.search(md)
     return match.group(1) if match else md.strip()
 
 def parse_motivations_section(md):
     # Expects: description: ...
-    import re
-    match = re.search(r'description: (.+)', md)
+    match = _DESCRIPTION_RE.search(md)
     return match.group(1).strip() if match else md.strip()
 
 def parse_importance_section(md):
     # Expects: description: ...
-    import re
-    match = re.search(r'description: (.+)', md)
+    match = _DESCRIPTION_RE.search(md)
     return match.group(1).strip() if match else md.strip()
 
 def get_user_timezone():
@@ -1,3 +1,4 @@
+import os
 import sqlite3
 import time
 import threading
@@ -11,8 +12,52 @@ _SETTINGS_CACHE_TTL = 60
 _settings_cache = {
     'row': None,
     'timestamp': 0,
+    'stamp': None,
 }
 _settings_cache_lock = threading.Lock()
+# Each gunicorn worker keeps its own settings cache. A settings write touches
+# this file next to the database, and every worker reloads once its mtime
+# changes, so a save is seen everywhere on the next request instead of after
+# the TTL.
+_SETTINGS_STAMP_SUFFIX = '.settings-stamp'
+# journal_mode=WAL is persisted in the database file, so it only needs to be
+# issued once per database path per process; synchronous is per-connection.
+_wal_enabled_paths = set()
+_wal_lock = threading.Lock()
+# Idle connections returned by close_db, per database path. Reusing them skips
+# the open and per-connection PRAGMAs on every request and keeps each
+# connection's prepared-statement cache warm.
+_POOL_MAX_IDLE = 8
+_connection_pool = {}
+_connection_pool_lock = threading.Lock()
+
+# External-content FTS5 indexes over library titles for /search, kept in step
+# with their source tables by triggers. The update trigger only fires on title
+# changes, so routine sync upserts don't rewrite the index.
+def _search_fts_statements(table):
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(title, content='{table}', content_rowid='id')",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts(rowid, title) VALUES (new.id, new.title);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF title ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO {table}_fts(rowid, title) VALUES (new.id, new.title);
+        END""",
+        f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+    ]
+
+# Per-connection tuning applied on every open; journal_mode=WAL is persistent
+# in the database file, so it only needs setting once per path (above).
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # Safe under WAL; drops the per-commit fsync on webhook writes
+    "PRAGMA mmap_size=268435456",  # 256 MiB memory-mapped reads
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA temp_store=MEMORY",  # Sort/temp b-trees for ORDER BY and FTS stay in memory
+)
 
 # Define the current schema version. Increment this when you make schema changes.
 CURRENT_SCHEMA_VERSION = 5 # Incremented for recap pipeline tables
@@ -27,23 +72,59 @@ def get_db_connection():
     conn = sqlite3.connect(
         current_app.config['DATABASE'],
         detect_types=sqlite3.PARSE_DECLTYPES,
-        timeout=30  # Wait up to 30 seconds for database lock to clear
+        timeout=30,  # Wait up to 30 seconds for database lock to clear
+        cached_statements=256,  # Hot webhook/homepage queries stay prepared per connection
+        check_same_thread=False  # Pooled connections move between request threads (one at a time)
     )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
+    if db_path not in _wal_enabled_paths:
+        with _wal_lock:
+            if db_path not in _wal_enabled_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                _wal_enabled_paths.add(db_path)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     logger.debug(f"Successfully connected to database at: {db_path}")
     return conn
 
+def _checkout_connection():
+    db_path = current_app.config['DATABASE']
+    with _connection_pool_lock:
+        idle = _connection_pool.get(db_path)
+        if idle:
+            return idle.pop()
+    return get_db_connection()
+
+def _release_connection(conn):
+    """Returns ``conn`` to the pool, or closes it if the pool is full."""
+    try:
+        if conn.in_transaction:
+            conn.rollback()  # Never hand uncommitted work to the next request
+    except sqlite3.Error:
+        conn.close()
+        return
+    with _connection_pool_lock:
+        idle = _connection_pool.setdefault(current_app.config['DATABASE'], [])
+        if len(idle) < _POOL_MAX_IDLE:
+            idle.append(conn)
+            return
+    conn.close()
+
 def get_db():
     if 'db' not in g:
-        g.db = get_db_connection()
+        g.db = _checkout_connection()
     return g.db
 
 def close_db(e=None):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        _release_connection(db)
+
+def _settings_stamp():
+    try:
+        return os.stat(current_app.config['DATABASE'] + _SETTINGS_STAMP_SUFFIX).st_mtime_ns
+    except OSError:
+        return None
 
 def _invalidate_settings_cache():
     with _settings_cache_lock:
@@ -51,14 +132,24 @@ def _invalidate_settings_cache():
         _settings_cache['timestamp'] = 0
     if hasattr(g, 'settings_row_cache'):
         delattr(g, 'settings_row_cache')
+    stamp_path = current_app.config['DATABASE'] + _SETTINGS_STAMP_SUFFIX
+    try:
+        with open(stamp_path, 'a'):
+            pass
+        os.utime(stamp_path)
+    except OSError as e:
+        current_app.logger.warning(f"Could not update settings stamp {stamp_path}: {e}")
 
 def _get_settings_row():
     if hasattr(g, 'settings_row_cache'):
         return g.settings_row_cache
 
     now = time.time()
+    stamp = _settings_stamp()
     with _settings_cache_lock:
-        if _settings_cache['row'] is not None and now - _settings_cache['timestamp'] < _SETTINGS_CACHE_TTL:
+        if (_settings_cache['row'] is not None
+                and now - _settings_cache['timestamp'] < _SETTINGS_CACHE_TTL
+                and _settings_cache['stamp'] == stamp):
             g.settings_row_cache = _settings_cache['row']
             return g.settings_row_cache
 
@@ -69,6 +160,7 @@ def _get_settings_row():
     with _settings_cache_lock:
         _settings_cache['row'] = row_dict
         _settings_cache['timestamp'] = now
+        _settings_cache['stamp'] = stamp
 
     g.settings_row_cache = row_dict
     return row_dict
@@ -714,6 +806,16 @@ def init_db():
                 FOREIGN KEY (api_usage_id) REFERENCES api_usage(id) ON DELETE SET NULL
             );
 
+            CREATE TABLE summary_tasks (
+                task_id TEXT PRIMARY KEY,
+                tmdb_id INTEGER NOT NULL,
+                season_number INTEGER,
+                status TEXT NOT NULL DEFAULT 'running',
+                error_message TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+
             CREATE INDEX IF NOT EXISTS idx_llm_prompts_key ON llm_prompts(prompt_key);
             CREATE INDEX IF NOT EXISTS idx_show_summaries_show ON show_summaries(show_id);
             CREATE INDEX IF NOT EXISTS idx_show_summaries_lookup ON show_summaries(show_id, season_number, episode_number);
@@ -782,6 +884,14 @@ def init_db():
         db.execute('CREATE INDEX IF NOT EXISTS idx_radarr_movies_title_lower ON radarr_movies(LOWER(title));')
         # Composite index for the homepage recent-activity query (filters on all three columns)
         db.execute('CREATE INDEX IF NOT EXISTS idx_plex_activity_user_type_time ON plex_activity_log(plex_username, event_type, event_timestamp);')
+        try:
+            for table in ('sonarr_shows', 'radarr_movies'):
+                db.execute(f'DROP TABLE IF EXISTS {table}_fts;')
+                for fts_sql in _search_fts_statements(table):
+                    db.execute(fts_sql)
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE matching in /search
+            logger.warning(f"Could not create full-text search tables: {e}")
         logger.info("Search indexes created.")
 
         # Add performance indexes for common query patterns
@@ -791,6 +901,8 @@ def init_db():
             'CREATE INDEX IF NOT EXISTS idx_sonarr_shows_tmdb_id ON sonarr_shows(tmdb_id);',
             'CREATE INDEX IF NOT EXISTS idx_radarr_movies_tmdb_id ON radarr_movies(tmdb_id);',
             'CREATE INDEX IF NOT EXISTS idx_radarr_movies_title ON radarr_movies(title);',
+            'CREATE INDEX IF NOT EXISTS idx_sonarr_shows_title_nocase ON sonarr_shows(title COLLATE NOCASE);',
+            'CREATE INDEX IF NOT EXISTS idx_radarr_movies_title_nocase ON radarr_movies(title COLLATE NOCASE);',
             'CREATE INDEX IF NOT EXISTS idx_radarr_movies_upcoming ON radarr_movies(has_file, monitored, availability_date);',
             'CREATE INDEX IF NOT EXISTS idx_radarr_movies_recent_additions ON radarr_movies(has_file, movie_file_added_date);',
             'CREATE INDEX IF NOT EXISTS idx_sonarr_episodes_lookup ON sonarr_episodes(season_id, episode_number);',
@@ -802,6 +914,9 @@ def init_db():
             'CREATE INDEX IF NOT EXISTS idx_plex_activity_user_event ON plex_activity_log(plex_username, event_type);',
             'CREATE INDEX IF NOT EXISTS idx_plex_activity_user_event_time ON plex_activity_log(plex_username, event_type, event_timestamp);',
             'CREATE INDEX IF NOT EXISTS idx_plex_activity_media_type ON plex_activity_log(media_type);',
+            'CREATE INDEX IF NOT EXISTS idx_plex_activity_user_media_show ON plex_activity_log(plex_username, media_type, show_title);',
+            'CREATE INDEX IF NOT EXISTS idx_plex_activity_user_tmdb_time ON plex_activity_log(plex_username, tmdb_id, event_timestamp);',
+            'CREATE INDEX IF NOT EXISTS idx_plex_activity_show_episode_time ON plex_activity_log(show_title, season_episode, event_timestamp);',
             'CREATE INDEX IF NOT EXISTS idx_user_episode_progress_show ON user_episode_progress(user_id, show_id);',
             'CREATE INDEX IF NOT EXISTS idx_user_show_progress_user ON user_show_progress(user_id);',
             'CREATE INDEX IF NOT EXISTS idx_user_notifications_user_read ON user_notifications(user_id, is_read);',
@@ -812,6 +927,11 @@ def init_db():
             'CREATE INDEX IF NOT EXISTS idx_problem_reports_status_created ON problem_reports(status, created_at DESC);',
             'CREATE INDEX IF NOT EXISTS idx_announcements_active_dates ON announcements(is_active, start_date, end_date);',
             'CREATE INDEX IF NOT EXISTS idx_user_episode_progress_watched ON user_episode_progress(user_id, is_watched);',
+            'CREATE INDEX IF NOT EXISTS idx_users_is_admin ON users(is_admin) WHERE is_admin = 1;',
+            'CREATE INDEX IF NOT EXISTS idx_plex_activity_event_time ON plex_activity_log(event_type, event_timestamp);',
+            'CREATE INDEX IF NOT EXISTS idx_radarr_movies_synced_file ON radarr_movies(last_synced_at, has_file);',
+            'CREATE INDEX IF NOT EXISTS idx_sonarr_shows_synced ON sonarr_shows(last_synced_at);',
+            'CREATE INDEX IF NOT EXISTS idx_api_usage_time_covering ON api_usage(timestamp, provider, cost_usd, processing_time_ms);',
         ]
         for idx_sql in performance_indexes:
             db.execute(idx_sql)
@@ -850,6 +970,28 @@ def set_setting(key, value):
     except sqlite3.OperationalError as e:
         logger.error(f"Could not set setting '{key}': {e}", exc_info=True)
 
+def set_settings(values):
+    """
+    Writes several settings columns in one UPDATE and one commit.
+
+    If the statement fails (for example a column from a migration that has not
+    been applied), falls back to set_setting() per key so the columns that do
+    exist are still saved.
+    """
+    if not values:
+        return
+    db = get_db()
+    assignments = ', '.join(f'{key}=?' for key in values)
+    try:
+        db.execute(f'UPDATE settings SET {assignments}', tuple(values.values()))
+        db.commit()
+    except sqlite3.OperationalError:
+        db.rollback()
+        for key, value in values.items():
+            set_setting(key, value)
+        return
+    _invalidate_settings_cache()
+
 def update_sync_status(conn, service_name, status, message=None):
     """Updates the synchronization status for a given service."""
     cursor = conn.cursor()
@@ -13,6 +13,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 from sqlite3 import Row
 from app.database import get_db
+from app.data_transforms import HTML_TAG_RE
+from app.http_client import http_session
 from flask import has_app_context
 
 logger = logging.getLogger(__name__)
@@ -92,7 +94,7 @@ class EpisodeDataService:
         self._rate_limit_check()
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -216,7 +218,7 @@ class TheTVDBService(EpisodeDataService):
             return True
 
         try:
-            resp = requests.post(
+            resp = http_session.post(
                 f"{self.base_url}/login",
                 json={"apikey": self.api_key},
                 timeout=10
@@ -243,7 +245,7 @@ class TheTVDBService(EpisodeDataService):
 
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.get(url, params=params, headers=headers, timeout=15)
+            response = http_session.get(url, params=params, headers=headers, timeout=15)
 
             # Handle token expiry
             if response.status_code == 401:
@@ -252,7 +254,7 @@ class TheTVDBService(EpisodeDataService):
                 if not self._ensure_token():
                     return None
                 headers = {"Authorization": f"Bearer {self.token}"}
-                response = requests.get(url, params=params, headers=headers, timeout=15)
+                response = http_session.get(url, params=params, headers=headers, timeout=15)
 
             response.raise_for_status()
             return response.json()
@@ -394,8 +396,7 @@ class EpisodeDataManager:
         
         try:
             # Clean HTML tags from summary
-            import re
-            clean_summary = re.sub(r'<[^>]+>', '', summary_data['summary'])
+            clean_summary = HTML_TAG_RE.sub('', summary_data['summary'])
             
             db.execute("""
                 INSERT OR REPLACE INTO episode_summaries 
@@ -0,0 +1,79 @@
+"""
+Shared HTTP session for outbound calls to Plex, Sonarr, Radarr and other services.
+
+Module-level ``requests.get()``/``requests.post()`` build a throwaway session per
+call, so every request pays for a new TCP (and TLS) handshake. Routing calls
+through ``http_session`` keeps connections to each service alive between calls.
+
+Pass per-call headers rather than mutating ``http_session.headers``; the session
+is shared by every request thread and background job. It never stores cookies.
+"""
+import http.cookiejar
+import os
+import shutil
+import threading
+from email.utils import formatdate
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_POOL_CONNECTIONS = 16  # Distinct hosts kept in the pool
+_POOL_MAXSIZE = 32  # Concurrent connections per host
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024  # Far above any poster/fanart; guards against a wrong URL
+# Retry failures to connect, which are safe for any method. Read errors and
+# timeouts are not retried so a hung service can't multiply the timeout in a
+# request, and HTTP error statuses are returned as-is.
+_RETRY = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+
+http_session = requests.Session()
+# The session is only for connection pooling. It is shared by every user and
+# service, so cookies from one response must never be replayed on another.
+http_session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+http_session.mount('http://', HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY))
+http_session.mount('https://', HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY))
+
+
+def if_modified_since_headers(path):
+    """
+    Returns an ``If-Modified-Since`` header for refreshing the file at ``path``.
+
+    The file's mtime is the time it was last downloaded, so a server that
+    supports conditional requests answers 304 with no body if the image has
+    not changed since. Returns an empty dict if the file does not exist.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    return {'If-Modified-Since': formatdate(mtime, usegmt=True)}
+
+
+def stream_to_file(resp, dest_path, max_bytes=_MAX_DOWNLOAD_BYTES):
+    """
+    Copies an open ``stream=True`` response body to ``dest_path``.
+
+    The copy runs in ``shutil.copyfileobj`` with 1 MiB blocks rather than a
+    Python loop over small chunks. The body goes to a ``.part`` file first and
+    is moved into place once complete, so an interrupted download never
+    leaves a truncated file behind.
+
+    Raises IOError for bodies over ``max_bytes``: up front when the server
+    sends a Content-Length, otherwise once the copy finishes.
+    """
+    content_length = resp.headers.get('Content-Length', '')
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise IOError(f"Refusing {content_length}-byte download for {dest_path} (limit {max_bytes})")
+
+    tmp_path = f"{dest_path}.{threading.get_ident()}.part"
+    resp.raw.decode_content = True
+    try:
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(resp.raw, f, _DOWNLOAD_CHUNK_SIZE)
+            if f.tell() > max_bytes:
+                raise IOError(f"Download for {dest_path} exceeded {max_bytes} bytes")
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,248 @@
+"""
+Local image cache for posters, backgrounds and cast photos.
+
+Downloads and thumbnail generation for page requests run on a small shared
+pool; library-sync prefetch runs on its own low-priority pool so a cold-cache
+sync never queues ahead of them. Each destination file has at most one job in
+flight across both pools: image_proxy requests from several browsers and the
+library-sync prefetch all wait on the same future instead of fetching or
+resizing into the same file in parallel. Files are written through a ``.part``
+file and moved into place, so a reader never sees a half-written image.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import current_app
+
+from . import database
+from .http_client import http_session, stream_to_file
+
+POSTER_THUMBNAIL_SIZE = (240, 360)
+POSTER_THUMBNAIL_QUALITY = 78
+
+_image_download_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='image-cache')
+# A first sync on a cold cache queues a download for every poster and
+# background in the library; they drain here, behind nothing interactive.
+_image_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-prefetch')
+_inflight_downloads = {}  # dest_path -> (Future of the job writing it, pool it runs on)
+# Reentrant: cancelling a queued prefetch runs its done callback, which takes
+# the lock, in the thread that cancelled it.
+_inflight_downloads_lock = threading.RLock()
+
+# Cache files known to be on disk. Cached images are never deleted while the
+# app runs, so a positive answer stays true; misses are always re-checked.
+_KNOWN_CACHED_MAX = 2048
+_known_cached_paths = set()
+_known_cached_paths_lock = threading.Lock()
+
+
+def cached_image_path(image_type, tmdb_id, variant='full'):
+    if variant == 'thumb':
+        return os.path.join(current_app.static_folder, image_type, 'thumbs', f'{tmdb_id}.jpg')
+    return os.path.join(current_app.static_folder, image_type, f'{tmdb_id}.jpg')
+
+
+def _remember_cached(path):
+    with _known_cached_paths_lock:
+        if len(_known_cached_paths) >= _KNOWN_CACHED_MAX:
+            _known_cached_paths.clear()
+        _known_cached_paths.add(path)
+
+
+def is_image_cached(path):
+    """
+    Returns True if ``path`` is in the image cache.
+
+    Repeat checks for an image already seen on disk are a set lookup rather
+    than a stat() call.
+    """
+    if path in _known_cached_paths:
+        return True
+    if os.path.exists(path):
+        _remember_cached(path)
+        return True
+    return False
+
+
+def is_image_known_cached(path):
+    """
+    Returns True if ``path`` is known to be in the image cache, without a stat().
+
+    Covers images downloaded or served by this process; False means unknown,
+    not missing.
+    """
+    return path in _known_cached_paths
+
+
+def generate_poster_thumbnail(full_path, thumb_path):
+    """
+    Writes a JPEG thumbnail of ``full_path`` to ``thumb_path``.
+
+    Like downloads, the thumbnail is written to a ``.part`` file and moved into
+    place, since image_proxy serves any thumbnail that exists.
+    """
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+    tmp_path = f"{thumb_path}.{threading.get_ident()}.part"
+    try:
+        with Image.open(full_path) as img:
+            img = img.convert('RGB')
+            img.thumbnail(POSTER_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+            img.save(tmp_path, format='JPEG', quality=POSTER_THUMBNAIL_QUALITY, optimize=True)
+        os.replace(tmp_path, thumb_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def service_image_request(url, source):
+    """
+    Returns ``(absolute_url, headers)`` for an image stored by Sonarr/Radarr.
+
+    Relative paths are resolved against the service URL and the service API
+    key is added. Returns ``(None, None)`` if a relative path cannot be
+    resolved because the service URL is not configured.
+    """
+    settings = database._get_settings_row() or {}
+    if url.startswith('/'):
+        service_url = settings.get(f'{source}_url')
+        if not service_url:
+            return None, None
+        url = f"{service_url.rstrip('/')}{url}"
+
+    headers = {}
+    api_key = settings.get(f'{source}_api_key')
+    if api_key:
+        headers['X-Api-Key'] = api_key
+    return url, headers
+
+
+def _fetch_image_to_cache(app_instance, url, headers, dest_path, thumb_path=None):
+    """
+    Downloads ``url`` into the image cache. Runs on ``_image_download_pool``.
+
+    When ``thumb_path`` is given, a poster thumbnail is generated from the
+    downloaded image as well. Returns True if the image was cached.
+    """
+    with app_instance.app_context():
+        try:
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            with http_session.get(url, headers=headers, stream=True, timeout=10) as resp:
+                resp.raise_for_status()
+                stream_to_file(resp, dest_path)
+        except (requests.RequestException, IOError) as e:
+            current_app.logger.error(f"Failed to fetch or cache image from {url}. Error: {e}")
+            return False
+
+        if thumb_path:
+            try:
+                generate_poster_thumbnail(dest_path, thumb_path)
+            except Exception as e:
+                current_app.logger.warning(f"Failed to generate thumbnail for {dest_path}: {e}")
+
+        _remember_cached(dest_path)
+        current_app.logger.info(f"Cached image: {dest_path}")
+        return True
+
+
+def _forget_inflight_download(dest_path, future):
+    with _inflight_downloads_lock:
+        entry = _inflight_downloads.get(dest_path)
+        if entry is not None and entry[0] is future:
+            del _inflight_downloads[dest_path]
+
+
+def _generate_thumbnail_in_cache(app_instance, full_path, thumb_path):
+    """
+    Generates a poster thumbnail from an already cached image. Runs on
+    ``_image_download_pool``. Returns True if the thumbnail was cached.
+    """
+    with app_instance.app_context():
+        try:
+            generate_poster_thumbnail(full_path, thumb_path)
+        except Exception as e:
+            current_app.logger.warning(f"Failed to generate thumbnail for {full_path}: {e}")
+            return False
+        _remember_cached(thumb_path)
+        return True
+
+
+def _submit_once(dest_path, fn, *args, pool=_image_download_pool):
+    """
+    Queues ``fn(app, *args)`` on ``pool`` to write ``dest_path`` and returns
+    its future.
+
+    If a job writing ``dest_path`` is already in flight, its future is
+    returned instead of starting another one. The exception is a prefetch
+    still waiting in the low-priority queue when a page asks for the same
+    file: it is cancelled and the job moves to the interactive pool.
+    """
+    submitted = False
+    with _inflight_downloads_lock:
+        entry = _inflight_downloads.get(dest_path)
+        future = entry[0] if entry else None
+        if (future is not None and entry[1] is _image_prefetch_pool
+                and pool is _image_download_pool and future.cancel()):
+            future = None
+        if future is None:
+            future = pool.submit(fn, current_app._get_current_object(), *args)
+            _inflight_downloads[dest_path] = (future, pool)
+            submitted = True
+    if submitted:
+        # Registered outside the lock: an already-finished future runs the
+        # callback immediately, and the callback takes the lock itself.
+        future.add_done_callback(lambda f: _forget_inflight_download(dest_path, f))
+    return future
+
+
+def submit_image_download(url, headers, dest_path, thumb_path=None, low_priority=False):
+    """
+    Queues a download of ``url`` to ``dest_path`` and returns its future,
+    sharing the future of a download to ``dest_path`` already in flight.
+
+    ``low_priority`` downloads go on the prefetch pool.
+    """
+    pool = _image_prefetch_pool if low_priority else _image_download_pool
+    return _submit_once(dest_path, _fetch_image_to_cache, url, headers, dest_path, thumb_path, pool=pool)
+
+
+def submit_thumbnail(full_path, thumb_path):
+    """
+    Queues thumbnail generation from a cached poster and returns its future,
+    sharing the future of one for ``thumb_path`` already in flight.
+    """
+    return _submit_once(thumb_path, _generate_thumbnail_in_cache, full_path, thumb_path)
+
+
+def prefetch_media_image(image_type, tmdb_id, url, source, low_priority=False):
+    """
+    Queues a poster/background download, without waiting.
+
+    Skips images that are already cached. Posters also get their thumbnail.
+    Library syncs pass ``low_priority`` so their downloads use the prefetch pool.
+    """
+    dest_path = cached_image_path(image_type, tmdb_id)
+    if not url or is_image_cached(dest_path):
+        return
+    url, headers = service_image_request(url, source)
+    if not url:
+        return
+    thumb_path = cached_image_path(image_type, tmdb_id, variant='thumb') if image_type == 'poster' else None
+    submit_image_download(url, headers, dest_path, thumb_path, low_priority=low_priority)
+
+
+def prefetch_detail_images(tmdb_id, poster_url, fanart_url, source):
+    """
+    Starts the poster and background downloads for a detail page together.
+
+    Both go onto the pool before the page is rendered, so on a cold cache the
+    two image_proxy requests that follow find the downloads already running
+    side by side instead of each starting its own.
+    """
+    if not tmdb_id:
+        return
+    prefetch_media_image('poster', tmdb_id, poster_url, source)
+    prefetch_media_image('background', tmdb_id, fanart_url, source)
@@ -11,6 +11,7 @@ import requests
 from openai import OpenAI
 from flask import current_app
 from .database import get_db, get_setting
+from .http_client import http_session
 
 
 def _log_api_usage(db, provider, endpoint, prompt_tokens=None, completion_tokens=None,
@@ -124,7 +125,7 @@ def _call_ollama(db, prompt_text, llm_model_name=None):
 
     try:
         start = time.perf_counter()
-        resp = requests.post(endpoint, json={"model": model, "prompt": prompt_text, "stream": False}, timeout=180)
+        resp = http_session.post(endpoint, json={"model": model, "prompt": prompt_text, "stream": False}, timeout=180)
         elapsed_ms = int((time.perf_counter() - start) * 1000)
         resp.raise_for_status()
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Migration 046: Add admin user and activity event-type indexes
+
+is_onboarding_complete() looks up `users WHERE is_admin = 1 LIMIT 1` on every
+page load, and the admin dashboard counts plex_activity_log rows by event type.
+A partial index on admin users and an (event_type, event_timestamp) index let
+both stop at the first matching index entry instead of scanning the table.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    indexes = [
+        ('idx_users_is_admin',
+         'CREATE INDEX idx_users_is_admin ON users(is_admin) WHERE is_admin = 1'),
+        ('idx_plex_activity_event_time',
+         'CREATE INDEX idx_plex_activity_event_time ON plex_activity_log(event_type, event_timestamp)'),
+    ]
+    try:
+        for name, sql in indexes:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+            else:
+                cursor.execute(sql)
+                print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Migration 047: Add FTS5 title indexes for /search
+
+/search matched titles with LIKE '%term%', which scans every row of
+sonarr_shows and radarr_movies. This adds external-content FTS5 tables over
+the title columns, triggers to keep them in step with their source tables,
+and populates them from the existing rows.
+"""
+import os, sqlite3
+
+
+def _fts_statements(table):
+    return [
+        f"CREATE VIRTUAL TABLE {table}_fts USING fts5(title, content='{table}', content_rowid='id')",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts(rowid, title) VALUES (new.id, new.title);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF title ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO {table}_fts(rowid, title) VALUES (new.id, new.title);
+        END""",
+        f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+    ]
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        for table in ('sonarr_shows', 'radarr_movies'):
+            name = f'{table}_fts'
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+                continue
+            for sql in _fts_statements(table):
+                cursor.execute(sql)
+            print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
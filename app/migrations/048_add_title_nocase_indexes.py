@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Migration 048: Add case-insensitive title indexes
+
+SQLite's LIKE is case-insensitive, so the plain title indexes cannot serve it
+and the LOWER(title) indexes only match queries that spell out LOWER(). The
+/search fallback (used when the FTS5 tables are unavailable) runs a prefix
+`title LIKE 'term%'`, which SQLite answers from an index declared
+COLLATE NOCASE.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    indexes = [
+        ('idx_sonarr_shows_title_nocase',
+         'CREATE INDEX idx_sonarr_shows_title_nocase ON sonarr_shows(title COLLATE NOCASE)'),
+        ('idx_radarr_movies_title_nocase',
+         'CREATE INDEX idx_radarr_movies_title_nocase ON radarr_movies(title COLLATE NOCASE)'),
+    ]
+    try:
+        for name, sql in indexes:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+            else:
+                cursor.execute(sql)
+                print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
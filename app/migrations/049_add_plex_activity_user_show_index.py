@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Migration 049: Add a per-user watched-shows index on plex_activity_log
+
+The homepage looks up every show a user has watched by filtering
+plex_activity_log on plex_username and media_type = 'episode' and joining on
+show_title. The existing (plex_username, event_type, event_timestamp) indexes
+cannot narrow on media_type and still read each matching row from the table;
+(plex_username, media_type, show_title) answers the lookup from the index alone.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    indexes = [
+        ('idx_plex_activity_user_media_show',
+         'CREATE INDEX idx_plex_activity_user_media_show ON plex_activity_log(plex_username, media_type, show_title)'),
+    ]
+    try:
+        for name, sql in indexes:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+            else:
+                cursor.execute(sql)
+                print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Migration 050: Add latest-event indexes on plex_activity_log
+
+Show detail looks up a user's most recent event for a show with
+plex_username = ? AND tmdb_id = ? ORDER BY event_timestamp DESC LIMIT 1, and
+episode detail (and the admin recap tools) look up the most recent event for an
+episode by show_title and season_episode. The existing indexes narrow on only
+one of those columns and sort the matches; these let SQLite walk the index
+from the newest matching row and stop at the first one that fits.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    indexes = [
+        ('idx_plex_activity_user_tmdb_time',
+         'CREATE INDEX idx_plex_activity_user_tmdb_time ON plex_activity_log(plex_username, tmdb_id, event_timestamp)'),
+        ('idx_plex_activity_show_episode_time',
+         'CREATE INDEX idx_plex_activity_show_episode_time ON plex_activity_log(show_title, season_episode, event_timestamp)'),
+    ]
+    try:
+        for name, sql in indexes:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+            else:
+                cursor.execute(sql)
+                print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Migration 051: Add covering indexes for the admin dashboard counts
+
+The dashboard reads radarr_movies, sonarr_shows and api_usage once each with
+conditional aggregates over last_synced_at/has_file and timestamp/provider/
+cost_usd/processing_time_ms. These indexes hold exactly those columns, so the
+passes read the narrow index instead of the full rows (overviews, genres,
+endpoints), and the weekly api_usage figures become an index range scan.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    indexes = [
+        ('idx_radarr_movies_synced_file',
+         'CREATE INDEX idx_radarr_movies_synced_file ON radarr_movies(last_synced_at, has_file)'),
+        ('idx_sonarr_shows_synced',
+         'CREATE INDEX idx_sonarr_shows_synced ON sonarr_shows(last_synced_at)'),
+        ('idx_api_usage_time_covering',
+         'CREATE INDEX idx_api_usage_time_covering ON api_usage(timestamp, provider, cost_usd, processing_time_ms)'),
+    ]
+    try:
+        for name, sql in indexes:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+            if cursor.fetchone():
+                print(f'  [skip] {name} already exists')
+            else:
+                cursor.execute(sql)
+                print(f'  [ok] Created {name}')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
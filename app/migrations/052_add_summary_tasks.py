@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Migration 052: Add summary_tasks for background summary generation
+
+The show page starts a summary job in one gunicorn worker and polls for its
+outcome, and each poll can land on any worker. The job's status is kept in
+this table so every worker can answer.
+"""
+import os, sqlite3
+
+
+def upgrade():
+    db_path = os.environ.get('SHOWNOTES_DB') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'instance', 'shownotes.sqlite3',
+    )
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='summary_tasks'")
+        if cursor.fetchone():
+            print('  [skip] summary_tasks already exists')
+        else:
+            cursor.execute('''
+                CREATE TABLE summary_tasks (
+                    task_id TEXT PRIMARY KEY,
+                    tmdb_id INTEGER NOT NULL,
+                    season_number INTEGER,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    error_message TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            print('  [ok] Created summary_tasks')
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f'Error: {e}')
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    upgrade()
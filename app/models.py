@@ -0,0 +1,27 @@
+"""
+Flask-Login user model.
+
+Kept outside ``create_app`` so login routes can build the user straight from a
+row they have already fetched instead of going back through the user loader.
+"""
+
+
+class User:
+    # Basic User model for Flask-Login
+    def __init__(self, id, username, is_admin=False, plex_username=None):
+        self.id = id
+        self.username = username
+        self.plex_username = plex_username
+        self.is_admin = bool(is_admin) # Ensure it's a boolean
+        self.is_authenticated = True
+        self.is_active = True
+        self.is_anonymous = False
+
+    def get_id(self):
+        return str(self.id)
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a User from a `users` row (sqlite3.Row)."""
+        plex_username = row['plex_username'] if 'plex_username' in row.keys() else None
+        return cls(id=row['id'], username=row['username'], is_admin=row['is_admin'], plex_username=plex_username)
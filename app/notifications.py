@@ -1,6 +1,7 @@
 import requests
 from flask import current_app
 from . import database
+from .http_client import http_session
 
 def send_pushover_notification(title, message, url=None, url_title=None, priority=0):
     """
@@ -40,7 +41,7 @@ def send_pushover_notification(title, message, url=None, url_title=None, priorit
         payload['url_title'] = url_title
 
     try:
-        response = requests.post(api_url, data=payload, timeout=5)
+        response = http_session.post(api_url, data=payload, timeout=5)
         response_data = response.json()
         if response_data.get('status') == 1:
             current_app.logger.info(f"Pushover notification sent: {title}")
@@ -82,7 +83,7 @@ def send_ntfy_notification(title, message, url=None, priority='default'):
         headers['Click'] = url
 
     try:
-        response = requests.post(endpoint, data=message.encode('utf-8'), headers=headers, timeout=5)
+        response = http_session.post(endpoint, data=message.encode('utf-8'), headers=headers, timeout=5)
         if response.status_code in (200, 201, 202):
             current_app.logger.info(f"ntfy notification sent: {title}")
             return True, None
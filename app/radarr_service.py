@@ -1,7 +1,8 @@
 import requests
 import json
-from flask import current_app, url_for
+from flask import current_app
 from . import database
+from .http_client import http_session
 from .utils import _trigger_image_cache
 
 
@@ -37,7 +38,7 @@ def get_all_radarr_movies():
     headers = {"X-Api-Key": radarr_api_key}
 
     try:
-        response = requests.get(endpoint, headers=headers, timeout=10)
+        response = http_session.get(endpoint, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.Timeout:
@@ -95,6 +96,10 @@ def sync_radarr_library():
     
     try:
         cursor = conn.cursor()
+        # Map Radarr IDs to local row IDs up front instead of a lookup per movie
+        existing_movie_ids = {
+            row[0]: row[1] for row in cursor.execute("SELECT radarr_id, id FROM radarr_movies")
+        }
         for movie_data in all_radarr_movies:
             radarr_movie_id = movie_data.get('id')
             if not radarr_movie_id:
@@ -177,8 +182,7 @@ def sync_radarr_library():
             }
 
             # Check if movie exists
-            cursor.execute("SELECT id FROM radarr_movies WHERE radarr_id = ?", (radarr_movie_id,))
-            existing_movie = cursor.fetchone()
+            existing_movie_id = existing_movie_ids.get(radarr_movie_id)
 
             # Construct columns and placeholders for insert/update dynamically
             # This ensures that if a key is None from Radarr, it's inserted as NULL
@@ -187,7 +191,7 @@ def sync_radarr_library():
             db_columns = list(movie_to_insert.keys())
             db_values = [movie_to_insert.get(col) for col in db_columns]
 
-            if existing_movie:
+            if existing_movie_id:
                 set_clause = ", ".join([f"{col} = ?" for col in db_columns if col != 'radarr_id'])
                 sql_query = f"UPDATE radarr_movies SET {set_clause} WHERE radarr_id = ?"
                 
@@ -198,7 +202,7 @@ def sync_radarr_library():
                 cursor.execute(sql_query, tuple(update_values_list))
                 if cursor.rowcount > 0:
                     movies_updated_count += 1
-                movie_db_id = existing_movie[0] # Get ID if exists
+                movie_db_id = existing_movie_id
             else:
                 placeholders = ', '.join(['?'] * len(db_columns))
                 sql_query = f"INSERT INTO radarr_movies ({', '.join(db_columns)}) VALUES ({placeholders}) RETURNING id" # Added RETURNING id
@@ -206,6 +210,7 @@ def sync_radarr_library():
                 result = cursor.fetchone()
                 if result and result[0]:
                     movie_db_id = result[0]
+                    existing_movie_ids[radarr_movie_id] = movie_db_id
                     movies_added_count += 1
                 else:
                     current_app.logger.error(f"sync_radarr_library: Failed to get ID for new movie Radarr ID {radarr_movie_id}. Skipping image queue for this movie.")
@@ -214,19 +219,11 @@ def sync_radarr_library():
             
             movies_synced_count += 1
 
-            # Trigger image caching directly (only if we have a request context)
+            # Queue image caching in the background
             movie_tmdb_id = movie_to_insert.get('tmdb_id')
             if movie_db_id and movie_tmdb_id:
-                try:
-                    if poster_url:
-                        proxy_poster_url = url_for('main.image_proxy', type='poster', id=movie_tmdb_id)
-                        _trigger_image_cache(proxy_poster_url, item_title_for_logging=f"Poster for {movie_to_insert.get('title')}")
-                    if fanart_url:
-                        proxy_fanart_url = url_for('main.image_proxy', type='background', id=movie_tmdb_id)
-                        _trigger_image_cache(proxy_fanart_url, item_title_for_logging=f"Fanart for {movie_to_insert.get('title')}")
-                except RuntimeError as e:
-                    # Skip image caching if we're outside a request context (e.g., webhook background thread)
-                    current_app.logger.debug(f"Skipping image caching for movie '{movie_to_insert.get('title')}' - no request context: {e}")
+                _trigger_image_cache('poster', movie_tmdb_id, poster_url, 'radarr', item_title_for_logging=f"Poster for {movie_to_insert.get('title')}")
+                _trigger_image_cache('background', movie_tmdb_id, fanart_url, 'radarr', item_title_for_logging=f"Fanart for {movie_to_insert.get('title')}")
             elif not movie_tmdb_id:
                  current_app.logger.warning(f"Skipping image trigger for movie '{movie_to_insert.get('title')}' due to missing TMDB ID.")
 
@@ -35,7 +35,6 @@ import time
 import secrets
 import socket
 import requests
-from openai import OpenAI
 from flask import (
     Blueprint, render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -84,17 +83,17 @@ def admin_required(f):
 
 # List of admin panel routes that are searchable via the admin search bar.
 # Each entry contains a user-friendly title, a category for grouping,
-# and a lambda function to generate the URL dynamically using url_for.
+# and the endpoint the search result links to.
 ADMIN_SEARCHABLE_ROUTES = [
-    {'title': 'Admin Dashboard', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.dashboard')},
-    {'title': 'Service Settings', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.settings')},
-    {'title': 'Admin Tasks (Sync)', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.tasks')},
-    {'title': 'Logbook', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.logbook_view')},
-    {'title': 'Logs', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.logs_view')},
+    {'title': 'Admin Dashboard', 'category': 'Admin Page', 'endpoint': 'admin.dashboard'},
+    {'title': 'Service Settings', 'category': 'Admin Page', 'endpoint': 'admin.settings'},
+    {'title': 'Admin Tasks (Sync)', 'category': 'Admin Page', 'endpoint': 'admin.tasks'},
+    {'title': 'Logbook', 'category': 'Admin Page', 'endpoint': 'admin.logbook_view'},
+    {'title': 'Logs', 'category': 'Admin Page', 'endpoint': 'admin.logs_view'},
 
 
-    {'title': 'Issue Reports', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.issue_reports')},
-    {'title': 'AI / LLM Settings', 'category': 'Admin Page', 'url_func': lambda: url_for('admin.ai_settings')},
+    {'title': 'Issue Reports', 'category': 'Admin Page', 'endpoint': 'admin.issue_reports'},
+    {'title': 'AI / LLM Settings', 'category': 'Admin Page', 'endpoint': 'admin.ai_settings'},
 ]
 
 
@@ -4,7 +4,6 @@ import time
 import secrets
 import socket
 import requests
-from openai import OpenAI
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -30,8 +29,42 @@ from ...utils import (
     convert_utc_to_user_timezone, get_user_timezone,
     get_jellyseer_user_requests,
 )
+from ..main._shared import _get_cached_value
+from ..main.search_routes import _search_library
 from . import admin_bp, admin_required, ADMIN_SEARCHABLE_ROUTES
 
+_DASHBOARD_STATS_TTL = 60
+# Admin pages sort ahead of 'Movie' and 'Show' results, so keeping them in
+# title order once lets admin_search concatenate instead of sorting.
+_SORTED_ADMIN_ROUTES = sorted(ADMIN_SEARCHABLE_ROUTES, key=lambda r: (r['category'], r['title']))
+_admin_route_results = None  # URLs resolved on the first search
+
+
+def _get_admin_route_results():
+    """
+    Returns the searchable admin routes with their URLs already built.
+
+    The routes never change while the app runs, so url_for is called once per
+    route on the first search instead of on every keystroke.
+    """
+    global _admin_route_results
+    if _admin_route_results is None:
+        entries = []
+        for route_info in _SORTED_ADMIN_ROUTES:
+            try:
+                url = url_for(route_info['endpoint'])
+            except Exception as e:
+                current_app.logger.error(f"Error generating URL for admin route {route_info['title']}: {e}")
+                continue
+            entries.append({
+                'title': route_info['title'],
+                'category': route_info['category'],
+                'url': url,
+                'title_lower': route_info['title'].lower(),
+            })
+        _admin_route_results = entries
+    return _admin_route_results
+
 @admin_bp.route('/search', methods=['GET'])
 @login_required
 @admin_required
@@ -53,45 +86,29 @@ def admin_search():
 
     db = get_db()
 
-    # Search Shows from sonarr_shows table
-    show_rows = db.execute(
-        "SELECT title, tmdb_id, year FROM sonarr_shows WHERE lower(title) LIKE ?", ('%' + query + '%',)
-    ).fetchall()
-    for row in show_rows:
-        results.append({
-            'title': row['title'],
-            'category': 'Show', # Consistent category naming
-            'year': row['year'],
-            'url': url_for('main.show_detail', tmdb_id=row['tmdb_id'])
-        })
+    # Search Admin Routes
+    for route_info in _get_admin_route_results():
+        if query in route_info['title_lower']:
+            results.append({
+                'title': route_info['title'],
+                'category': route_info['category'],
+                'url': route_info['url']
+            })
 
-    # Search Movies
-    movie_rows = db.execute(
-        "SELECT title, tmdb_id, year FROM radarr_movies WHERE lower(title) LIKE ?", ('%' + query + '%',)
-    ).fetchall()
-    for row in movie_rows:
-        results.append({
+    # Shows and movies come from the same FTS5 title search as the main
+    # search bar, which returns at most 50 rows in title order; they are
+    # grouped by category here so results keep the (category, title) order
+    library_results = {'Movie': [], 'Show': []}
+    for row in _search_library(db, query):
+        category = 'Show' if row['type'] == 'show' else 'Movie' # Consistent category naming
+        library_results[category].append({
             'title': row['title'],
-            'category': 'Movie', # Consistent category naming
+            'category': category,
             'year': row['year'],
-            'url': url_for('main.movie_detail', tmdb_id=row['tmdb_id'])
+            'url': url_for('main.show_detail' if row['type'] == 'show' else 'main.movie_detail', tmdb_id=row['tmdb_id'])
         })
-
-    # Search Admin Routes
-    for route_info in ADMIN_SEARCHABLE_ROUTES:
-        if query in route_info['title'].lower():
-            try:
-                url = route_info['url_func']() # Call the lambda to get URL
-                results.append({
-                    'title': route_info['title'],
-                    'category': route_info['category'],
-                    'url': url
-                })
-            except Exception as e:
-                current_app.logger.error(f"Error generating URL for admin route {route_info['title']}: {e}")
-
-    # Sort results for consistent ordering: by category first, then by title.
-    results.sort(key=lambda x: (x['category'], x['title']))
+    results.extend(library_results['Movie'])
+    results.extend(library_results['Show'])
 
     return jsonify(results)
 
@@ -119,84 +136,87 @@ def dashboard():
     import datetime
 
     # ============================================================================
-    # CONSOLIDATED QUERIES - Reduce 30+ queries to ~5 queries
+    # CONSOLIDATED QUERY - library, Plex, login and API usage counts in one
+    # round trip. Each table is read by a single subquery that computes all of
+    # its counts with conditional aggregates, so plex_activity_log is scanned
+    # once rather than once per metric. The counts are kept for a minute, so
+    # refreshing the dashboard doesn't rescan plex_activity_log each time.
     # ============================================================================
+    def load_stats():
+        return dict(db.execute("""
+            SELECT * FROM
+            -- Media library counts
+            (SELECT
+                COUNT(*) as movie_count,
+                SUM(has_file = 1) as movies_with_files,
+                SUM(last_synced_at >= DATETIME('now', '-7 days')) as radarr_week_count
+             FROM radarr_movies),
+            (SELECT
+                COUNT(*) as show_count,
+                SUM(last_synced_at >= DATETIME('now', '-7 days')) as sonarr_week_count
+             FROM sonarr_shows),
+            (SELECT COUNT(*) as episodes_with_files FROM sonarr_episodes WHERE has_file = 1),
+            -- Plex activity metrics
+            (SELECT
+                COUNT(DISTINCT CASE WHEN media_type = 'movie' AND event_type IN ('media.play', 'media.scrobble', 'watched') THEN title END) as unique_movies_played,
+                COUNT(DISTINCT CASE WHEN media_type = 'episode' AND event_type IN ('media.play', 'media.scrobble', 'watched') THEN title END) as unique_episodes_played,
+                COUNT(DISTINCT show_title) as unique_shows_watched,
+                SUM(event_timestamp >= DATETIME('now', '-7 days')) as plex_events_week,
+                SUM(event_type IN ('media.play', 'watched') AND event_timestamp >= DATETIME('now', '-7 days')) as recent_plays,
+                SUM(event_type = 'media.scrobble' AND event_timestamp >= DATETIME('now', '-7 days')) as recent_scrobbles,
+                COUNT(DISTINCT plex_username) as unique_plex_users,
+                COUNT(DISTINCT CASE WHEN event_timestamp >= DATETIME('now', '-1 day') THEN plex_username END) as plex_users_today,
+                COUNT(DISTINCT CASE WHEN event_timestamp >= DATETIME('now', '-7 days') THEN plex_username END) as plex_users_week,
+                COUNT(DISTINCT CASE WHEN event_timestamp >= DATETIME('now', '-30 days') THEN plex_username END) as plex_users_month
+             FROM plex_activity_log),
+            -- User counts and ShowNotes login activity
+            (SELECT
+                COUNT(*) as user_count,
+                COUNT(DISTINCT CASE WHEN last_login_at >= DATETIME('now', '-1 day') THEN username END) as shownotes_users_today,
+                COUNT(DISTINCT CASE WHEN last_login_at >= DATETIME('now', '-7 days') THEN username END) as shownotes_users_week,
+                COUNT(DISTINCT CASE WHEN last_login_at >= DATETIME('now', '-30 days') THEN username END) as shownotes_users_month
+             FROM users),
+            -- API usage metrics
+            (SELECT COUNT(*) as total_api_calls, SUM(cost_usd) as total_api_cost FROM api_usage),
+            (SELECT
+                SUM(CASE WHEN provider = 'openai' THEN cost_usd END) as openai_cost_week,
+                SUM(provider = 'openai') as openai_call_count_week,
+                AVG(CASE WHEN provider = 'ollama' THEN processing_time_ms END) as ollama_avg_ms,
+                SUM(provider = 'ollama') as ollama_call_count_week
+             FROM api_usage
+             WHERE timestamp >= DATETIME('now', '-7 days'))
+        """).fetchone())
+    stats = _get_cached_value('admin:dashboard:stats', _DASHBOARD_STATS_TTL, load_stats)
 
-    # Query 1: Media library counts (combines 7 individual queries into 1)
-    library_stats = db.execute("""
-        SELECT
-            (SELECT COUNT(*) FROM radarr_movies) as movie_count,
-            (SELECT COUNT(*) FROM sonarr_shows) as show_count,
-            (SELECT COUNT(*) FROM users) as user_count,
-            (SELECT COUNT(*) FROM sonarr_episodes WHERE has_file = 1) as episodes_with_files,
-            (SELECT COUNT(*) FROM radarr_movies WHERE has_file = 1) as movies_with_files,
-            (SELECT COUNT(*) FROM radarr_movies WHERE last_synced_at >= DATETIME('now', '-7 days')) as radarr_week_count,
-            (SELECT COUNT(*) FROM sonarr_shows WHERE last_synced_at >= DATETIME('now', '-7 days')) as sonarr_week_count
-    """).fetchone()
-
-    movie_count = library_stats['movie_count'] or 0
-    show_count = library_stats['show_count'] or 0
-    user_count = library_stats['user_count'] or 0
-    episodes_with_files = library_stats['episodes_with_files'] or 0
-    movies_with_files = library_stats['movies_with_files'] or 0
-    radarr_week_count = library_stats['radarr_week_count'] or 0
-    sonarr_week_count = library_stats['sonarr_week_count'] or 0
-
-    # Query 2: Plex activity metrics (combines 10 individual queries into 1)
-    plex_stats = db.execute("""
-        SELECT
-            (SELECT COUNT(DISTINCT title) FROM plex_activity_log WHERE media_type = 'movie' AND event_type IN ('media.play', 'media.scrobble', 'watched')) as unique_movies_played,
-            (SELECT COUNT(DISTINCT title) FROM plex_activity_log WHERE media_type = 'episode' AND event_type IN ('media.play', 'media.scrobble', 'watched')) as unique_episodes_played,
-            (SELECT COUNT(DISTINCT show_title) FROM plex_activity_log WHERE show_title IS NOT NULL) as unique_shows_watched,
-            (SELECT COUNT(*) FROM plex_activity_log WHERE event_timestamp >= DATETIME('now', '-7 days')) as plex_events_week,
-            (SELECT COUNT(*) FROM plex_activity_log WHERE event_type IN ('media.play', 'watched') AND event_timestamp >= DATETIME('now', '-7 days')) as recent_plays,
-            (SELECT COUNT(*) FROM plex_activity_log WHERE event_type = 'media.scrobble' AND event_timestamp >= DATETIME('now', '-7 days')) as recent_scrobbles,
-            (SELECT COUNT(DISTINCT plex_username) FROM plex_activity_log WHERE plex_username IS NOT NULL) as unique_plex_users,
-            (SELECT COUNT(DISTINCT plex_username) FROM plex_activity_log WHERE plex_username IS NOT NULL AND event_timestamp >= DATETIME('now', '-1 day')) as plex_users_today,
-            (SELECT COUNT(DISTINCT plex_username) FROM plex_activity_log WHERE plex_username IS NOT NULL AND event_timestamp >= DATETIME('now', '-7 days')) as plex_users_week,
-            (SELECT COUNT(DISTINCT plex_username) FROM plex_activity_log WHERE plex_username IS NOT NULL AND event_timestamp >= DATETIME('now', '-30 days')) as plex_users_month
-    """).fetchone()
-
-    unique_movies_played = plex_stats['unique_movies_played'] or 0
-    unique_episodes_played = plex_stats['unique_episodes_played'] or 0
-    unique_shows_watched = plex_stats['unique_shows_watched'] or 0
-    plex_events_week = plex_stats['plex_events_week'] or 0
-    recent_plays = plex_stats['recent_plays'] or 0
-    recent_scrobbles = plex_stats['recent_scrobbles'] or 0
-    unique_plex_users = plex_stats['unique_plex_users'] or 0
-    plex_users_today = plex_stats['plex_users_today'] or 0
-    plex_users_week = plex_stats['plex_users_week'] or 0
-    plex_users_month = plex_stats['plex_users_month'] or 0
-
-    # Query 3: User login activity (combines 3 queries into 1)
-    user_stats = db.execute("""
-        SELECT
-            (SELECT COUNT(DISTINCT username) FROM users WHERE last_login_at >= DATETIME('now', '-1 day')) as shownotes_users_today,
-            (SELECT COUNT(DISTINCT username) FROM users WHERE last_login_at >= DATETIME('now', '-7 days')) as shownotes_users_week,
-            (SELECT COUNT(DISTINCT username) FROM users WHERE last_login_at >= DATETIME('now', '-30 days')) as shownotes_users_month
-    """).fetchone()
+    movie_count = stats['movie_count'] or 0
+    show_count = stats['show_count'] or 0
+    user_count = stats['user_count'] or 0
+    episodes_with_files = stats['episodes_with_files'] or 0
+    movies_with_files = stats['movies_with_files'] or 0
+    radarr_week_count = stats['radarr_week_count'] or 0
+    sonarr_week_count = stats['sonarr_week_count'] or 0
 
-    shownotes_users_today = user_stats['shownotes_users_today'] or 0
-    shownotes_users_week = user_stats['shownotes_users_week'] or 0
-    shownotes_users_month = user_stats['shownotes_users_month'] or 0
+    unique_movies_played = stats['unique_movies_played'] or 0
+    unique_episodes_played = stats['unique_episodes_played'] or 0
+    unique_shows_watched = stats['unique_shows_watched'] or 0
+    plex_events_week = stats['plex_events_week'] or 0
+    recent_plays = stats['recent_plays'] or 0
+    recent_scrobbles = stats['recent_scrobbles'] or 0
+    unique_plex_users = stats['unique_plex_users'] or 0
+    plex_users_today = stats['plex_users_today'] or 0
+    plex_users_week = stats['plex_users_week'] or 0
+    plex_users_month = stats['plex_users_month'] or 0
 
-    # Query 4: API usage metrics (combines 6 queries into 1)
-    api_stats = db.execute("""
-        SELECT
-            (SELECT COUNT(*) FROM api_usage) as total_api_calls,
-            (SELECT SUM(cost_usd) FROM api_usage) as total_api_cost,
-            (SELECT SUM(cost_usd) FROM api_usage WHERE provider='openai' AND timestamp >= DATETIME('now', '-7 days')) as openai_cost_week,
-            (SELECT COUNT(*) FROM api_usage WHERE provider='openai' AND timestamp >= DATETIME('now', '-7 days')) as openai_call_count_week,
-            (SELECT AVG(processing_time_ms) FROM api_usage WHERE provider='ollama' AND timestamp >= DATETIME('now', '-7 days')) as ollama_avg_ms,
-            (SELECT COUNT(*) FROM api_usage WHERE provider='ollama' AND timestamp >= DATETIME('now', '-7 days')) as ollama_call_count_week
-    """).fetchone()
+    shownotes_users_today = stats['shownotes_users_today'] or 0
+    shownotes_users_week = stats['shownotes_users_week'] or 0
+    shownotes_users_month = stats['shownotes_users_month'] or 0
 
-    total_api_calls = api_stats['total_api_calls'] or 0
-    total_api_cost = api_stats['total_api_cost'] or 0
-    openai_cost_week = api_stats['openai_cost_week'] or 0
-    openai_call_count_week = api_stats['openai_call_count_week'] or 0
-    ollama_avg_ms = api_stats['ollama_avg_ms'] or 0
-    ollama_call_count_week = api_stats['ollama_call_count_week'] or 0
+    total_api_calls = stats['total_api_calls'] or 0
+    total_api_cost = stats['total_api_cost'] or 0
+    openai_cost_week = stats['openai_cost_week'] or 0
+    openai_call_count_week = stats['openai_call_count_week'] or 0
+    ollama_avg_ms = stats['ollama_avg_ms'] or 0
+    ollama_call_count_week = stats['ollama_call_count_week'] or 0
 
     # ============================================================================
     # WEBHOOK ACTIVITY METRICS (kept as separate queries - different tables)
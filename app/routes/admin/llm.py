@@ -1,10 +1,11 @@
 import os
+import json
 import glob
 import time
 import secrets
 import socket
+import sqlite3
 import requests
-from openai import OpenAI
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -14,7 +15,8 @@ from werkzeug.security import generate_password_hash
 from functools import wraps
 
 from ... import database
-from ...database import get_db, close_db, get_setting, set_setting, update_sync_status
+from ...http_client import http_session
+from ...database import get_db, close_db, get_setting, set_settings, update_sync_status
 from ...utils import (
     sync_sonarr_library, sync_radarr_library,
     test_sonarr_connection, test_radarr_connection, test_bazarr_connection, test_ollama_connection,
@@ -30,20 +32,21 @@ from ...utils import (
     convert_utc_to_user_timezone, get_user_timezone,
     get_jellyseer_user_requests,
 )
+from ..main.search_routes import _fts_match_expression
 from . import admin_bp, admin_required, ADMIN_SEARCHABLE_ROUTES
+from .settings import _invalidate_ollama_models
 
 @admin_bp.route('/api/ollama-models')
 @login_required
 @admin_required
 def ollama_models_api():
     """API endpoint to fetch available Ollama models"""
-    import requests
     url = request.args.get('url')
     if not url:
         return jsonify({"error": "URL parameter required"}), 400
 
     try:
-        response = requests.get(f"{url.rstrip('/')}/api/tags", timeout=5)
+        response = http_session.get(f"{url.rstrip('/')}/api/tags", timeout=5)
         if response.status_code == 200:
             data = response.json()
             models = data.get('models', [])
@@ -192,8 +195,25 @@ def get_character_info():
     db = get_db()
     
     try:
-        # First, find the show by title
-        show_row = db.execute('SELECT tmdb_id, title, year, overview FROM sonarr_shows WHERE title LIKE ?', (f'%{show_title}%',)).fetchone()
+        # First, find the show by title: best FTS5 match on every word, or a
+        # LIKE scan if the full-text tables aren't available
+        show_row = None
+        match_expr = _fts_match_expression(show_title)
+        if match_expr:
+            try:
+                show_row = db.execute('''
+                    SELECT s.tmdb_id, s.title, s.year, s.overview
+                    FROM sonarr_shows_fts f
+                    JOIN sonarr_shows s ON s.id = f.rowid
+                    WHERE sonarr_shows_fts MATCH ?
+                    ORDER BY f.rank
+                    LIMIT 1
+                ''', (match_expr,)).fetchone()
+            except sqlite3.OperationalError as e:
+                current_app.logger.debug(f"FTS show lookup unavailable, using LIKE: {e}")
+                match_expr = None
+        if not match_expr:
+            show_row = db.execute('SELECT tmdb_id, title, year, overview FROM sonarr_shows WHERE title LIKE ?', (f'%{show_title}%',)).fetchone()
         
         if not show_row:
             current_app.logger.warning(f"Show not found for title: {show_title}")
@@ -349,7 +369,6 @@ def api_characters_for_show():
                 ).fetchone()
                 
                 if plex_row:
-                    import json
                     try:
                         payload = json.loads(plex_row['raw_payload'])
                         metadata = payload.get('Metadata', {})
@@ -670,13 +689,16 @@ def ai_save_settings():
               'gemini_api_key', 'gemini_model_name',
               'llm_knowledge_cutoff_date', 'summary_length']
 
+    values = {}
     for field in fields:
         value = request.form.get(field, '').strip()
-        set_setting(field, value if value else None)
+        values[field] = value if value else None
 
     # Checkbox booleans
-    set_setting('summary_only_watched',    '1' if request.form.get('summary_only_watched') else '0')
-    set_setting('summary_show_disclaimer', '1' if request.form.get('summary_show_disclaimer') else '0')
+    values['summary_only_watched'] = '1' if request.form.get('summary_only_watched') else '0'
+    values['summary_show_disclaimer'] = '1' if request.form.get('summary_show_disclaimer') else '0'
+    set_settings(values)
+    _invalidate_ollama_models()
 
     flash('AI settings saved successfully.', 'success')
     return redirect(url_for('admin.ai_settings'))
@@ -751,7 +773,7 @@ def ai_test_connection():
         if not url:
             return jsonify({'success': False, 'error': 'URL is required'})
         try:
-            resp = requests.get(url.rstrip('/') + '/api/tags', timeout=10)
+            resp = http_session.get(url.rstrip('/') + '/api/tags', timeout=10)
             if resp.status_code == 200:
                 models = [m.get('name') for m in resp.json().get('models', []) if m.get('name')]
                 return jsonify({'success': True, 'models': models})
@@ -764,6 +786,7 @@ def ai_test_connection():
         if not api_key:
             return jsonify({'success': False, 'error': 'API key is required'})
         try:
+            from openai import OpenAI
             client = OpenAI(api_key=api_key)
             client.models.list()
             return jsonify({'success': True})
@@ -775,8 +798,8 @@ def ai_test_connection():
         if not api_key:
             return jsonify({'success': False, 'error': 'API key is required'})
         try:
-            resp = requests.get('https://openrouter.ai/api/v1/models',
-                                headers={'Authorization': f'Bearer {api_key}'}, timeout=10)
+            resp = http_session.get('https://openrouter.ai/api/v1/models',
+                                    headers={'Authorization': f'Bearer {api_key}'}, timeout=10)
             if resp.status_code == 200:
                 return jsonify({'success': True})
             return jsonify({'success': False, 'error': f'HTTP {resp.status_code}'})
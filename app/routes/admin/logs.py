@@ -1,10 +1,11 @@
 import os
-import glob
+import json
+import threading
 import time
 import secrets
 import socket
 import requests
-from openai import OpenAI
+from pathlib import Path
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -30,6 +31,7 @@ from ...utils import (
     convert_utc_to_user_timezone, get_user_timezone,
     get_jellyseer_user_requests,
 )
+from ...data_transforms import SEASON_EPISODE_RE
 from . import admin_bp, admin_required, ADMIN_SEARCHABLE_ROUTES
 
 @admin_bp.route('/logs', methods=['GET'])
@@ -76,6 +78,16 @@ def watch_history_users():
     ''').fetchall()
     return jsonify({'users': [u['plex_username'] for u in users]})
 
+
+# Event type display mapping for the watch history
+_EVENT_TYPE_LABELS = {
+    'media.play': 'Play',
+    'media.pause': 'Pause',
+    'media.stop': 'Stop',
+    'media.scrobble': 'Scrobble'
+}
+
+
 @admin_bp.route('/watch-history/data')
 @login_required
 @admin_required
@@ -134,10 +146,14 @@ def watch_history_data():
         where_clause = ' AND '.join(where_conditions) if where_conditions else '1=1'
 
         # Use CTE with ROW_NUMBER to deduplicate entries
-        # Partition by user + show + episode to get one entry per unique watched item per user
+        # Partition by user + show + episode to get one entry per unique watched item per user.
+        # Only the columns the page uses are read: raw_payload holds the whole
+        # Plex webhook body and would otherwise be sorted, copied and sent
+        # back in the JSON for every row.
         query = f'''
             WITH ranked_events AS (
-                SELECT *,
+                SELECT id, plex_username, event_type, event_timestamp, media_type,
+                    title, show_title, season_episode, tmdb_id,
                     ROW_NUMBER() OVER (
                         PARTITION BY
                             plex_username,
@@ -151,7 +167,9 @@ def watch_history_data():
                 FROM plex_activity_log
                 WHERE {where_clause}
             )
-            SELECT * FROM ranked_events
+            SELECT id, plex_username, event_type, event_timestamp, media_type,
+                title, show_title, season_episode, tmdb_id
+            FROM ranked_events
             WHERE rn = 1
             ORDER BY event_timestamp DESC
             LIMIT 100
@@ -160,7 +178,6 @@ def watch_history_data():
 
         # PERFORMANCE OPTIMIZATION: Batch lookup TMDB IDs instead of querying in loop
         # Collect all unique show titles and movie titles that need lookup
-        import re
         show_titles_to_lookup = set()
         movie_titles_to_lookup = set()
 
@@ -191,37 +208,23 @@ def watch_history_data():
             ).fetchall()
             movie_tmdb_map = {r['title']: r['tmdb_id'] for r in movie_results}
 
-        # Event type display mapping
-        event_type_map = {
-            'media.play': 'Play',
-            'media.pause': 'Pause',
-            'media.stop': 'Stop',
-            'media.scrobble': 'Scrobble'
-        }
-
-        # Enrich with episode detail URL and formatted time
+        # Each row's JSON object is built in one literal from the row's
+        # columns, rather than copied with dict(row) and then grown key by key
         for row in rows:
-            row_dict = dict(row)
-
-            # Get TMDB ID - either from row or from batch lookup
-            tmdb_id = row_dict.get('tmdb_id')
-            show_title = row_dict.get('show_title')
-            title = row_dict.get('title')
-            media_type = row_dict.get('media_type')
+            tmdb_id = row['tmdb_id']
+            show_title = row['show_title']
+            title = row['title']
+            media_type = row['media_type']
+            season_episode = row['season_episode']
 
             # Use batch lookup results if no tmdb_id
             if not tmdb_id:
                 if media_type == 'episode' and show_title:
                     tmdb_id = show_tmdb_map.get(show_title)
-                    if tmdb_id:
-                        row_dict['tmdb_id'] = tmdb_id
                 elif media_type == 'movie' and title:
                     tmdb_id = movie_tmdb_map.get(title)
-                    if tmdb_id:
-                        row_dict['tmdb_id'] = tmdb_id
 
             # Build URLs based on media type
-            season_episode = row_dict.get('season_episode')
             episode_detail_url = None
             show_detail_url = None
             movie_detail_url = None
@@ -232,7 +235,7 @@ def watch_history_data():
 
                 # If we have season/episode info, link to episode detail
                 if season_episode:
-                    match = re.match(r'S(\d+)E(\d+)', season_episode)
+                    match = SEASON_EPISODE_RE.match(season_episode)
                     if match:
                         season_number = int(match.group(1))
                         episode_number = int(match.group(2))
@@ -241,31 +244,92 @@ def watch_history_data():
                 # Link to movie detail page
                 movie_detail_url = url_for('main.movie_detail', tmdb_id=tmdb_id)
 
-            row_dict['episode_detail_url'] = episode_detail_url
-            row_dict['show_detail_url'] = show_detail_url
-            row_dict['movie_detail_url'] = movie_detail_url
-
             # Format timestamp with user's timezone
-            ts = row_dict.get('event_timestamp')
+            ts = row['event_timestamp']
+            event_timestamp_fmt = None
             if ts:
                 try:
-                    row_dict['event_timestamp_fmt'] = convert_utc_to_user_timezone(ts, '%Y-%m-%d %H:%M')
+                    event_timestamp_fmt = convert_utc_to_user_timezone(ts, '%Y-%m-%d %H:%M')
                 except Exception:
-                    row_dict['event_timestamp_fmt'] = str(ts)
+                    event_timestamp_fmt = str(ts)
+
+            event_type = row['event_type']
+            plex_logs.append({
+                'id': row['id'],
+                'plex_username': row['plex_username'],
+                'event_type': event_type,
+                'event_timestamp': ts,
+                'media_type': media_type,
+                'title': title,
+                'show_title': show_title,
+                'season_episode': season_episode,
+                'tmdb_id': tmdb_id,
+                'episode_detail_url': episode_detail_url,
+                'show_detail_url': show_detail_url,
+                'movie_detail_url': movie_detail_url,
+                'event_timestamp_fmt': event_timestamp_fmt,
+                'event_type_fmt': _EVENT_TYPE_LABELS.get(event_type, event_type) if event_type else None,
+                'display_title': f'{show_title} – {title}' if show_title else title,
+            })
 
-            # Format event type
-            event_type = row_dict.get('event_type')
-            if event_type:
-                row_dict['event_type_fmt'] = event_type_map.get(event_type, event_type)
+    return jsonify({'sync_logs': sync_logs, 'plex_logs': plex_logs})
 
-            # Build display title
-            episode_title = row_dict.get('title')
-            row_dict['display_title'] = f'{show_title} – {episode_title}' if show_title else episode_title
 
-            plex_logs.append(row_dict)
+_LOG_STREAM_HEARTBEAT_SECONDS = 15
+_LOG_STREAM_POLL_SECONDS = 0.5
+# With inotify_simple installed (Linux), the live log tail sleeps until the
+# kernel reports a write instead of polling the file twice a second.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+_LOG_TAIL_LINES = 100
+_LOG_TAIL_BLOCK_SIZE = 4096
+_log_files_cache = {}  # 'key' -> (log_dir, dir mtime_ns), 'names' -> sorted log filenames
+_log_files_lock = threading.Lock()
+
+
+def _get_log_dir():
+    """Returns the resolved log directory, computed once per app."""
+    log_dir = current_app.config.get('LOG_DIR_ABS')
+    if log_dir is None:
+        log_dir = Path(current_app.root_path).parent.joinpath('logs').resolve()
+        current_app.config['LOG_DIR_ABS'] = log_dir
+    return log_dir
 
-    return jsonify({'sync_logs': sync_logs, 'plex_logs': plex_logs})
 
+def _tail_lines(file_path, n):
+    """
+    Returns the last ``n`` lines of a file, newlines included.
+
+    Reads backwards from the end in blocks until it has enough lines, so a
+    multi-megabyte log costs a few small reads rather than loading it whole.
+    """
+    with open(file_path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        buffer = b''
+        while pos > 0 and buffer.count(b'\n') <= n:
+            block = min(_LOG_TAIL_BLOCK_SIZE, pos)
+            pos -= block
+            f.seek(pos)
+            buffer = f.read(block) + buffer
+    return [line.decode('utf-8', errors='replace') for line in buffer.splitlines(keepends=True)[-n:]]
+
+
+def _resolve_log_path(filename):
+    """
+    Resolves `filename` inside the log directory.
+
+    Returns None if the resolved path (after following symlinks) falls
+    outside the log directory, or is the directory itself. Containment is
+    checked on path components, so a sibling such as ``logs-old`` is not
+    mistaken for part of ``logs``.
+    """
+    log_dir = _get_log_dir()
+    file_path = (log_dir / filename).resolve()
+    if file_path == log_dir or not file_path.is_relative_to(log_dir):
+        return None
+    return str(file_path)
 
 @admin_bp.route('/logs/list', methods=['GET'])
 @login_required
@@ -281,9 +345,21 @@ def logs_list():
     Returns:
         flask.Response: A JSON response containing a sorted list of log filenames.
     """
-    log_dir = os.path.join(os.path.dirname(current_app.root_path), 'logs')
-    log_files_paths = glob.glob(os.path.join(log_dir, 'shownotes.log*'))
-    log_filenames = sorted([os.path.basename(f) for f in log_files_paths])
+    log_dir = _get_log_dir()
+    try:
+        dir_mtime = os.stat(log_dir).st_mtime_ns
+    except OSError:
+        return jsonify([])
+
+    # Files are only added, removed or renamed (on rotation) by changing the
+    # directory, so the listing is reused until its mtime moves.
+    with _log_files_lock:
+        if _log_files_cache.get('key') != (log_dir, dir_mtime):
+            with os.scandir(log_dir) as entries:
+                names = sorted(e.name for e in entries if e.name.startswith('shownotes.log'))
+            _log_files_cache['key'] = (log_dir, dir_mtime)
+            _log_files_cache['names'] = names
+        log_filenames = _log_files_cache['names']
     return jsonify(log_filenames)
 
 @admin_bp.route('/logs/get/<path:filename>', methods=['GET'])
@@ -304,18 +380,14 @@ def get_log_content(filename):
         flask.Response: A JSON response containing a list of log lines, or an
                         error response if the file is not found or access is denied.
     """
-    log_dir = os.path.join(os.path.dirname(current_app.root_path), 'logs')
-    file_path = os.path.join(log_dir, filename)
-
     # Security check to prevent path traversal
-    if not os.path.abspath(file_path).startswith(os.path.abspath(log_dir)):
+    file_path = _resolve_log_path(filename)
+    if file_path is None:
         current_app.logger.warning(f"Log access rejected for {filename} due to path traversal attempt.")
         return jsonify({"error": "Access denied"}), 403
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines() # Read all lines
-        return jsonify(lines[-100:]) # Return last 100 lines
+        return jsonify(_tail_lines(file_path, _LOG_TAIL_LINES))
     except FileNotFoundError:
         return jsonify({"error": "File not found"}), 404
     except Exception as e:
@@ -339,11 +411,9 @@ def stream_log_content(filename):
     Returns:
         flask.Response: An SSE stream that pushes log lines to the client.
     """
-    log_dir = os.path.join(os.path.dirname(current_app.root_path), 'logs')
-    file_path = os.path.join(log_dir, filename)
-
     # Security check
-    if not os.path.abspath(file_path).startswith(os.path.abspath(log_dir)):
+    file_path = _resolve_log_path(filename)
+    if file_path is None:
         return Response("data: ERROR: Access Denied\n\n", mimetype='text/event-stream', status=403)
 
     if not os.path.exists(file_path):
@@ -351,18 +421,40 @@ def stream_log_content(filename):
 
     def generate_log_updates(file_path_stream):
         """Generator function to yield new log lines."""
+        watcher = None
         try:
+            if INotify is not None:
+                try:
+                    watcher = INotify()
+                    watcher.add_watch(file_path_stream, inotify_flags.MODIFY)
+                except OSError as e:
+                    current_app.logger.debug(f"inotify unavailable for {file_path_stream}, polling: {e}")
+                    watcher = None
             with open(file_path_stream, 'r', encoding='utf-8') as f:
                 f.seek(0, os.SEEK_END)
+                last_sent = time.monotonic()
                 while True:
-                    line = f.readline()
-                    if not line:
-                        time.sleep(0.5)
+                    # Send everything appended since the last wake-up in one write
+                    lines = f.readlines()
+                    if lines:
+                        yield ''.join(f"data: {line.rstrip()}\n\n" for line in lines)
+                        last_sent = time.monotonic()
                         continue
-                    yield f"data: {line.rstrip()}\n\n"
+                    if time.monotonic() - last_sent >= _LOG_STREAM_HEARTBEAT_SECONDS:
+                        # SSE comment line; keeps proxies from closing an idle stream
+                        yield ": keepalive\n\n"
+                        last_sent = time.monotonic()
+                    if watcher is not None:
+                        # Blocks until the file is written, or until the next keepalive is due
+                        watcher.read(timeout=_LOG_STREAM_HEARTBEAT_SECONDS * 1000)
+                    else:
+                        time.sleep(_LOG_STREAM_POLL_SECONDS)
         except Exception as e:
             current_app.logger.error(f"Error streaming log file {file_path_stream}: {e}")
             yield f"data: ERROR: Could not stream log: {str(e)}\n\n"
+        finally:
+            if watcher is not None:
+                watcher.close()
 
     return Response(stream_with_context(generate_log_updates(file_path)), mimetype='text/event-stream')
 
@@ -377,7 +469,6 @@ def plex_webhook_payloads():
     db = get_db()
     rows = db.execute('SELECT id, event_type, event_timestamp, raw_payload FROM plex_activity_log ORDER BY event_timestamp DESC LIMIT 20').fetchall()
     payloads = []
-    import json
     for row in rows:
         try:
             payload = json.loads(row['raw_payload']) if row['raw_payload'] else {}
@@ -4,7 +4,6 @@ import time
 import secrets
 import socket
 import requests
-from openai import OpenAI
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -14,6 +13,7 @@ from werkzeug.security import generate_password_hash
 from functools import wraps
 
 from ... import database
+from ...http_client import http_session
 from ...database import get_db, close_db, get_setting, set_setting, update_sync_status
 from ...utils import (
     sync_sonarr_library, sync_radarr_library,
@@ -30,6 +30,7 @@ from ...utils import (
     convert_utc_to_user_timezone, get_user_timezone,
     get_jellyseer_user_requests,
 )
+from ...data_transforms import SEASON_EPISODE_RE
 from . import admin_bp, admin_required, ADMIN_SEARCHABLE_ROUTES
 
 @admin_bp.route('/users')
@@ -164,7 +165,6 @@ def update_user_permissions(user_id):
 @admin_required
 def import_plex_users():
     """Fetch all Plex users (home/managed + friends) and create inactive accounts for any not registered."""
-    import requests as _requests
     db = database.get_db()
 
     admin_row = db.execute(
@@ -187,7 +187,7 @@ def import_plex_users():
     def _collect(url, extract):
         """Fetch a Plex endpoint and merge results into candidates."""
         try:
-            resp = _requests.get(url, headers=headers, timeout=10)
+            resp = http_session.get(url, headers=headers, timeout=10)
             resp.raise_for_status()
             for pu in extract(resp):
                 pid = str(pu.get('id', ''))
@@ -266,13 +266,11 @@ def resolve_issue_report(report_id):
 
     # Create notification for the user who reported
     try:
-        import re
-
         # Parse episode info from title
         season_num = None
         episode_num = None
         if ' - S' in report['title']:
-            match = re.search(r'S(\d+)E(\d+)', report['title'])
+            match = SEASON_EPISODE_RE.search(report['title'])
             if match:
                 season_num = int(match.group(1))
                 episode_num = int(match.group(2))
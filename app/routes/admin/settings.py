@@ -1,10 +1,14 @@
 import os
 import glob
+import json
+import hashlib
 import time
 import secrets
 import socket
+import threading
 import requests
-from openai import OpenAI
+import pytz
+from concurrent.futures import ThreadPoolExecutor
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
@@ -14,6 +18,7 @@ from werkzeug.security import generate_password_hash
 from functools import wraps
 
 from ... import database
+from ...http_client import http_session
 from ...database import get_db, close_db, get_setting, set_setting, update_sync_status
 from ...utils import (
     sync_sonarr_library, sync_radarr_library,
@@ -32,6 +37,114 @@ from ...utils import (
 )
 from . import admin_bp, admin_required, ADMIN_SEARCHABLE_ROUTES
 
+# Suggested Plex client id when none is saved. The hostname doesn't change while
+# the app runs, so it is looked up once rather than on every settings page load.
+_DEFAULT_PLEX_CLIENT_ID = f'shownotes-app-{socket.gethostname()}'
+# Status dots on the settings page, keyed by the service prefix of their element id.
+_SETTINGS_CONNECTION_TESTS = (
+    ('sonarr', test_sonarr_connection),
+    ('radarr', test_radarr_connection),
+    ('bazarr', test_bazarr_connection),
+    ('tautulli', test_tautulli_connection),
+    ('jellyseerr', test_jellyseer_connection),
+    ('thetvdb', test_thetvdb_connection),
+)
+# Settings columns written by the settings form, in the order the POST handler
+# passes their values.
+_SETTINGS_FORM_COLUMNS = (
+    'radarr_url', 'radarr_api_key', 'radarr_remote_url', 'sonarr_url',
+    'sonarr_api_key', 'sonarr_remote_url', 'bazarr_url', 'bazarr_api_key',
+    'bazarr_remote_url', 'pushover_key', 'pushover_token', 'ntfy_url', 'ntfy_topic',
+    'ntfy_token', 'notify_on_problem_report', 'notify_on_new_user',
+    'notify_on_issue_resolved', 'plex_client_id', 'tautulli_url', 'tautulli_api_key',
+    'thetvdb_api_key', 'timezone', 'jellyseer_url', 'jellyseer_api_key',
+    'jellyseer_remote_url', 'ollama_url', 'ollama_model_name', 'openai_api_key',
+    'openai_model_name', 'preferred_llm_provider', 'schedule_tautulli_hour',
+    'schedule_tautulli_minute', 'schedule_sonarr_day', 'schedule_sonarr_hour',
+    'schedule_sonarr_minute', 'schedule_radarr_day', 'schedule_radarr_hour',
+    'schedule_radarr_minute', 'llm_knowledge_cutoff_date',
+    'summary_schedule_start_hour', 'summary_schedule_end_hour',
+    'summary_delay_seconds', 'summary_enabled',
+)
+# Targets the existing settings row (id 1 on a fresh install) without reading
+# it first.
+_SETTINGS_UPSERT_SQL = (
+    f"INSERT INTO settings (id, {', '.join(_SETTINGS_FORM_COLUMNS)}) "
+    f"VALUES (COALESCE((SELECT id FROM settings ORDER BY id LIMIT 1), 1){', ?' * len(_SETTINGS_FORM_COLUMNS)}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{col}=excluded.{col}' for col in _SETTINGS_FORM_COLUMNS)}"
+)
+_CONNECTION_STATUS_TTL = 30
+_connection_status_cache = {}
+_connection_status_lock = threading.Lock()
+# Held while services are being probed, so concurrent status requests (several
+# admin tabs, or a reload mid-probe) wait for one run instead of each starting
+# their own round of outbound tests.
+_connection_status_refresh_lock = threading.Lock()
+# Ollama model lists by server URL, so reopening the settings pages doesn't
+# query /api/tags each time; cleared when settings are saved.
+_OLLAMA_MODELS_TTL = 300
+_ollama_models_cache = {}  # api_url -> (time.monotonic() when fetched, model names)
+_ollama_models_lock = threading.Lock()
+
+
+def _run_connection_test(app_instance, test_func):
+    with app_instance.app_context():
+        return test_func()
+
+
+def _get_connection_statuses():
+    """
+    Returns the settings page connection statuses, testing services concurrently.
+
+    Results are kept for a short TTL so repeated page loads don't re-probe every
+    service; the cache is cleared whenever settings are saved. Requests that
+    miss while a probe is running wait for it and share its results.
+    """
+    cached = _cached_connection_statuses()
+    if cached is not None:
+        return cached
+
+    with _connection_status_refresh_lock:
+        cached = _cached_connection_statuses()
+        if cached is not None:
+            return cached
+
+        app_instance = current_app._get_current_object()
+        statuses = {}
+        with ThreadPoolExecutor(max_workers=len(_SETTINGS_CONNECTION_TESTS)) as executor:
+            futures = {
+                name: executor.submit(_run_connection_test, app_instance, test_func)
+                for name, test_func in _SETTINGS_CONNECTION_TESTS
+            }
+            for name, future in futures.items():
+                try:
+                    statuses[name] = future.result()
+                except Exception as e:
+                    current_app.logger.error(f"Connection test for {name} failed: {e}")
+                    statuses[name] = (False, str(e))
+
+        with _connection_status_lock:
+            _connection_status_cache['statuses'] = (time.time(), statuses)
+        return statuses
+
+
+def _cached_connection_statuses():
+    with _connection_status_lock:
+        cached = _connection_status_cache.get('statuses')
+        if cached and time.time() - cached[0] < _CONNECTION_STATUS_TTL:
+            return cached[1]
+    return None
+
+
+def _invalidate_connection_statuses():
+    with _connection_status_lock:
+        _connection_status_cache.clear()
+
+
+def _invalidate_ollama_models():
+    with _ollama_models_lock:
+        _ollama_models_cache.clear()
+
 @admin_bp.route('/ai-summaries')
 @login_required
 @admin_required
@@ -63,35 +176,20 @@ def settings():
         - A redirect to the settings page on POST.
     """
     db = database.get_db()
-    user = db.execute('SELECT * FROM users WHERE is_admin=1 LIMIT 1').fetchone()
-    settings = db.execute('SELECT * FROM settings LIMIT 1').fetchone()
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
-        if username and user:
-            db.execute('UPDATE users SET username=? WHERE id=?', (username, user['id']))
-        if password:
-            pw_hash = generate_password_hash(password)
-            db.execute('UPDATE users SET password_hash=? WHERE id=?', (pw_hash, user['id']))
-        db.execute('''UPDATE settings SET
-            radarr_url=?, radarr_api_key=?, radarr_remote_url=?,
-            sonarr_url=?, sonarr_api_key=?, sonarr_remote_url=?,
-            bazarr_url=?, bazarr_api_key=?, bazarr_remote_url=?,
-            pushover_key=?, pushover_token=?,
-            ntfy_url=?, ntfy_topic=?, ntfy_token=?,
-            notify_on_problem_report=?, notify_on_new_user=?, notify_on_issue_resolved=?,
-            plex_client_id=?, tautulli_url=?, tautulli_api_key=?,
-            thetvdb_api_key=?, timezone=?,
-            jellyseer_url=?, jellyseer_api_key=?, jellyseer_remote_url=?,
-            ollama_url=?, ollama_model_name=?, openai_api_key=?, openai_model_name=?,
-            preferred_llm_provider=?,
-            schedule_tautulli_hour=?, schedule_tautulli_minute=?,
-            schedule_sonarr_day=?, schedule_sonarr_hour=?, schedule_sonarr_minute=?,
-            schedule_radarr_day=?, schedule_radarr_hour=?, schedule_radarr_minute=?,
-            llm_knowledge_cutoff_date=?,
-            summary_schedule_start_hour=?, summary_schedule_end_hour=?,
-            summary_delay_seconds=?, summary_enabled=?
-            WHERE id=?''', (
+        # Username and password in one statement; blank fields keep their value.
+        # The admin row is resolved inside the UPDATE, so a save needs no reads.
+        # The settings form doesn't normally send either field, and then the
+        # statement (and the password hash) is skipped.
+        if username or password:
+            db.execute(
+                '''UPDATE users SET username=COALESCE(?, username), password_hash=COALESCE(?, password_hash)
+                   WHERE id=(SELECT id FROM users WHERE is_admin=1 LIMIT 1)''',
+                (username or None, generate_password_hash(password) if password else None)
+            )
+        db.execute(_SETTINGS_UPSERT_SQL, (
             request.form.get('radarr_url'),
             request.form.get('radarr_api_key'),
             request.form.get('radarr_remote_url'),
@@ -135,9 +233,11 @@ def settings():
             request.form.get('summary_schedule_end_hour', 6, type=int),
             request.form.get('summary_delay_seconds', 30, type=int),
             1 if request.form.get('summary_enabled') else 0,
-            settings['id'] if settings else 1
         ))
         db.commit()
+        database._invalidate_settings_cache()
+        _invalidate_connection_statuses()
+        _invalidate_ollama_models()
 
         # Reschedule background jobs with new times
         try:
@@ -148,7 +248,8 @@ def settings():
 
         flash('Settings updated successfully.', 'success')
         return redirect(url_for('admin.settings'))
-    
+
+    settings = db.execute('SELECT * FROM settings LIMIT 1').fetchone()
     if settings and ('plex_redirect_uri' in settings and settings['plex_redirect_uri']):
         redirect_uri = settings['plex_redirect_uri']
     else:
@@ -157,7 +258,7 @@ def settings():
         else:
             redirect_uri = request.url_root.rstrip('/') + '/callback'
     defaults = {
-        'plex_client_id': settings['plex_client_id'] if settings and 'plex_client_id' in settings and settings['plex_client_id'] else f'shownotes-app-{socket.gethostname()}',
+        'plex_client_id': settings['plex_client_id'] if settings and 'plex_client_id' in settings and settings['plex_client_id'] else _DEFAULT_PLEX_CLIENT_ID,
         'plex_client_secret': settings['plex_client_secret'] if settings and 'plex_client_secret' in settings and settings['plex_client_secret'] else '',
         'plex_redirect_uri': redirect_uri,
     }
@@ -177,36 +278,43 @@ def settings():
     sonarr_webhook_url = url_for('main.sonarr_webhook', _external=True)
     radarr_webhook_url = url_for('main.radarr_webhook', _external=True)
 
-    sonarr_status = test_sonarr_connection()
-    radarr_status = test_radarr_connection()
-    bazarr_status = test_bazarr_connection()
-    tautulli_status = test_tautulli_connection()
-    jellyseerr_status = test_jellyseer_connection()
-    thetvdb_status = test_thetvdb_connection()
-
     # Get list of timezones
-    import pytz
     timezones = pytz.common_timezones
 
     return render_template(
         'admin_settings.html',
-        user=user,
         settings=merged_settings,
         site_url=site_url,
         plex_webhook_url=plex_webhook_url,
         sonarr_webhook_url=sonarr_webhook_url,
         radarr_webhook_url=radarr_webhook_url,
-        sonarr_status=sonarr_status,
-        radarr_status=radarr_status,
-        bazarr_status=bazarr_status,
-        tautulli_status=tautulli_status,
-        jellyseerr_status=jellyseerr_status,
-        thetvdb_status=thetvdb_status,
         ollama_models=[],
         saved_ollama_model=merged_settings.get('ollama_model_name'),
         timezones=timezones
     )
 
+@admin_bp.route('/settings/status.json')
+@login_required
+@admin_required
+def settings_status():
+    """
+    Returns the connection status of each configured service as JSON.
+
+    The settings page loads its status dots from here after rendering, so the
+    page itself never waits on the outbound probes. The response carries an
+    ETag over the statuses, letting the browser revalidate with a 304 while
+    nothing has changed.
+    """
+    statuses = {
+        service: {'success': bool(status[0]), 'message': status[1]}
+        for service, status in _get_connection_statuses().items()
+    }
+    body = json.dumps(statuses, sort_keys=True)
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body.encode('utf-8')).hexdigest())
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
 @admin_bp.route('/gen_plex_secret', methods=['POST'])
 @login_required
 @admin_required
@@ -274,20 +382,24 @@ def get_ollama_models():
     Fetches the available models from an Ollama server.
 
     Expects a 'url' query parameter with the Ollama server's URL.
-    Returns a JSON list of model names or an error.
+    Returns a JSON list of model names or an error. Successful lists are
+    cached per URL for a few minutes.
     """
     ollama_url = request.args.get('url')
     if not ollama_url:
         return jsonify({'error': 'Ollama URL parameter is required.'}), 400
 
+    # Ensure the URL is well-formed
+    api_url = ollama_url.rstrip('/') + '/api/tags'
+    with _ollama_models_lock:
+        cached = _ollama_models_cache.get(api_url)
+    if cached and time.monotonic() - cached[0] < _OLLAMA_MODELS_TTL:
+        return jsonify({'models': cached[1]})
+
     try:
-        import requests
-        # Ensure the URL is well-formed
-        api_url = ollama_url.rstrip('/') + '/api/tags'
-        
         current_app.logger.info(f"Fetching Ollama models from: {api_url}")
         
-        resp = requests.get(api_url, timeout=5)
+        resp = http_session.get(api_url, timeout=5)
         resp.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
         data = resp.json()
@@ -298,7 +410,9 @@ def get_ollama_models():
         ollama_models = [m.get('name') for m in data.get('models', []) if m.get('name')]
         
         current_app.logger.info(f"Successfully fetched {len(ollama_models)} models from Ollama.")
-        
+        with _ollama_models_lock:
+            _ollama_models_cache[api_url] = (time.monotonic(), ollama_models)
+
         return jsonify({'models': ollama_models})
 
     except requests.exceptions.Timeout:
@@ -350,12 +464,11 @@ def test_ntfy_route():
     if not ntfy_topic:
         return jsonify({'success': False, 'error': 'Topic is required'}), 400
 
-    import requests as _req
     headers = {'Title': 'ShowNotes Test', 'Content-Type': 'text/plain'}
     if ntfy_token:
         headers['Authorization'] = f'Bearer {ntfy_token}'
     try:
-        resp = _req.post(f"{ntfy_url}/{ntfy_topic}", data=b'This is a test notification from ShowNotes!', headers=headers, timeout=5)
+        resp = http_session.post(f"{ntfy_url}/{ntfy_topic}", data=b'This is a test notification from ShowNotes!', headers=headers, timeout=5)
         if resp.status_code in (200, 201, 202):
             return jsonify({'success': True})
         return jsonify({'success': False, 'error': f'HTTP {resp.status_code}: {resp.text}'}), 400
@@ -4,7 +4,6 @@ import time
 import secrets
 import socket
 import requests
-from openai import OpenAI
 from flask import (
     render_template, request, redirect, url_for, session, jsonify, flash,
     current_app, Response, stream_with_context, abort
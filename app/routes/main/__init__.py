@@ -43,6 +43,7 @@ from ... import database
 main_bp = Blueprint('main', __name__)
 _SESSION_FREE_ENDPOINTS = {'main.calendar_ical_feed'}
 
+from . import _shared
 from ._shared import get_current_member, get_user_members, is_onboarding_complete
 
 @main_bp.context_processor
@@ -74,8 +75,17 @@ def inject_household():
 _homepage_cache = {}
 _homepage_cache_lock = threading.Lock()
 _IMAGE_ROUTE_ENDPOINTS = {'main.image_proxy', 'main.cast_image_proxy'}
-_POSTER_THUMBNAIL_SIZE = (240, 360)
-_POSTER_THUMBNAIL_QUALITY = 78
+_STATIC_PATH_PREFIXES = ('/static/', '/favicon')
+# Endpoints reachable before onboarding is complete
+_ONBOARDING_EXEMPT_ENDPOINTS = frozenset({
+    'main.onboarding', # Onboarding Step 1 (admin account)
+    'main.onboarding_services', # Onboarding Step 2 (service config)
+    'main.onboarding_test_service', # Onboarding service testing
+    'main.login',
+    'main.callback',
+    'main.logout',
+    'main.plex_webhook',
+})
 
 
 @main_bp.before_app_request
@@ -88,7 +98,16 @@ def check_onboarding():
     page to create an admin account and configure initial settings. It exempts
     critical endpoints like the onboarding page itself, login/logout routes, and
     static file requests to prevent a redirect loop.
+
+    Once onboarding is complete it stays complete, so from then on this hook
+    returns on its first line for every request, static files included.
     """
+    if _shared._onboarding_complete:
+        return
+
+    if request.endpoint == 'static' or request.path.startswith(_STATIC_PATH_PREFIXES):
+        return
+
     if request.endpoint in _IMAGE_ROUTE_ENDPOINTS:
         return
 
@@ -97,16 +116,7 @@ def check_onboarding():
 
     if request.endpoint and 'static' not in request.endpoint:
         # Allow access to specific endpoints even if onboarding is not complete
-        exempt_endpoints = [
-            'main.onboarding', # Onboarding Step 1 (admin account)
-            'main.onboarding_services', # Onboarding Step 2 (service config)
-            'main.onboarding_test_service', # Onboarding service testing
-            'main.login',
-            'main.callback',
-            'main.logout',
-            'main.plex_webhook'
-        ]
-        if not is_onboarding_complete() and request.endpoint not in exempt_endpoints:
+        if request.endpoint not in _ONBOARDING_EXEMPT_ENDPOINTS and not is_onboarding_complete():
             flash('Initial setup required. Please complete the onboarding process.', 'info')
             return redirect(url_for('main.onboarding'))
 
@@ -120,6 +130,9 @@ def update_session_profile_photo():
     Performance optimization: Skip for static file requests and use request-level caching.
     """
     # Skip for static file requests to improve performance
+    if request.path.startswith(_STATIC_PATH_PREFIXES):
+        return
+
     if request.endpoint in _IMAGE_ROUTE_ENDPOINTS:
         return
 
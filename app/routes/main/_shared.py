@@ -1,7 +1,6 @@
 import os
 import json
 import requests
-import re
 import sqlite3
 import time
 import datetime
@@ -17,11 +16,22 @@ from flask import (
 from flask_login import login_required, current_user
 
 from ... import database
+from ...data_transforms import SEASON_EPISODE_RE
+from ...image_cache import cached_image_path as _get_cached_image_path, is_image_known_cached
 
 
-last_plex_event = None
 _homepage_cache = {}
 _homepage_cache_lock = threading.Lock()
+# Onboarding only ever goes from incomplete to complete, so once it is seen
+# complete the per-request check no longer needs the database.
+_onboarding_complete = False
+# Image cache directory listings used by _get_media_image_url. Images this
+# process downloads are picked up at once through image_cache's known-cached
+# set; files added by anything else show up with the next listing.
+_CACHED_IMAGE_INDEX_TTL = 10
+_cached_image_index = {}  # directory -> (timestamp, frozenset of file names)
+_cached_image_index_lock = threading.Lock()
+_placeholder_filenames = {}  # image_type -> static placeholder file name
 
 # ── Household member helpers ──────────────────────────────────────────────────
 
@@ -78,24 +88,47 @@ def _get_cached_value(cache_key, ttl_seconds, loader):
 
     return value
 
-def _get_cached_image_path(image_type, tmdb_id, variant='full'):
-    if variant == 'thumb':
-        return os.path.join(current_app.static_folder, image_type, 'thumbs', f'{tmdb_id}.jpg')
-    return os.path.join(current_app.static_folder, image_type, f'{tmdb_id}.jpg')
+def _get_cached_image_names(directory):
+    """
+    Returns the file names in an image cache directory.
+
+    Pages like the homepage check dozens of posters per render; listing the
+    directory once with os.scandir (refreshed every few seconds) replaces a
+    stat per poster with a set lookup.
+    """
+    now = time.time()
+    with _cached_image_index_lock:
+        entry = _cached_image_index.get(directory)
+        if entry and now - entry[0] < _CACHED_IMAGE_INDEX_TTL:
+            return entry[1]
+
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        names = frozenset()
+
+    with _cached_image_index_lock:
+        _cached_image_index[directory] = (now, names)
+    return names
 
 def _get_media_image_url(image_type, tmdb_id, variant='full'):
     if not tmdb_id:
-        placeholder = f'logos/placeholder_{image_type}.png'
-        if os.path.exists(os.path.join(current_app.static_folder, placeholder)):
-            return url_for('static', filename=placeholder)
-        return url_for('static', filename='logos/placeholder_poster.png')
+        placeholder = _placeholder_filenames.get(image_type)
+        if placeholder is None:
+            placeholder = f'logos/placeholder_{image_type}.png'
+            if not os.path.exists(os.path.join(current_app.static_folder, placeholder)):
+                placeholder = 'logos/placeholder_poster.png'
+            _placeholder_filenames[image_type] = placeholder
+        return url_for('static', filename=placeholder)
 
     cached_filename = f'{image_type}/{tmdb_id}.jpg'
     if variant == 'thumb':
         cached_filename = f'{image_type}/thumbs/{tmdb_id}.jpg'
 
     cached_path = _get_cached_image_path(image_type, tmdb_id, variant=variant)
-    if os.path.exists(cached_path):
+    if (is_image_known_cached(cached_path)
+            or os.path.basename(cached_path) in _get_cached_image_names(os.path.dirname(cached_path))):
         return url_for('static', filename=cached_filename)
     return url_for('main.image_proxy', type=image_type, id=tmdb_id, variant=variant)
 
@@ -107,14 +140,20 @@ def is_onboarding_complete():
     existence of at least one admin user and at least one settings record in the
     database.
 
+    A True result is remembered for the life of the process.
+
     Returns:
         bool: True if both an admin user and a settings record exist, False otherwise.
     """
+    global _onboarding_complete
+    if _onboarding_complete:
+        return True
     try:
         db = database.get_db()
         admin_user = db.execute('SELECT id FROM users WHERE is_admin = 1 LIMIT 1').fetchone()
-        settings_record = db.execute('SELECT id FROM settings LIMIT 1').fetchone()
-        return admin_user is not None and settings_record is not None
+        settings_record = database._get_settings_row()
+        _onboarding_complete = admin_user is not None and settings_record is not None
+        return _onboarding_complete
     except sqlite3.OperationalError:
         return False
 
@@ -144,7 +183,7 @@ def _get_profile_stats(db, user_id=None, now_playing_count=None, member_id=None)
         stats['now_playing_count'] = get_tautulli_activity()
 
     # Compute start of today in the app's configured timezone (avoids UTC midnight mismatch)
-    tz_name = db.execute("SELECT timezone FROM settings LIMIT 1").fetchone()
+    tz_name = database._get_settings_row()
     tz_name = tz_name['timezone'] if tz_name and tz_name['timezone'] else 'UTC'
     try:
         tz = pytz.timezone(tz_name)
@@ -225,6 +264,32 @@ def _get_profile_stats(db, user_id=None, now_playing_count=None, member_id=None)
 
     return stats
 
+def _extract_guid_ids(guids):
+    """
+    Returns the (tmdb_id, tvdb_id) pair from a Plex Metadata ``Guid`` list.
+
+    Plex sends entries such as ``{'id': 'tmdb://1399'}``. Unparseable or missing
+    ids come back as None, and a later entry for the same source wins, matching
+    the order Plex lists them in.
+    """
+    tmdb_id = None
+    tvdb_id = None
+    if not isinstance(guids, list):
+        return tmdb_id, tvdb_id
+    for guid_item in guids:
+        source, sep, value = guid_item.get('id', '').partition('://')
+        if not sep or source not in ('tmdb', 'tvdb'):
+            continue
+        try:
+            parsed = int(value)
+        except ValueError:
+            parsed = None
+        if source == 'tmdb':
+            tmdb_id = parsed
+        else:
+            tvdb_id = parsed
+    return tmdb_id, tvdb_id
+
 def _get_plex_event_details(plex_event_row, db):
     """
     Enriches a Plex activity log record with detailed metadata and image URLs.
@@ -309,7 +374,7 @@ def _get_plex_event_details(plex_event_row, db):
     item_details.setdefault('year', None)
 
     if item_details.get('season_episode') and item_details.get('link_tmdb_id'):
-        match = re.match(r'S(\d+)E(\d+)', item_details['season_episode'])
+        match = SEASON_EPISODE_RE.match(item_details['season_episode'])
         if match:
             item_details['season_number'] = int(match.group(1))
             item_details['episode_number'] = int(match.group(2))
@@ -406,9 +471,7 @@ def _get_tautulli_rating_key_for_media(db, media_type, tmdb_id):
 
 def _build_admin_service_links(db, media_type, media_dict):
     """Build admin-only external service links for detail pages."""
-    settings = db.execute(
-        'SELECT tautulli_url, sonarr_url, radarr_url FROM settings LIMIT 1'
-    ).fetchone()
+    settings = database._get_settings_row()
 
     if not settings:
         return {}
@@ -1,14 +1,13 @@
 import os
 import json
-import requests
 import re
 import sqlite3
-import time
 import threading
 import datetime
 from datetime import timezone
 import urllib.parse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import markdown as md
 
 from flask import (
@@ -19,6 +18,20 @@ from flask_login import login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from ... import database
+from ...http_client import http_session
+from ...models import User
+from ...utils import (
+    sync_radarr_library, sync_sonarr_library, sync_tautulli_watch_history,
+    process_activity_log_for_watch_status,
+    test_sonarr_connection_with_params,
+    test_radarr_connection_with_params,
+    test_bazarr_connection_with_params,
+    test_ollama_connection_with_params,
+    test_tautulli_connection_with_params,
+    test_jellyseer_connection_with_params,
+    test_pushover_notification_with_params,
+    test_thetvdb_connection_with_params,
+)
 from . import main_bp
 from ._shared import (
     get_current_member, get_user_members, set_member_session,
@@ -27,6 +40,31 @@ from ._shared import (
     _calculate_show_completion, MEMBER_AVATAR_COLORS,
 )
 
+# Static identification headers sent with every plex.tv call; the client id
+# (from settings) and any auth token are merged in per call.
+_PLEX_HEADERS = {
+    'X-Plex-Product': 'ShowNotes',
+    'X-Plex-Version': '1.0',
+    'X-Plex-Platform': 'Web',
+    'X-Plex-Platform-Version': '1.0',
+    'X-Plex-Device': 'Browser',
+    'X-Plex-Device-Name': 'ShowNotes Web',
+    'Accept': 'application/json',
+}
+
+
+def _plex_headers(client_id, auth_token=None):
+    headers = {**_PLEX_HEADERS, 'X-Plex-Client-Identifier': client_id}
+    if auth_token:
+        headers['X-Plex-Token'] = auth_token
+    return headers
+
+
+def _fetch_plex_user_info(client_id, auth_token):
+    response = http_session.get('https://plex.tv/api/v2/user', headers=_plex_headers(client_id, auth_token), timeout=10)
+    response.raise_for_status()
+    return response.json()
+
 @main_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """
@@ -49,7 +87,7 @@ def login():
             password_valid = check_password_hash(user_record['password_hash'], password)
             current_app.logger.info(f"Password check result: {password_valid}")
             if password_valid:
-                user_obj = current_app.login_manager._user_callback(user_record['id'])
+                user_obj = User.from_row(user_record)
                 current_app.logger.info(f"User object created: {bool(user_obj)}")
                 if user_obj:
                     login_user(user_obj, remember=remember_me)
@@ -82,19 +120,8 @@ def plex_login_start():
         return jsonify({'error': 'Plex OAuth is not configured'}), 500
 
     # Create a PIN for Plex OAuth
-    headers = {
-        'X-Plex-Client-Identifier': client_id,
-        'X-Plex-Product': 'ShowNotes',
-        'X-Plex-Version': '1.0',
-        'X-Plex-Platform': 'Web',
-        'X-Plex-Platform-Version': '1.0',
-        'X-Plex-Device': 'Browser',
-        'X-Plex-Device-Name': 'ShowNotes Web',
-        'Accept': 'application/json'
-    }
-
     try:
-        response = requests.post('https://plex.tv/api/v2/pins?strong=true', headers=headers)
+        response = http_session.post('https://plex.tv/api/v2/pins?strong=true', headers=_plex_headers(client_id), timeout=10)
         response.raise_for_status()
         pin_data = response.json()
 
@@ -131,24 +158,17 @@ def plex_login_poll():
     if not pin_id or not client_id:
         return jsonify({'authorized': False, 'error': 'No active PIN session'}), 400
 
-    headers = {
-        'X-Plex-Client-Identifier': client_id,
-        'Accept': 'application/json'
-    }
-
     try:
-        response = requests.get(f'https://plex.tv/api/v2/pins/{pin_id}', headers=headers)
+        response = http_session.get(f'https://plex.tv/api/v2/pins/{pin_id}', headers=_plex_headers(client_id), timeout=10)
         response.raise_for_status()
         data = response.json()
 
         auth_token = data.get('authToken')
 
         if auth_token:
-            # Get user info from Plex
-            headers['X-Plex-Token'] = auth_token
-            user_response = requests.get('https://plex.tv/api/v2/user', headers=headers)
-            user_response.raise_for_status()
-            user_info = user_response.json()
+            # Get user info from Plex. Every outcome below is final, so the
+            # browser stops polling this PIN and there is nothing to reuse.
+            user_info = _fetch_plex_user_info(client_id, auth_token)
 
             plex_user_id = user_info.get('id')
             plex_username = user_info.get('username') or user_info.get('title')
@@ -159,34 +179,32 @@ def plex_login_poll():
             if plex_joined_at_timestamp:
                 plex_joined_at = datetime.datetime.fromtimestamp(plex_joined_at_timestamp, tz=timezone.utc).isoformat()
 
-            # Check if user exists in database
+            # Update plex token, last login, and Plex join date for an active
+            # user and fetch their row in the same statement
             db = database.get_db()
-            user_record = db.execute('SELECT * FROM users WHERE plex_user_id = ?', (plex_user_id,)).fetchone()
+            user_record = db.execute(
+                """UPDATE users SET plex_token = ?, last_login_at = CURRENT_TIMESTAMP,
+                   plex_joined_at = COALESCE(?, plex_joined_at)
+                   WHERE plex_user_id = ? AND is_active = 1
+                   RETURNING *""",
+                (auth_token, plex_joined_at, plex_user_id)
+            ).fetchone()
+            db.commit()
 
-            if user_record:
-                # Block inactive (imported-but-not-yet-activated) accounts
-                if not user_record['is_active']:
-                    return jsonify({'authorized': False, 'error': 'Your account has not been activated yet. Please contact the administrator.'})
+            # Block inactive (imported-but-not-yet-activated) accounts
+            if not user_record and db.execute('SELECT 1 FROM users WHERE plex_user_id = ?', (plex_user_id,)).fetchone():
+                return jsonify({'authorized': False, 'error': 'Your account has not been activated yet. Please contact the administrator.'})
 
+            if user_record:
                 # Log in the user
-                user_obj = current_app.login_manager._user_callback(user_record['id'])
+                user_obj = User.from_row(user_record)
                 if user_obj:
                     login_user(user_obj, remember=True)
                     session.permanent = True
                     session['user_id'] = user_obj.id
                     session['username'] = user_obj.username
                     session['is_admin'] = user_obj.is_admin
-                    user_record = db.execute('SELECT profile_photo_url FROM users WHERE id = ?', (user_obj.id,)).fetchone()
-                    session['profile_photo_url'] = user_record['profile_photo_url'] if user_record and user_record['profile_photo_url'] else None
-
-                    # Update plex token, last login, and Plex join date
-                    if plex_joined_at:
-                        db.execute('UPDATE users SET plex_token=?, last_login_at=CURRENT_TIMESTAMP, plex_joined_at=? WHERE id=?',
-                                  (auth_token, plex_joined_at, user_obj.id))
-                    else:
-                        db.execute('UPDATE users SET plex_token=?, last_login_at=CURRENT_TIMESTAMP WHERE id=?',
-                                  (auth_token, user_obj.id))
-                    db.commit()
+                    session['profile_photo_url'] = user_record['profile_photo_url'] or None
 
                     # Household member: auto-select if only one, else prompt picker
                     members = get_user_members(user_obj.id)
@@ -198,12 +216,10 @@ def plex_login_poll():
             else:
                 # If admin is already logged in, link their account to Plex
                 if current_user.is_authenticated and current_user.is_admin:
-                    if plex_joined_at:
-                        db.execute('UPDATE users SET plex_user_id=?, plex_username=?, plex_token=?, plex_joined_at=? WHERE id=?',
-                                  (plex_user_id, plex_username, auth_token, plex_joined_at, current_user.id))
-                    else:
-                        db.execute('UPDATE users SET plex_user_id=?, plex_username=?, plex_token=? WHERE id=?',
-                                  (plex_user_id, plex_username, auth_token, current_user.id))
+                    db.execute(
+                        'UPDATE users SET plex_user_id=?, plex_username=?, plex_token=?, plex_joined_at=COALESCE(?, plex_joined_at) WHERE id=?',
+                        (plex_user_id, plex_username, auth_token, plex_joined_at, current_user.id)
+                    )
                     db.commit()
                     return jsonify({'authorized': True, 'username': current_user.username, 'linked': True})
                 else:
@@ -225,12 +241,15 @@ def callback():
     client ID. If the PIN has been authorized, it retrieves the user's Plex
     auth token, username, and other details.
 
-    It then either finds an existing user in the database or creates a new one,
-    logs the user in, and redirects them to the homepage.
+    It then finds the existing user in the database, logs the user in, and
+    redirects them to the homepage. If the PIN is not authorized yet, the PIN is
+    checked once and a waiting page is returned that polls /login/plex/poll
+    from the browser, so no worker thread is held while the user finishes
+    signing in.
 
     Returns:
-        A redirect to the homepage on successful login, or an error page/message
-        on failure.
+        A redirect to the homepage on successful login, the waiting page if the
+        PIN is still pending, or an error page/message on failure.
     """
     pin_id = session.get('plex_pin_id')
     client_id = database.get_setting('plex_client_id')
@@ -238,27 +257,18 @@ def callback():
         flash('Plex OAuth is not configured. Please use username/password login.', 'info')
         return redirect(url_for('main.login'))
 
-    # Poll for auth token
-    poll_url = f'https://plex.tv/api/v2/pins/{pin_id}'
-    headers = {'X-Plex-Client-Identifier': client_id, 'Accept': 'application/json'}
-    start_time = time.time()
-    auth_token = None
-    while time.time() - start_time < 120: # 2 minute timeout
-        r = requests.get(poll_url, headers=headers)
-        if r.status_code == 200:
-            data = r.json()
-            if data.get('authToken'):
-                auth_token = data['authToken']
-                break
-        time.sleep(2)
-    
-    if not auth_token:
+    # By the time Plex redirects here the PIN is normally already authorized
+    r = http_session.get(f'https://plex.tv/api/v2/pins/{pin_id}', headers=_plex_headers(client_id), timeout=10)
+    if r.status_code != 200:
         flash('Plex login failed or timed out.', 'danger')
         return redirect(url_for('main.home'))
+    auth_token = r.json().get('authToken')
+    if not auth_token:
+        # Still pending: let the browser poll instead of sleeping in a worker
+        return render_template('plex_callback_wait.html')
 
     # Get user info from Plex
-    headers['X-Plex-Token'] = auth_token
-    r = requests.get('https://plex.tv/api/v2/user', headers=headers)
+    r = http_session.get('https://plex.tv/api/v2/user', headers=_plex_headers(client_id, auth_token), timeout=10)
     if r.status_code != 200:
         flash('Failed to retrieve user information from Plex.', 'danger')
         return redirect(url_for('main.home'))
@@ -272,31 +282,31 @@ def callback():
     if plex_joined_at_timestamp:
         plex_joined_at = datetime.datetime.fromtimestamp(plex_joined_at_timestamp, tz=timezone.utc).isoformat()
 
+    # Record the login and Plex join date and fetch the user row in the same
+    # statement; no row means the Plex account is not registered here
     db = database.get_db()
-    user_record = db.execute('SELECT * FROM users WHERE plex_user_id = ?', (plex_user_id,)).fetchone()
+    user_record = db.execute(
+        """UPDATE users SET last_login_at = CURRENT_TIMESTAMP,
+           plex_joined_at = COALESCE(?, plex_joined_at)
+           WHERE plex_user_id = ?
+           RETURNING *""",
+        (plex_joined_at, plex_user_id)
+    ).fetchone()
+    db.commit()
 
     if not user_record:
         flash(f"Plex user {user_info.get('username')} is not registered in this application.", 'warning')
         return redirect(url_for('main.home'))
 
     # Log in the user
-    user_obj = current_app.login_manager._user_callback(user_record['id'])
+    user_obj = User.from_row(user_record)
     if user_obj:
         login_user(user_obj, remember=True)
         session.permanent = True
         session['user_id'] = user_obj.id
         session['username'] = user_obj.username
         session['is_admin'] = user_obj.is_admin
-        user_record = db.execute('SELECT profile_photo_url FROM users WHERE id = ?', (user_obj.id,)).fetchone()
-        session['profile_photo_url'] = user_record['profile_photo_url'] if user_record and user_record['profile_photo_url'] else None
-
-        # Update last login and Plex join date
-        if plex_joined_at:
-            db.execute('UPDATE users SET last_login_at=CURRENT_TIMESTAMP, plex_joined_at=? WHERE id=?',
-                      (plex_joined_at, user_obj.id))
-        else:
-            db.execute('UPDATE users SET last_login_at=CURRENT_TIMESTAMP WHERE id=?', (user_obj.id,))
-        db.commit()
+        session['profile_photo_url'] = user_record['profile_photo_url'] or None
         flash(f'Welcome back, {user_obj.username}!', 'success')
     else:
         flash('Could not log you in. Please contact an administrator.', 'danger')
@@ -407,43 +417,66 @@ def onboarding_services():
             # Get timezone from form, or use browser-detected timezone if available
             timezone = request.form.get('timezone', '')
             
-            # Create settings record with service configurations
-            db.execute(
-                '''INSERT INTO settings (radarr_url, radarr_api_key, radarr_remote_url,
-                   sonarr_url, sonarr_api_key, sonarr_remote_url,
-                   bazarr_url, bazarr_api_key,
-                   tautulli_url, tautulli_api_key,
-                   jellyseer_url, jellyseer_api_key,
-                   ollama_url, ollama_model_name,
-                   openai_api_key, openai_model_name,
-                   pushover_key, pushover_token, plex_client_id,
-                   thetvdb_api_key, timezone)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                (
-                    request.form.get('radarr_url', ''),
-                    request.form.get('radarr_api_key', ''),
-                    request.form.get('radarr_remote_url', ''),
-                    request.form.get('sonarr_url', ''),
-                    request.form.get('sonarr_api_key', ''),
-                    request.form.get('sonarr_remote_url', ''),
-                    request.form.get('bazarr_url', ''),
-                    request.form.get('bazarr_api_key', ''),
-                    request.form.get('tautulli_url', ''),
-                    request.form.get('tautulli_api_key', ''),
-                    request.form.get('jellyseer_url', ''),
-                    request.form.get('jellyseer_api_key', ''),
-                    request.form.get('ollama_url', ''),
-                    request.form.get('ollama_model', ''),
-                    request.form.get('openai_api_key', ''),
-                    request.form.get('openai_model', ''),
-                    request.form.get('pushover_key', ''),
-                    request.form.get('pushover_token', ''),
-                    request.form.get('plex_client_id', ''),
-                    request.form.get('thetvdb_api_key', ''),
-                    timezone
+            # Create (or replace) the single settings row in one transaction
+            with db:
+                db.execute(
+                    '''INSERT INTO settings (id, radarr_url, radarr_api_key, radarr_remote_url,
+                       sonarr_url, sonarr_api_key, sonarr_remote_url,
+                       bazarr_url, bazarr_api_key,
+                       tautulli_url, tautulli_api_key,
+                       jellyseer_url, jellyseer_api_key,
+                       ollama_url, ollama_model_name,
+                       openai_api_key, openai_model_name,
+                       pushover_key, pushover_token, plex_client_id,
+                       thetvdb_api_key, timezone)
+                       VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(id) DO UPDATE SET
+                       radarr_url = excluded.radarr_url,
+                       radarr_api_key = excluded.radarr_api_key,
+                       radarr_remote_url = excluded.radarr_remote_url,
+                       sonarr_url = excluded.sonarr_url,
+                       sonarr_api_key = excluded.sonarr_api_key,
+                       sonarr_remote_url = excluded.sonarr_remote_url,
+                       bazarr_url = excluded.bazarr_url,
+                       bazarr_api_key = excluded.bazarr_api_key,
+                       tautulli_url = excluded.tautulli_url,
+                       tautulli_api_key = excluded.tautulli_api_key,
+                       jellyseer_url = excluded.jellyseer_url,
+                       jellyseer_api_key = excluded.jellyseer_api_key,
+                       ollama_url = excluded.ollama_url,
+                       ollama_model_name = excluded.ollama_model_name,
+                       openai_api_key = excluded.openai_api_key,
+                       openai_model_name = excluded.openai_model_name,
+                       pushover_key = excluded.pushover_key,
+                       pushover_token = excluded.pushover_token,
+                       plex_client_id = excluded.plex_client_id,
+                       thetvdb_api_key = excluded.thetvdb_api_key,
+                       timezone = excluded.timezone''',
+                    (
+                        request.form.get('radarr_url', ''),
+                        request.form.get('radarr_api_key', ''),
+                        request.form.get('radarr_remote_url', ''),
+                        request.form.get('sonarr_url', ''),
+                        request.form.get('sonarr_api_key', ''),
+                        request.form.get('sonarr_remote_url', ''),
+                        request.form.get('bazarr_url', ''),
+                        request.form.get('bazarr_api_key', ''),
+                        request.form.get('tautulli_url', ''),
+                        request.form.get('tautulli_api_key', ''),
+                        request.form.get('jellyseer_url', ''),
+                        request.form.get('jellyseer_api_key', ''),
+                        request.form.get('ollama_url', ''),
+                        request.form.get('ollama_model', ''),
+                        request.form.get('openai_api_key', ''),
+                        request.form.get('openai_model', ''),
+                        request.form.get('pushover_key', ''),
+                        request.form.get('pushover_token', ''),
+                        request.form.get('plex_client_id', ''),
+                        request.form.get('thetvdb_api_key', ''),
+                        timezone
+                    )
                 )
-            )
-            db.commit()
+            database._invalidate_settings_cache()
 
             # Clear onboarding session data
             session.pop('onboarding_username', None)
@@ -453,25 +486,31 @@ def onboarding_services():
             has_sonarr = bool(request.form.get('sonarr_url') and request.form.get('sonarr_api_key'))
             has_tautulli = bool(request.form.get('tautulli_url') and request.form.get('tautulli_api_key'))
 
-            # Automatically queue library imports in background
-            import threading
-            from ...utils import sync_radarr_library, sync_sonarr_library, sync_tautulli_watch_history, process_activity_log_for_watch_status
+            # Automatically queue library imports in background. The thread
+            # runs outside this request, so it gets the app object explicitly.
+            app_instance = current_app._get_current_object()
 
-            def run_background_imports(radarr, sonarr, tautulli):
-                """Run all initial library imports in sequence"""
-                with current_app.app_context():
-                    try:
-                        # Import Radarr library
-                        if radarr:
-                            current_app.logger.info("Starting automatic Radarr import after onboarding")
-                            sync_radarr_library()
+            def import_library(app, name, sync_library):
+                with app.app_context():
+                    current_app.logger.info(f"Starting automatic {name} import after onboarding")
+                    sync_library()
 
-                        # Import Sonarr library
-                        if sonarr:
-                            current_app.logger.info("Starting automatic Sonarr import after onboarding")
-                            sync_sonarr_library()
-
-                        # Import Tautulli history
+            def run_background_imports(app, radarr, sonarr, tautulli):
+                """Run the initial library imports, then the Tautulli history import"""
+                with app.app_context():
+                    try:
+                        # Radarr and Sonarr imports are independent of each other,
+                        # so they run side by side
+                        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='onboarding-import') as pool:
+                            futures = []
+                            if radarr:
+                                futures.append(pool.submit(import_library, app, 'Radarr', sync_radarr_library))
+                            if sonarr:
+                                futures.append(pool.submit(import_library, app, 'Sonarr', sync_sonarr_library))
+                            for future in futures:
+                                future.result()
+
+                        # Import Tautulli history once the shows and movies it maps to exist
                         if tautulli:
                             current_app.logger.info("Starting automatic Tautulli import after onboarding")
                             sync_tautulli_watch_history(full_import=False, max_records=1000)
@@ -488,7 +527,7 @@ def onboarding_services():
             # Start background thread for imports
             import_thread = threading.Thread(
                 target=run_background_imports,
-                args=(has_radarr, has_sonarr, has_tautulli),
+                args=(app_instance, has_radarr, has_sonarr, has_tautulli),
                 daemon=True
             )
             import_thread.start()
@@ -510,17 +549,6 @@ def onboarding_test_service():
     Expects JSON payload with 'service', 'url', and 'key' (API key).
     Returns JSON indicating success or failure.
     """
-    from ...utils import (
-        test_sonarr_connection_with_params,
-        test_radarr_connection_with_params,
-        test_bazarr_connection_with_params,
-        test_ollama_connection_with_params,
-        test_tautulli_connection_with_params,
-        test_jellyseer_connection_with_params,
-        test_pushover_notification_with_params,
-        test_thetvdb_connection_with_params
-    )
-
     data = request.json
     service = data.get('service')
     url = data.get('url')
@@ -19,6 +19,7 @@ from flask_login import login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from ... import database
+from ...http_client import http_session
 from . import main_bp
 from ._shared import (
     get_current_member, get_user_members, set_member_session,
@@ -649,7 +650,7 @@ def jellyseer_request_season():
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
 
     db = database.get_db()
-    settings = db.execute('SELECT jellyseer_url, jellyseer_api_key FROM settings LIMIT 1').fetchone()
+    settings = database._get_settings_row()
 
     if not settings or not settings['jellyseer_url'] or not settings['jellyseer_api_key']:
         return jsonify({'success': False, 'error': 'Jellyseerr not configured'}), 400
@@ -658,10 +659,8 @@ def jellyseer_request_season():
     api_key = settings['jellyseer_api_key']
 
     try:
-        import requests
-
         # Request the season via Jellyseerr API
-        response = requests.post(
+        response = http_session.post(
             f'{jellyseer_url}/api/v1/request',
             headers={
                 'X-Api-Key': api_key,
@@ -692,7 +691,7 @@ def jellyseer_request_season():
 def jellyseer_trending():
     """Fetch trending content from Jellyseerr"""
     db = database.get_db()
-    settings = db.execute('SELECT jellyseer_url, jellyseer_api_key FROM settings LIMIT 1').fetchone()
+    settings = database._get_settings_row()
 
     if not settings or not settings['jellyseer_url'] or not settings['jellyseer_api_key']:
         return jsonify({'success': False, 'error': 'Jellyseerr not configured'}), 400
@@ -701,10 +700,8 @@ def jellyseer_trending():
     api_key = settings['jellyseer_api_key']
 
     try:
-        import requests
-
         # Fetch trending content from Jellyseerr
-        response = requests.get(
+        response = http_session.get(
             f'{jellyseer_url}/api/v1/discover/trending',
             headers={
                 'X-Api-Key': api_key,
@@ -754,7 +751,7 @@ def jellyseer_trending():
 def jellyseer_upcoming():
     """Fetch upcoming content from Jellyseerr"""
     db = database.get_db()
-    settings = db.execute('SELECT jellyseer_url, jellyseer_api_key FROM settings LIMIT 1').fetchone()
+    settings = database._get_settings_row()
 
     if not settings or not settings['jellyseer_url'] or not settings['jellyseer_api_key']:
         return jsonify({'success': False, 'error': 'Jellyseerr not configured'}), 400
@@ -763,10 +760,8 @@ def jellyseer_upcoming():
     api_key = settings['jellyseer_api_key']
 
     try:
-        import requests
-
         # Fetch upcoming movies from Jellyseerr
-        response = requests.get(
+        response = http_session.get(
             f'{jellyseer_url}/api/v1/discover/movies/upcoming',
             headers={
                 'X-Api-Key': api_key,
@@ -5,13 +5,15 @@ premieres, and movie sections, with per-section caching.
 """
 import time
 import datetime
+import logging
 from datetime import timezone
 
-from flask import render_template, redirect, url_for, session, flash
+from flask import render_template, redirect, url_for, session, flash, current_app
 from flask_login import login_required, current_user
 
 from ... import database
 from ...data_transforms import format_datetime_simple
+from ...utils import get_tautulli_data
 from . import main_bp
 from ._shared import (
     _get_cached_value, _get_media_image_url, _get_profile_stats,
@@ -47,7 +49,10 @@ def home():
 
     # Get user info
     step_started_at = time.perf_counter()
-    user = db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+    user = db.execute(
+        'SELECT id, username, plex_username, profile_photo_url, plex_joined_at, created_at FROM users WHERE id = ?',
+        (user_id,)
+    ).fetchone()
     mark_timing('load_user', step_started_at)
 
     # Convert user row to dict so we can add the plex_member_since field
@@ -57,8 +62,6 @@ def home():
 
     # Get currently playing/paused item from Tautulli (real-time data)
     # Single API call returns both the user's session and total stream count
-    from ...utils import get_tautulli_data
-
     current_plex_event = None
     s_username = user['plex_username'] if user['plex_username'] else user['username']
 
@@ -101,8 +104,15 @@ def home():
                 current_plex_event['item_type_for_url'] = 'movie'
                 current_plex_event['cached_poster_url'] = _get_media_image_url('poster', movie['tmdb_id'])
         elif current_plex_event['media_type'] == 'episode' and current_plex_event['show_title']:
-            show = db.execute('SELECT id, tmdb_id FROM sonarr_shows WHERE LOWER(title) = ?',
-                            (current_plex_event['show_title'].lower(),)).fetchone()
+            # Show and the playing episode's overview in one query
+            show = db.execute('''
+                SELECT s.tmdb_id, e.overview AS episode_overview
+                FROM sonarr_shows s
+                LEFT JOIN sonarr_episodes e
+                  ON e.show_id = s.id AND e.season_number = ? AND e.episode_number = ?
+                WHERE LOWER(s.title) = ?
+                LIMIT 1
+            ''', (parent_index, media_index, current_plex_event['show_title'].lower())).fetchone()
             if show:
                 current_plex_event['show_tmdb_id'] = show['tmdb_id']
                 current_plex_event['link_tmdb_id'] = show['tmdb_id']
@@ -115,13 +125,9 @@ def home():
                                                                    tmdb_id=show['tmdb_id'],
                                                                    season_number=parent_index,
                                                                    episode_number=media_index)
-                # Get episode overview from our database (more accurate than Tautulli's show summary)
-                episode = db.execute('''
-                    SELECT overview FROM sonarr_episodes
-                    WHERE show_id = ? AND season_number = ? AND episode_number = ?
-                ''', (show['id'], parent_index, media_index)).fetchone()
-                if episode and episode['overview']:
-                    current_plex_event['overview'] = episode['overview']
+                # Episode overview from our database (more accurate than Tautulli's show summary)
+                if show['episode_overview']:
+                    current_plex_event['overview'] = show['episode_overview']
 
     def load_stats():
         cached_stats = _get_profile_stats(db, user_id, now_playing_count=0, member_id=session.get('member_id'))
@@ -491,8 +497,9 @@ def home():
                                **stats)
     mark_timing('render_template', step_started_at)
 
-    total_ms = round((time.perf_counter() - route_started_at) * 1000, 2)
-    timing_summary = ', '.join(f'{label}={elapsed_ms}ms' for label, elapsed_ms in timings)
-    print(f"homepage_timing user_id={user_id} total={total_ms}ms {timing_summary}", flush=True)
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        total_ms = round((time.perf_counter() - route_started_at) * 1000, 2)
+        timing_summary = ', '.join(f'{label}={elapsed_ms}ms' for label, elapsed_ms in timings)
+        current_app.logger.debug("homepage_timing user_id=%s total=%sms %s", user_id, total_ms, timing_summary)
 
     return response
@@ -1,24 +1,27 @@
 import os
 import json
-import requests
 import re
 import sqlite3
 import time
 import threading
 import datetime
 from datetime import timezone
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import urllib.parse
 import logging
 import markdown as md
 
 from flask import (
     render_template, request, redirect, url_for, session, jsonify,
-    flash, current_app, Response, abort, g
+    flash, current_app, Response, abort, g, send_from_directory
 )
 from flask_login import login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from ... import database
+from ...image_cache import (
+    is_image_cached, service_image_request, submit_image_download, submit_thumbnail,
+)
 from . import main_bp
 from ._shared import (
     get_current_member, get_user_members, set_member_session,
@@ -27,6 +30,81 @@ from ._shared import (
     _calculate_show_completion, MEMBER_AVATAR_COLORS,
 )
 
+# How long a request waits on a cold-cache download before answering with a
+# placeholder; the download keeps going on the pool and the next load gets it.
+_IMAGE_DOWNLOAD_WAIT_SECONDS = 3
+_CACHED_IMAGE_MAX_AGE = 604800  # 1 week - cached images rarely change
+_PLACEHOLDER_MAX_AGE = 60  # Short, so the real image replaces it once cached
+_placeholder_images = {}  # image_type -> placeholder PNG bytes
+_IMAGE_SOURCE_SQL = """
+    SELECT url, source FROM (
+        SELECT {column} AS url, 'radarr' AS source, 0 AS priority FROM radarr_movies WHERE tmdb_id = ?
+        UNION ALL
+        SELECT {column} AS url, 'sonarr' AS source, 1 AS priority FROM sonarr_shows WHERE tmdb_id = ?
+    )
+    WHERE url IS NOT NULL AND url != ''
+    ORDER BY priority
+    LIMIT 1
+"""
+
+
+def _download_image(url, headers, dest_path, thumb_path=None):
+    """
+    Queues an image download and waits briefly for it to finish.
+
+    Concurrent requests for the same uncached image share one download: the
+    first caller submits it and later callers wait on the same future.
+    Returns True if the image is in the cache by the time the wait ends.
+    """
+    future = submit_image_download(url, headers, dest_path, thumb_path)
+    try:
+        return future.result(timeout=_IMAGE_DOWNLOAD_WAIT_SECONDS)
+    except FutureTimeoutError:
+        current_app.logger.info(f"Image download still in progress, serving placeholder: {url}")
+        return False
+
+
+def _send_cached_image(relative_path):
+    """
+    Serves a cached image from the static folder.
+
+    Behind nginx with IMAGE_ACCEL_REDIRECT_PREFIX set, the response only carries
+    an X-Accel-Redirect header and nginx sends the file itself, so the worker
+    doesn't spend its time copying image bytes.
+    """
+    accel_prefix = current_app.config.get('IMAGE_ACCEL_REDIRECT_PREFIX')
+    if accel_prefix:
+        return Response(
+            mimetype='image/jpeg',
+            headers={
+                'X-Accel-Redirect': f"{accel_prefix.rstrip('/')}/{relative_path}",
+                'Cache-Control': f'public, max-age={_CACHED_IMAGE_MAX_AGE}',
+            },
+        )
+    return send_from_directory(current_app.static_folder, relative_path, max_age=_CACHED_IMAGE_MAX_AGE)
+
+
+def _send_placeholder(image_type='poster'):
+    """
+    Serves the placeholder for ``image_type`` from memory.
+
+    The PNG is read on first use and kept in ``_placeholder_images``, so every
+    later miss or failed download is answered without touching the filesystem.
+    """
+    image_bytes = _placeholder_images.get(image_type)
+    if image_bytes is None:
+        placeholder_path = os.path.join(current_app.static_folder, 'logos', f'placeholder_{image_type}.png')
+        if not os.path.exists(placeholder_path):
+            placeholder_path = os.path.join(current_app.static_folder, 'logos', 'placeholder_poster.png')
+        with open(placeholder_path, 'rb') as f:
+            image_bytes = f.read()
+        _placeholder_images[image_type] = image_bytes
+    return Response(
+        image_bytes,
+        mimetype='image/png',
+        headers={'Cache-Control': f'public, max-age={_PLACEHOLDER_MAX_AGE}'},
+    )
+
 @main_bp.route('/image_proxy/<string:type>/<int:id>')
 @login_required
 def image_proxy(type, id):
@@ -38,12 +116,14 @@ def image_proxy(type, id):
     warnings and improves performance by reducing redundant external requests.
 
     - It first checks if the requested image already exists in the local cache.
-    - If found, it serves the cached file directly.
+    - If found, it serves the cached file directly with long-lived cache headers;
+      conditional requests are answered with 304 Not Modified.
     - If not found, it queries the database for the original image URL from
       Sonarr or Radarr based on the provided TMDB ID.
-    - It then fetches the image from the external URL, saves it to the appropriate
-      local cache directory (`/static/poster` or `/static/background`), and then
-      serves the image.
+    - It then queues the download on a background pool, saving to the
+      appropriate local cache directory (`/static/poster` or `/static/background`),
+      and serves the image if it arrives within a few seconds. Otherwise a
+      short-lived placeholder is served and the download finishes in the background.
 
     Args:
         type (str): The type of image to fetch ('poster' or 'background').
@@ -69,105 +149,59 @@ def image_proxy(type, id):
     # Sanitize ID to prevent directory traversal
     safe_filename = f"{str(id)}.jpg"
     cached_image_path = os.path.join(cache_folder, safe_filename)
+    static_path = f'{type}/{safe_filename}' if variant == 'full' else f'{type}/thumbs/{safe_filename}'
 
-    # Create directory if it doesn't exist
-    os.makedirs(cache_folder, exist_ok=True)
-
-    # 1. Check if the requested image variant is already cached
-    if os.path.exists(cached_image_path):
-        static_path = f'{type}/{safe_filename}' if variant == 'full' else f'{type}/thumbs/{safe_filename}'
-        return current_app.send_static_file(static_path)
+    # 1. Check if the requested image variant is already cached. This is the
+    # hot path, so it runs before any directory setup or database work.
+    if is_image_cached(cached_image_path):
+        return _send_cached_image(static_path)
 
     full_image_path = _get_cached_image_path(type, id, variant='full')
     if variant == 'thumb' and os.path.exists(full_image_path):
+        # Browsers ask for the same missing thumbnail from several pages at
+        # once; they share one resize instead of each running their own.
         try:
-            from PIL import Image
-
-            with Image.open(full_image_path) as img:
-                img = img.convert('RGB')
-                img.thumbnail(_POSTER_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-                img.save(cached_image_path, format='JPEG', quality=_POSTER_THUMBNAIL_QUALITY, optimize=True)
-            return current_app.send_static_file(f'{type}/thumbs/{safe_filename}')
-        except Exception as e:
-            current_app.logger.warning(f"Failed to generate cached thumbnail for {type}/{id}: {e}")
+            if submit_thumbnail(full_image_path, cached_image_path).result(timeout=_IMAGE_DOWNLOAD_WAIT_SECONDS):
+                return _send_cached_image(static_path)
+        except FutureTimeoutError:
+            # Still queued behind downloads; the full poster is already here
+            return _send_cached_image(f'{type}/{safe_filename}')
 
     # 2. If not cached, find the image URL from the database
     db = database.get_db()
     external_url = None
     source = None # To determine which service's URL to use for relative paths
 
-    # Check Radarr (movies) first
-    movie_record = db.execute(f"SELECT {'poster_url' if type == 'poster' else 'fanart_url'} as url FROM radarr_movies WHERE tmdb_id = ?", (id,)).fetchone()
-    if movie_record and movie_record['url']:
-        external_url = movie_record['url']
-        source = 'radarr'
-    else:
-        # Check Sonarr (shows)
-        show_record = db.execute(f"SELECT {'poster_url' if type == 'poster' else 'fanart_url'} as url FROM sonarr_shows WHERE tmdb_id = ?", (id,)).fetchone()
-        if show_record and show_record['url']:
-            external_url = show_record['url']
-            source = 'sonarr'
+    # Check Radarr (movies) and Sonarr (shows) in one query, preferring Radarr
+    image_record = db.execute(
+        _IMAGE_SOURCE_SQL.format(column='poster_url' if type == 'poster' else 'fanart_url'),
+        (id, id)
+    ).fetchone()
+    if image_record:
+        external_url = image_record['url']
+        source = image_record['source']
 
     if not external_url:
         # Return a placeholder if no URL is found in the database
-        placeholder_path = f'logos/placeholder_{type}.png' if os.path.exists(os.path.join(current_app.static_folder, f'logos/placeholder_{type}.png')) else 'logos/placeholder_poster.png'
-        return current_app.send_static_file(placeholder_path)
+        return _send_placeholder(type)
 
+    # 3. Fetch the image from the external URL, resolving relative
+    # Sonarr/Radarr paths and adding the service API key
+    external_url, headers = service_image_request(external_url, source)
+    if not external_url:
+        current_app.logger.error(f"{source} URL not configured, cannot resolve relative image path for {type}/{id}.")
+        return _send_placeholder(type)
 
-    # 3. Fetch the image from the external URL
-    try:
-        # Handle relative URLs from Sonarr/Radarr
-        if external_url.startswith('/'):
-            service_url = database.get_setting(f'{source}_url')
-            if service_url:
-                external_url = f"{service_url.rstrip('/')}{external_url}"
-            else:
-                raise ValueError(f"{source} URL not configured, cannot resolve relative image path.")
-
-        # Use a session for potential keep-alive and other benefits
-        with requests.Session() as s:
-            # Add API key if the source requires it for media assets
-            api_key = database.get_setting(f'{source}_api_key')
-            if api_key:
-                s.headers.update({'X-Api-Key': api_key})
-            
-            resp = s.get(external_url, stream=True, timeout=10)
-            resp.raise_for_status() # Raise an exception for bad status codes
-
-        # 4. Save the full image to the cache
-        target_full_path = full_image_path if type == 'poster' else cached_image_path
-        with open(target_full_path, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        if type == 'poster':
-            try:
-                from PIL import Image
-
-                thumb_dir = os.path.dirname(_get_cached_image_path(type, id, variant='thumb'))
-                os.makedirs(thumb_dir, exist_ok=True)
-                thumb_path = _get_cached_image_path(type, id, variant='thumb')
-                with Image.open(target_full_path) as img:
-                    img = img.convert('RGB')
-                    img.thumbnail(_POSTER_THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-                    img.save(thumb_path, format='JPEG', quality=_POSTER_THUMBNAIL_QUALITY, optimize=True)
-            except Exception as e:
-                current_app.logger.warning(f"Failed to generate thumbnail for poster/{id}: {e}")
-
-        current_app.logger.info(f"Cached image: {target_full_path}")
-
-        # 5. Serve the newly cached image variant
-        if variant == 'thumb' and type == 'poster':
-            thumb_path = _get_cached_image_path(type, id, variant='thumb')
-            if os.path.exists(thumb_path):
-                return current_app.send_static_file(f'{type}/thumbs/{safe_filename}')
-        return current_app.send_static_file(f'{type}/{safe_filename}')
-
-    except (requests.RequestException, ValueError, IOError) as e:
-        current_app.logger.error(f"Failed to fetch or cache image for {type}/{id} from {external_url}. Error: {e}")
-        # If fetching fails, serve the placeholder
-        placeholder_path = f'logos/placeholder_{type}.png' if os.path.exists(os.path.join(current_app.static_folder, f'logos/placeholder_{type}.png')) else 'logos/placeholder_poster.png'
-        return current_app.send_static_file(placeholder_path)
+    # 4. Save the full image (and poster thumbnail) to the cache
+    target_full_path = full_image_path if type == 'poster' else cached_image_path
+    thumb_path = _get_cached_image_path(type, id, variant='thumb') if type == 'poster' else None
+    if not _download_image(external_url, headers, target_full_path, thumb_path):
+        return _send_placeholder(type)
+
+    # 5. Serve the newly cached image variant
+    if variant == 'thumb' and type == 'poster' and os.path.exists(thumb_path):
+        return _send_cached_image(f'{type}/thumbs/{safe_filename}')
+    return _send_cached_image(f'{type}/{safe_filename}')
 
 @main_bp.route('/image_proxy/cast/<int:person_id>')
 @login_required
@@ -176,10 +210,9 @@ def cast_image_proxy(person_id):
     cache_folder = os.path.join(current_app.static_folder, 'cast')
     safe_filename = f"{str(person_id)}.jpg"
     cached_image_path = os.path.join(cache_folder, safe_filename)
-    os.makedirs(cache_folder, exist_ok=True)
 
-    if os.path.exists(cached_image_path):
-        return current_app.send_static_file(f'cast/{safe_filename}')
+    if is_image_cached(cached_image_path):
+        return _send_cached_image(f'cast/{safe_filename}')
 
     db = database.get_db()
     cast_record = db.execute("""
@@ -188,17 +221,8 @@ def cast_image_proxy(person_id):
     """, (person_id,)).fetchone()
 
     if not cast_record or not cast_record['person_image_url']:
-        return current_app.send_static_file('logos/placeholder_poster.png')
-
-    try:
-        with requests.Session() as s:
-            resp = s.get(cast_record['person_image_url'], stream=True, timeout=10)
-            resp.raise_for_status()
-        with open(cached_image_path, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return current_app.send_static_file(f'cast/{safe_filename}')
-    except Exception as e:
-        current_app.logger.error(f"Failed to fetch cast photo {person_id}: {e}")
-        return current_app.send_static_file('logos/placeholder_poster.png')
+        return _send_placeholder()
 
+    if not _download_image(cast_record['person_image_url'], {}, cached_image_path):
+        return _send_placeholder()
+    return _send_cached_image(f'cast/{safe_filename}')
@@ -799,18 +799,20 @@ def api_mark_season_watched(show_id, season_number):
         if not episodes:
             return jsonify({'success': False, 'error': 'No episodes found'}), 404
 
-        # Mark each episode
-        for episode in episodes:
-            db.execute('''
-                INSERT INTO user_episode_progress
-                (user_id, episode_id, season_number, episode_number, is_watched, marked_manually, last_watched_at)
-                VALUES (?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
-                ON CONFLICT (user_id, episode_id) DO UPDATE SET
-                    is_watched = excluded.is_watched,
-                    marked_manually = 1,
-                    last_watched_at = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-            ''', (user_id, episode['id'], episode['season_number'], episode['episode_number'], is_watched))
+        # Mark every episode with one prepared statement
+        db.executemany('''
+            INSERT INTO user_episode_progress
+            (user_id, episode_id, season_number, episode_number, is_watched, marked_manually, last_watched_at)
+            VALUES (?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (user_id, episode_id) DO UPDATE SET
+                is_watched = excluded.is_watched,
+                marked_manually = 1,
+                last_watched_at = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+        ''', [
+            (user_id, episode['id'], episode['season_number'], episode['episode_number'], is_watched)
+            for episode in episodes
+        ])
 
         db.commit()
 
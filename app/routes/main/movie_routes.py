@@ -1,9 +1,10 @@
-from flask import render_template, url_for, abort
+from flask import render_template, abort
 from flask_login import login_required
 
 from ... import database
+from ...image_cache import prefetch_detail_images
 from . import main_bp
-from ._shared import _build_admin_service_links
+from ._shared import _build_admin_service_links, _get_media_image_url
 
 
 @main_bp.route('/movie/<int:tmdb_id>')
@@ -28,11 +29,8 @@ def movie_detail(tmdb_id):
     if not movie:
         abort(404)
     movie_dict = dict(movie)
-    if movie_dict.get('tmdb_id'):
-        movie_dict['cached_poster_url'] = url_for('main.image_proxy', type='poster', id=movie_dict['tmdb_id'])
-        movie_dict['cached_fanart_url'] = url_for('main.image_proxy', type='background', id=movie_dict['tmdb_id'])
-    else:
-        movie_dict['cached_poster_url'] = url_for('static', filename='logos/placeholder_poster.png')
-        movie_dict['cached_fanart_url'] = url_for('static', filename='logos/placeholder_background.png')
+    prefetch_detail_images(movie_dict.get('tmdb_id'), movie_dict.get('poster_url'), movie_dict.get('fanart_url'), 'radarr')
+    movie_dict['cached_poster_url'] = _get_media_image_url('poster', movie_dict.get('tmdb_id'))
+    movie_dict['cached_fanart_url'] = _get_media_image_url('background', movie_dict.get('tmdb_id'))
     admin_service_links = _build_admin_service_links(db, 'movie', movie_dict)
     return render_template('movie_detail.html', movie=movie_dict, admin_service_links=admin_service_links)
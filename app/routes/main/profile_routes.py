@@ -1,7 +1,6 @@
 import os
 import json
 import requests
-import re
 import sqlite3
 import time
 import threading
@@ -24,7 +23,7 @@ from ._shared import (
     get_current_member, get_user_members, set_member_session,
     _get_cached_value, _get_cached_image_path, _get_media_image_url,
     is_onboarding_complete, _get_profile_stats, _get_plex_event_details,
-    _calculate_show_completion, MEMBER_AVATAR_COLORS,
+    _calculate_show_completion, MEMBER_AVATAR_COLORS, SEASON_EPISODE_RE,
 )
 
 @main_bp.route('/profile/history')
@@ -129,7 +128,7 @@ def watch_history():
 
                 # Try to find episode detail link
                 if item_dict.get('season_episode'):
-                    match = re.match(r'S(\d+)E(\d+)', item_dict['season_episode'])
+                    match = SEASON_EPISODE_RE.match(item_dict['season_episode'])
                     if match:
                         season_num = int(match.group(1))
                         episode_num = int(match.group(2))
@@ -397,7 +396,7 @@ def profile():
                 item_dict['cached_poster_url'] = url_for('main.image_proxy', type='poster', id=show['tmdb_id'])
                 item_dict['detail_url'] = url_for('main.show_detail', tmdb_id=show['tmdb_id'])
                 if item_dict.get('season_episode'):
-                    match = re.match(r'S(\d+)E(\d+)', item_dict['season_episode'])
+                    match = SEASON_EPISODE_RE.match(item_dict['season_episode'])
                     if match:
                         season_num = int(match.group(1))
                         episode_num = int(match.group(2))
@@ -856,7 +855,7 @@ def resolve_notification_issue(notification_id):
         season_num = None
         episode_num = None
         if ' - S' in report['title']:
-            match = re.search(r'S(\d+)E(\d+)', report['title'])
+            match = SEASON_EPISODE_RE.search(report['title'])
             if match:
                 season_num = int(match.group(1))
                 episode_num = int(match.group(2))
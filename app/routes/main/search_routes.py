@@ -1,3 +1,6 @@
+import re
+import sqlite3
+
 from flask import (
     render_template, request, redirect, url_for, session, jsonify,
     flash, current_app
@@ -5,7 +8,69 @@ from flask import (
 from flask_login import login_required
 
 from ... import database
+from ...image_cache import prefetch_media_image
 from . import main_bp
+from ._shared import _get_media_image_url
+
+_SEARCH_TOKEN_RE = re.compile(r'\w+')
+_SEARCH_MIN_QUERY_LENGTH = 2
+_SEARCH_RESULT_LIMIT = 50
+_SEARCH_FTS_SQL = """
+    SELECT s.title AS title, 'show' as type, s.tmdb_id, s.year, s.poster_url, s.fanart_url
+    FROM sonarr_shows_fts f
+    JOIN sonarr_shows s ON s.id = f.rowid
+    WHERE sonarr_shows_fts MATCH ?
+    UNION ALL
+    SELECT m.title AS title, 'movie' as type, m.tmdb_id, m.year, m.poster_url, m.fanart_url
+    FROM radarr_movies_fts f
+    JOIN radarr_movies m ON m.id = f.rowid
+    WHERE radarr_movies_fts MATCH ?
+    ORDER BY title
+    LIMIT ?
+"""
+_SEARCH_LIKE_SQL = """
+    SELECT title, 'show' as type, tmdb_id, year, poster_url, fanart_url
+    FROM sonarr_shows WHERE title LIKE ?
+    UNION ALL
+    SELECT title, 'movie' as type, tmdb_id, year, poster_url, fanart_url
+    FROM radarr_movies WHERE title LIKE ?
+    ORDER BY title
+    LIMIT ?
+"""
+
+
+def _fts_match_expression(query):
+    """
+    Builds an FTS5 MATCH expression requiring every word of `query` as a
+    prefix, or returns None if the query has no words.
+    """
+    tokens = _SEARCH_TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _search_library(db, query):
+    """
+    Returns shows and movies whose title matches every word of `query`.
+
+    Both libraries are searched in one UNION ALL statement, sorted by title.
+    Uses the FTS5 title indexes with a prefix match on each word, so results
+    keep up with search-as-you-type. Falls back to a title prefix LIKE, served
+    by the COLLATE NOCASE title indexes, if the FTS tables are missing (SQLite
+    without FTS5, or the migration has not been run yet).
+    """
+    match_expr = _fts_match_expression(query)
+    if match_expr:
+        try:
+            return db.execute(
+                _SEARCH_FTS_SQL, (match_expr, match_expr, _SEARCH_RESULT_LIMIT)
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            current_app.logger.debug(f"FTS search unavailable, using LIKE: {e}")
+    return db.execute(
+        _SEARCH_LIKE_SQL, (query + '%', query + '%', _SEARCH_RESULT_LIMIT)
+    ).fetchall()
 
 
 @main_bp.route('/search')
@@ -16,7 +81,8 @@ def search():
 
     This API endpoint is called by the JavaScript search functionality. It takes
     a query parameter 'q' and searches the `sonarr_shows` and `radarr_movies`
-    tables for matching titles.
+    tables for matching titles. Queries shorter than two characters return no
+    results.
 
     Args:
         q (str): The search term, provided as a URL query parameter.
@@ -25,16 +91,14 @@ def search():
         flask.Response: A JSON response containing a list of search results,
                         including title, type, year, and a URL to the detail page.
     """
-    query = request.args.get('q', '').lower()
-    if not query:
-        return jsonify({'results': [], 'jellyseer_url': None, 'query': ''})
+    query = request.args.get('q', '').strip().lower()
+    if len(query) < _SEARCH_MIN_QUERY_LENGTH:
+        return jsonify({'results': [], 'jellyseer_url': None, 'query': request.args.get('q', '')})
 
     db = database.get_db()
 
     # Prefer remote/public Jellyseerr URL for browser links, fallback to local URL.
-    settings = db.execute(
-        'SELECT jellyseer_remote_url, jellyseer_url FROM settings LIMIT 1'
-    ).fetchone()
+    settings = database._get_settings_row()
     jellyseer_url = None
     if settings:
         jellyseer_url = (
@@ -43,31 +107,23 @@ def search():
             or None
         )
 
-    # Search Sonarr
-    sonarr_results = db.execute(
-        "SELECT title, 'show' as type, tmdb_id, year, poster_url, fanart_url FROM sonarr_shows WHERE title LIKE ?", ('%' + query + '%',)
-    ).fetchall()
-
-    # Search Radarr
-    radarr_results = db.execute(
-        "SELECT title, 'movie' as type, tmdb_id, year, poster_url, fanart_url FROM radarr_movies WHERE title LIKE ?", ('%' + query + '%',)
-    ).fetchall()
-
     results = []
-    for row in sonarr_results + radarr_results:
+    for row in _search_library(db, query):
         item = dict(row)
         if item.get('tmdb_id'):
-            item['poster_url'] = url_for('main.image_proxy', type='poster', id=item['tmdb_id'])
-            item['fanart_url'] = url_for('main.image_proxy', type='background', id=item['tmdb_id'])
-        else:
-            # Set to placeholder or None if no tmdb_id, so templates don't break
-            item['poster_url'] = url_for('static', filename='logos/placeholder_poster.png')
-            item['fanart_url'] = url_for('static', filename='logos/placeholder_background.png')
+            # Start uncached poster downloads now, side by side on the image
+            # pool, so the dropdown's image_proxy requests find them running
+            prefetch_media_image(
+                'poster', item['tmdb_id'], item.get('poster_url'),
+                'sonarr' if item['type'] == 'show' else 'radarr',
+            )
+        # Cached images link straight to the static file; the rest go through
+        # image_proxy, and items without a TMDB id get the placeholders.
+        # The dropdown shows a small poster, so it asks for the thumbnail.
+        item['poster_url'] = _get_media_image_url('poster', item.get('tmdb_id'), variant='thumb')
+        item['fanart_url'] = _get_media_image_url('background', item.get('tmdb_id'))
         results.append(item)
 
-    # Sort results by title
-    results.sort(key=lambda x: x['title'])
-
     return jsonify({
         'results': results,
         'jellyseer_url': jellyseer_url,
@@ -144,7 +200,7 @@ def help():
 def discover():
     """Display upcoming, popular, and recommended content"""
     db = database.get_db()
-    settings = db.execute('SELECT jellyseer_url FROM settings LIMIT 1').fetchone()
+    settings = database._get_settings_row()
     jellyseer_url = settings['jellyseer_url'] if settings and settings['jellyseer_url'] else None
 
     # Popular shows — ranked by unique member count, then play count
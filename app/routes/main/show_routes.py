@@ -4,9 +4,11 @@ Show, episode, and character detail routes plus LLM summary API endpoints.
 Split out of media_routes.py as part of the main blueprint refactor.
 """
 import json
-import re
+import secrets
 import sqlite3
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import timezone
 
 from flask import (
@@ -16,13 +18,47 @@ from flask import (
 from flask_login import login_required
 
 from ... import database
+from ...image_cache import prefetch_detail_images
 from . import main_bp
 from ._shared import (
     _get_tautulli_rating_key_for_media,
     _build_admin_service_links,
     _calculate_year_display,
+    _extract_guid_ids,
+    _get_media_image_url,
+    SEASON_EPISODE_RE,
 )
 
+# LLM summaries can take tens of seconds, so generation runs here rather than
+# in the request; the page polls /api/summary-task/<task_id> for the outcome.
+# Task state lives in the summary_tasks table so any worker can answer a poll.
+_summary_task_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='summary-task')
+# A task still 'running' after this long belongs to a worker that exited mid-job.
+_SUMMARY_TASK_STALE_AGE = '-15 minutes'
+_SUMMARY_TASK_RETENTION = '-1 day'
+
+
+@lru_cache(maxsize=128)
+def _plex_event_guid_ids(event_id):
+    """
+    Returns ``(tmdb_id, tvdb_id)`` from the Plex webhook payload logged as
+    plex_activity_log row ``event_id``.
+
+    Activity log rows are never rewritten, so the result is memoized on the
+    row id alone; the payload is only read and parsed on a cache miss.
+    """
+    row = database.get_db().execute(
+        'SELECT raw_payload FROM plex_activity_log WHERE id = ?', (event_id,)
+    ).fetchone()
+    if not row or not row['raw_payload']:
+        return None, None
+    try:
+        payload = json.loads(row['raw_payload'])
+        return _extract_guid_ids(payload.get('Metadata', {}).get('Guid', []))
+    except Exception:
+        return None, None
+
+
 @main_bp.route('/show/<int:tmdb_id>')
 @login_required
 def show_detail(tmdb_id):
@@ -101,12 +137,9 @@ def show_detail(tmdb_id):
     """, (show_dict['id'],)).fetchall()
     crew_members = [dict(row) for row in crew_rows] if crew_rows else []
 
-    if show_dict.get('tmdb_id'):
-        show_dict['cached_poster_url'] = url_for('main.image_proxy', type='poster', id=show_dict['tmdb_id'])
-        show_dict['cached_fanart_url'] = url_for('main.image_proxy', type='background', id=show_dict['tmdb_id'])
-    else:
-        show_dict['cached_poster_url'] = url_for('static', filename='logos/placeholder_poster.png')
-        show_dict['cached_fanart_url'] = url_for('static', filename='logos/placeholder_background.png')
+    prefetch_detail_images(show_dict.get('tmdb_id'), show_dict.get('poster_url'), show_dict.get('fanart_url'), 'sonarr')
+    show_dict['cached_poster_url'] = _get_media_image_url('poster', show_dict.get('tmdb_id'))
+    show_dict['cached_fanart_url'] = _get_media_image_url('background', show_dict.get('tmdb_id'))
     show_db_id = show_dict['id']
 
     # Fetch seasons and episodes in batch to avoid N+1 queries
@@ -241,7 +274,7 @@ def show_detail(tmdb_id):
     )
 
     # Get Jellyseer URL for request button — prefer public/remote URL for browser links
-    settings = db.execute('SELECT jellyseer_url, jellyseer_remote_url FROM settings LIMIT 1').fetchone()
+    settings = database._get_settings_row()
     jellyseer_url = None
     if settings:
         jellyseer_url = settings['jellyseer_remote_url'] or settings['jellyseer_url'] or None
@@ -263,7 +296,7 @@ def show_detail(tmdb_id):
     # Cutoff disclaimer: read from settings, pass to template if disclaimer is enabled
     cutoff_disclaimer = None
     try:
-        settings_row = db.execute('SELECT summary_show_disclaimer, llm_knowledge_cutoff_date FROM settings LIMIT 1').fetchone()
+        settings_row = database._get_settings_row()
         if settings_row and settings_row['summary_show_disclaimer'] not in ('0', 0, None) and settings_row['llm_knowledge_cutoff_date']:
             import datetime as _dt
             cutoff_date = _dt.datetime.strptime(settings_row['llm_knowledge_cutoff_date'], '%Y-%m-%d').date()
@@ -302,7 +335,7 @@ def get_next_up_episode(currently_watched, last_watched, show_info, seasons_with
         is_currently_watching = True
     elif last_watched:
         last_season_episode_str = last_watched.get('season_episode')
-        match = re.match(r'S(\d+)E(\d+)', last_season_episode_str) if last_season_episode_str else None
+        match = SEASON_EPISODE_RE.match(last_season_episode_str) if last_season_episode_str else None
         if match:
             last_season_num = int(match.group(1))
             last_episode_num = int(match.group(2))
@@ -352,7 +385,7 @@ def get_next_up_episode(currently_watched, last_watched, show_info, seasons_with
         return None
 
     season_episode_str = source_info.get('season_episode')
-    match = re.match(r'S(\d+)E(\d+)', season_episode_str) if season_episode_str else None
+    match = SEASON_EPISODE_RE.match(season_episode_str) if season_episode_str else None
     if not match:
         return None
     season_number, episode_number = map(int, match.groups())
@@ -412,12 +445,9 @@ def episode_detail(tmdb_id, season_number, episode_number):
         abort(404)
     show_dict = dict(show_row)
     # Use consistent names for cached URLs as expected by the new template.
-    if show_dict.get('tmdb_id'):
-        show_dict['cached_poster_url'] = url_for('main.image_proxy', type='poster', id=show_dict['tmdb_id'])
-        show_dict['cached_fanart_url'] = url_for('main.image_proxy', type='background', id=show_dict['tmdb_id']) # Optional for episode page bg
-    else:
-        show_dict['cached_poster_url'] = url_for('static', filename='logos/placeholder_poster.png')
-        show_dict['cached_fanart_url'] = url_for('static', filename='logos/placeholder_background.png')
+    prefetch_detail_images(show_dict.get('tmdb_id'), show_dict.get('poster_url'), show_dict.get('fanart_url'), 'sonarr')
+    show_dict['cached_poster_url'] = _get_media_image_url('poster', show_dict.get('tmdb_id'))
+    show_dict['cached_fanart_url'] = _get_media_image_url('background', show_dict.get('tmdb_id'))
 
     show_id = show_dict['id']
     show_tvdb_id = show_dict.get('tvdb_id')
@@ -476,30 +506,13 @@ def episode_detail(tmdb_id, season_number, episode_number):
         # We'll match by show title and season/episode string (season_episode)
         season_episode_str = f"S{str(season_number).zfill(2)}E{str(episode_number).zfill(2)}"
         plex_row = db.execute(
-            'SELECT raw_payload FROM plex_activity_log WHERE show_title = ? AND season_episode = ? ORDER BY event_timestamp DESC LIMIT 1',
+            'SELECT id FROM plex_activity_log WHERE show_title = ? AND season_episode = ? ORDER BY event_timestamp DESC LIMIT 1',
             (show_title, season_episode_str)
         ).fetchone()
         plex_tmdb_id = None
         plex_tvdb_id = None
         if plex_row:
-            import json
-            try:
-                payload = json.loads(plex_row['raw_payload'])
-                guids = payload.get('Metadata', {}).get('Guid', [])
-                for guid_item in guids:
-                    guid_str = guid_item.get('id', '')
-                    if guid_str.startswith('tmdb://'):
-                        try:
-                            plex_tmdb_id = int(guid_str.split('//')[1])
-                        except Exception:
-                            plex_tmdb_id = None
-                    if guid_str.startswith('tvdb://'):
-                        try:
-                            plex_tvdb_id = int(guid_str.split('//')[1])
-                        except Exception:
-                            plex_tvdb_id = None
-            except Exception:
-                pass
+            plex_tmdb_id, plex_tvdb_id = _plex_event_guid_ids(plex_row['id'])
         # 3a. Plex TVDB ID
         if plex_tvdb_id:
             episode_characters = db.execute(
@@ -654,61 +667,100 @@ def summary_feedback():
     return jsonify({'success': True})
 
 
+def _run_summary_task(app_instance, task_id, generate, *args):
+    """Runs a summary generator on ``_summary_task_pool`` and records the outcome."""
+    with app_instance.app_context():
+        try:
+            success, error = generate(*args)
+        except Exception as e:
+            current_app.logger.error(f"Error generating summary {args}: {e}", exc_info=True)
+            success, error = False, str(e)
+
+        db = database.get_db()
+        db.execute(
+            'UPDATE summary_tasks SET status = ?, error_message = ?, updated_at = CURRENT_TIMESTAMP WHERE task_id = ?',
+            ('completed' if success else 'failed', None if success else (error or 'Unknown error'), task_id)
+        )
+        db.commit()
+
+
+def _submit_summary_task(tmdb_id, season_number, generate, *args):
+    """
+    Queues ``generate(*args)`` and returns its task id.
+
+    A second click for the same show/season while a job is running gets the
+    running job's id instead of starting another LLM call.
+    """
+    db = database.get_db()
+    running = db.execute('''
+        SELECT task_id FROM summary_tasks
+        WHERE tmdb_id = ? AND season_number IS ? AND status = 'running'
+          AND created_at >= datetime('now', ?)
+    ''', (tmdb_id, season_number, _SUMMARY_TASK_STALE_AGE)).fetchone()
+    if running:
+        return running['task_id']
+
+    task_id = secrets.token_hex(8)
+    db.execute("DELETE FROM summary_tasks WHERE created_at < datetime('now', ?)", (_SUMMARY_TASK_RETENTION,))
+    db.execute(
+        'INSERT INTO summary_tasks (task_id, tmdb_id, season_number) VALUES (?, ?, ?)',
+        (task_id, tmdb_id, season_number)
+    )
+    db.commit()
+    _summary_task_pool.submit(_run_summary_task, current_app._get_current_object(), task_id, generate, *args)
+    return task_id
+
+
 @main_bp.route('/api/generate-show-summary', methods=['POST'])
 @login_required
 def generate_show_summary_route():
-    """Generate or regenerate a show summary for the current user."""
+    """Start generating a show summary; poll /api/summary-task/<task_id> for the result."""
     from app.summary_services import generate_show_summary
-    
+
     data = request.get_json()
     tmdb_id = data.get('tmdb_id')
-    
+
     if not tmdb_id:
         return jsonify({"error": "tmdb_id required"}), 400
-    
-    try:
-        success, error = generate_show_summary(int(tmdb_id))
-    except Exception as e:
-        current_app.logger.error(f"Error generating show summary for tmdb_id={tmdb_id}: {e}", exc_info=True)
-        return jsonify({
-            "status": "failed",
-            "error": str(e)
-        }), 500
-    
-    if success:
-        return jsonify({
-            "status": "completed",
-            "message": f"Show summary generated successfully"
-        })
-    else:
-        return jsonify({
-            "status": "failed",
-            "error": error or "Unknown error"
-        }), 500
+
+    task_id = _submit_summary_task(int(tmdb_id), None, generate_show_summary, int(tmdb_id))
+    return jsonify({"status": "started", "task_id": task_id}), 202
 
 
 @main_bp.route('/api/generate-season-summary', methods=['POST'])
 @login_required
 def generate_season_summary_route():
-    """Generate or regenerate a season summary for the current user."""
+    """Start generating a season summary; poll /api/summary-task/<task_id> for the result."""
     from app.summary_services import generate_season_summary
-    
+
     data = request.get_json()
     tmdb_id = data.get('tmdb_id')
     season_number = data.get('season_number')
-    
+
     if not tmdb_id or season_number is None:
         return jsonify({"error": "tmdb_id and season_number required"}), 400
-    
-    success, error = generate_season_summary(int(tmdb_id), int(season_number))
-    
-    if success:
-        return jsonify({
-            "status": "completed",
-            "message": f"Season {season_number} summary generated successfully"
-        })
-    else:
-        return jsonify({
-            "status": "failed",
-            "error": error or "Unknown error"
-        }), 500
+
+    task_id = _submit_summary_task(
+        int(tmdb_id), int(season_number), generate_season_summary, int(tmdb_id), int(season_number)
+    )
+    return jsonify({"status": "started", "task_id": task_id}), 202
+
+
+@main_bp.route('/api/summary-task/<task_id>')
+@login_required
+def summary_task_status(task_id):
+    """Report the outcome of a summary generation started above."""
+    task = database.get_db().execute(
+        "SELECT status, error_message, created_at >= datetime('now', ?) AS fresh FROM summary_tasks WHERE task_id = ?",
+        (_SUMMARY_TASK_STALE_AGE, task_id)
+    ).fetchone()
+
+    if task is None:
+        return jsonify({"status": "failed", "error": "Unknown or expired task"}), 404
+    if task['status'] == 'running':
+        if task['fresh']:
+            return jsonify({"status": "running"})
+        return jsonify({"status": "failed", "error": "Summary generation did not finish"}), 500
+    if task['status'] == 'completed':
+        return jsonify({"status": "completed", "message": "Summary generated successfully"})
+    return jsonify({"status": "failed", "error": task['error_message'] or "Unknown error"}), 500
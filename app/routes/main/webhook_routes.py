@@ -5,6 +5,7 @@ import re
 import sqlite3
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 from datetime import timezone
 import urllib.parse
@@ -19,149 +20,136 @@ from flask_login import login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from ... import database
+from ...system_logger import syslog, SystemLogger
+from ...tvmaze_enrichment import tvmaze_enrichment_service
+from ...utils import update_sonarr_episode, sync_sonarr_library, sync_radarr_library
 from . import main_bp
 from ._shared import (
     get_current_member, get_user_members, set_member_session,
     _get_cached_value, _get_cached_image_path, _get_media_image_url,
     is_onboarding_complete, _get_profile_stats, _get_plex_event_details,
-    _calculate_show_completion, MEMBER_AVATAR_COLORS,
+    _calculate_show_completion, _extract_guid_ids, MEMBER_AVATAR_COLORS,
 )
 
-@main_bp.route('/plex/webhook', methods=['POST'])
-def plex_webhook():
+# Kept as a single module-level string so sqlite3's per-connection statement
+# cache reuses the prepared statement across webhook calls.
+# Logs a Plex event unless the same session_key/event_type/rating_key was
+# logged since the given unix time (Plex sometimes sends webhooks twice). The
+# check and the insert are one statement, so duplicates delivered at the same
+# moment to different workers can't both be logged.
+_PLEX_ACTIVITY_INSERT_SQL = """
+    INSERT INTO plex_activity_log (
+        event_type, plex_username, player_title, player_uuid, session_key,
+        rating_key, parent_rating_key, grandparent_rating_key, media_type,
+        title, show_title, season_episode, view_offset_ms, duration_ms, tmdb_id, raw_payload
+    )
+    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM plex_activity_log
+        WHERE session_key = ?
+          AND event_type = ?
+          AND rating_key = ?
+          AND event_timestamp >= datetime(?, 'unixepoch')
+    )
+"""
+
+
+# Webhook-triggered full library syncs, per service: 'running', or 'rerun'
+# when more events arrived while it ran. A burst of Sonarr/Radarr events then
+# fetches the full /series or /movie listing twice at most, not once per event.
+_webhook_syncs = {}
+_webhook_syncs_lock = threading.Lock()
+
+# One worker, so follow-up updates for a user's events apply in arrival order
+_plex_followup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='plex-webhook')
+
+_SHOW_TMDB_ID_MEMO_MAX = 512
+_show_tmdb_id_memo = {}  # ('tvdb', id) / ('title', lowered title) -> show tmdb_id
+_show_tmdb_id_memo_lock = threading.Lock()
+
+
+def _lookup_show_tmdb_id(db, key, sql, param):
     """
-    Handles incoming webhook events from a Plex Media Server.
+    Resolves a show's TMDB id, remembering hits in ``_show_tmdb_id_memo``.
 
-    This endpoint is designed to receive POST requests from Plex. It parses the
-    webhook payload for media events (play, pause, stop, scrobble) and logs the
-    relevant details into the `plex_activity_log` table. This log is the primary
-    source of data for the user-facing homepage.
-
-    It validates the webhook secret if one is configured in the settings to ensure
-    the request is coming from the configured Plex server.
-
-    Returns:
-        A JSON response indicating success or an error, along with an appropriate
-        HTTP status code.
+    Plex sends several events per episode played (play, pause, resume, stop,
+    scrobble), all for the same show, so repeats skip the query. Misses are not
+    remembered, so a show added by a later Sonarr sync is picked up right away.
     """
-    try:
-        if request.is_json:
-            payload = request.get_json()
-        else:
-            payload = json.loads(request.form.get('payload'))
-        
-        current_app.logger.info(f"Webhook payload: {json.dumps(payload, indent=2)}")
-        
-        global last_plex_event
-        last_plex_event = payload
+    with _show_tmdb_id_memo_lock:
+        tmdb_id = _show_tmdb_id_memo.get(key)
+    if tmdb_id is not None:
+        return tmdb_id
+    row = db.execute(sql, (param,)).fetchone()
+    tmdb_id = row['tmdb_id'] if row else None
+    if tmdb_id is not None:
+        with _show_tmdb_id_memo_lock:
+            if len(_show_tmdb_id_memo) >= _SHOW_TMDB_ID_MEMO_MAX:
+                _show_tmdb_id_memo.clear()
+            _show_tmdb_id_memo[key] = tmdb_id
+    return tmdb_id
+
+
+def _show_tmdb_id_by_tvdb(db, tvdb_id):
+    return _lookup_show_tmdb_id(
+        db, ('tvdb', tvdb_id), 'SELECT tmdb_id FROM sonarr_shows WHERE tvdb_id = ?', tvdb_id
+    )
+
+
+def _show_tmdb_id_by_title(db, show_title):
+    return _lookup_show_tmdb_id(
+        db, ('title', show_title.lower()),
+        'SELECT tmdb_id FROM sonarr_shows WHERE LOWER(title) = LOWER(?)', show_title
+    )
+
+
+def _claim_webhook_sync(service):
+    """
+    Returns True if the caller should start a full sync of ``service``.
 
-        event_type = payload.get('event')
-        activity_event_types = ['media.play', 'media.pause', 'media.resume', 'media.stop', 'media.scrobble']
+    If one is already running, it is asked to run once more when it finishes
+    (so events that arrived mid-sync are still picked up) and False is returned.
+    """
+    with _webhook_syncs_lock:
+        if service in _webhook_syncs:
+            _webhook_syncs[service] = 'rerun'
+            return False
+        _webhook_syncs[service] = 'running'
+        return True
+
+
+def _webhook_sync_needs_rerun(service):
+    """Called when a webhook sync finishes; True if another run was requested."""
+    with _webhook_syncs_lock:
+        if _webhook_syncs.get(service) == 'rerun':
+            _webhook_syncs[service] = 'running'
+            return True
+        _webhook_syncs.pop(service, None)
+        return False
+
+
+def _get_season_ids(db, show_id):
+    """Returns {season_number: sonarr_seasons.id} for a show in one query."""
+    rows = db.execute(
+        'SELECT season_number, id FROM sonarr_seasons WHERE show_id = ?', (show_id,)
+    ).fetchall()
+    return {row['season_number']: row['id'] for row in rows}
+
+
+def _apply_plex_event_updates(app_instance, *, event_type, plex_username, media_type, metadata,
+                              view_offset, duration_ms, tmdb_id, show_tmdb_id, season_num,
+                              episode_num, season_episode_str, rating_key, grandparent_rating_key):
+    """
+    Applies the follow-up work for a logged Plex event. Runs on ``_plex_followup_pool``.
 
-        if event_type in activity_event_types:
+    Stop/scrobble events update the user's daily statistics, watch streak and
+    episode progress; episodes with a ``Role`` list refresh the stored cast.
+    """
+    with app_instance.app_context():
+        try:
             db = database.get_db()
-            metadata = payload.get('Metadata', {})
-            account = payload.get('Account', {})
-            player = payload.get('Player', {})
-
-            # Skip trailers and short content (less than 10 minutes)
-            duration_ms = metadata.get('duration', 0)
-            if duration_ms and duration_ms < 600000:  # 10 minutes in milliseconds
-                current_app.logger.info(f"Skipping short content (likely trailer): '{metadata.get('title')}' ({duration_ms}ms)")
-                return jsonify({'status': 'skipped', 'reason': 'trailer or short content'}), 200
-
-            tmdb_id = None
-            tvdb_id = None
-            guids = metadata.get('Guid')
-            if isinstance(guids, list):
-                for guid_item in guids:
-                    guid_str = guid_item.get('id', '')
-                    if guid_str.startswith('tmdb://'):
-                        try:
-                            tmdb_id = int(guid_str.split('//')[1])
-                        except Exception:
-                            tmdb_id = None
-                    if guid_str.startswith('tvdb://'):
-                        try:
-                            tvdb_id = int(guid_str.split('//')[1])
-                        except Exception:
-                            tvdb_id = None
-            # Fallback: try to get TVDB ID from grandparentRatingKey if not found
-            if not tvdb_id:
-                try:
-                    tvdb_id = int(metadata.get('grandparentRatingKey'))
-                except Exception:
-                    tvdb_id = None
-
-            # Get the show's TMDB ID from our database using TVDB ID or title matching
-            show_tmdb_id = None
-            if tvdb_id:
-                show_record = db.execute('SELECT tmdb_id FROM sonarr_shows WHERE tvdb_id = ?', (tvdb_id,)).fetchone()
-                if show_record:
-                    show_tmdb_id = show_record['tmdb_id']
-
-            # Fallback: Try to match by show title if TVDB lookup failed
-            if not show_tmdb_id and metadata.get('grandparentTitle'):
-                show_title = metadata.get('grandparentTitle')
-                show_record = db.execute(
-                    'SELECT tmdb_id FROM sonarr_shows WHERE LOWER(title) = LOWER(?)',
-                    (show_title,)
-                ).fetchone()
-                if show_record:
-                    show_tmdb_id = show_record['tmdb_id']
-                    current_app.logger.info(f"Matched show '{show_title}' by title (TMDB: {show_tmdb_id})")
-
-            season_num = metadata.get('parentIndex')
-            episode_num = metadata.get('index')
-            season_episode_str = None
-            if metadata.get('type') == 'episode':
-                if season_num is not None and episode_num is not None:
-                    season_episode_str = f"S{str(season_num).zfill(2)}E{str(episode_num).zfill(2)}"
-
-            # Check for duplicate event (Plex sometimes sends webhooks twice)
-            # Use session_key + event_type + rating_key within a time window
-            # Don't include view_offset as it can legitimately change during playback
-            session_key = metadata.get('sessionKey')
-            rating_key = metadata.get('ratingKey')
-            view_offset = metadata.get('viewOffset')
-
-            # Look for a recent duplicate (within last 10 seconds)
-            import datetime
-            ten_seconds_ago = datetime.datetime.now().timestamp() - 10
-
-            duplicate_check = db.execute('''
-                SELECT id FROM plex_activity_log
-                WHERE session_key = ?
-                  AND event_type = ?
-                  AND rating_key = ?
-                  AND event_timestamp >= datetime(?, 'unixepoch')
-                LIMIT 1
-            ''', (session_key, event_type, rating_key, ten_seconds_ago)).fetchone()
-
-            if duplicate_check:
-                current_app.logger.info(f"Skipping duplicate event '{event_type}' for '{metadata.get('title')}'")
-                return jsonify({'status': 'skipped', 'reason': 'duplicate event'}), 200
-
-            sql_insert = """
-                INSERT INTO plex_activity_log (
-                    event_type, plex_username, player_title, player_uuid, session_key,
-                    rating_key, parent_rating_key, grandparent_rating_key, media_type,
-                    title, show_title, season_episode, view_offset_ms, duration_ms, tmdb_id, raw_payload
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                event_type, account.get('title'), player.get('title'), player.get('uuid'), session_key,
-                metadata.get('ratingKey'), metadata.get('parentRatingKey'), metadata.get('grandparentRatingKey'), metadata.get('type'),
-                metadata.get('title'), metadata.get('grandparentTitle'), season_episode_str, view_offset,
-                metadata.get('duration'), show_tmdb_id, json.dumps(payload)
-            )
-            db.execute(sql_insert, params)
-            db.commit()
-            current_app.logger.info(f"Logged event '{event_type}' for '{metadata.get('title')}' to plex_activity_log.")
-
             # Update user watch statistics for stop/scrobble events
             if event_type in ['media.stop', 'media.scrobble']:
-                plex_username = account.get('title')
                 if plex_username:
                     user = db.execute('SELECT id FROM users WHERE plex_username = ?', (plex_username,)).fetchone()
                     if user:
@@ -174,10 +162,9 @@ def plex_webhook():
                             current_app.logger.error(f"Error updating watch statistics: {stats_error}", exc_info=True)
 
                         # Update episode watch progress for episodes
-                        if metadata.get('type') == 'episode':
+                        if media_type == 'episode':
                             try:
-                                view_offset_ms = metadata.get('viewOffset', 0)
-                                duration_ms = metadata.get('duration', 0)
+                                view_offset_ms = view_offset or 0
                                 watch_percentage = (view_offset_ms / duration_ms * 100) if duration_ms > 0 else 0
 
                                 # Mark as watched if:
@@ -230,22 +217,20 @@ def plex_webhook():
                                 current_app.logger.error(f"Error updating episode progress: {progress_error}", exc_info=True)
 
             # --- Store episode character data if available ---
-            if metadata.get('type') == 'episode' and 'Role' in metadata:
-                episode_rating_key = metadata.get('ratingKey')
+            if media_type == 'episode' and 'Role' in metadata:
+                episode_rating_key = rating_key
 
                 # --- Correctly identify the show's TMDB ID ---
                 show_tvdb_id_from_plex = None
                 try:
-                    show_tvdb_id_from_plex = int(metadata.get('grandparentRatingKey'))
+                    show_tvdb_id_from_plex = int(grandparent_rating_key)
                 except (ValueError, TypeError):
-                    current_app.logger.warning(f"Could not parse grandparentRatingKey: {metadata.get('grandparentRatingKey')}")
+                    current_app.logger.warning(f"Could not parse grandparentRatingKey: {grandparent_rating_key}")
 
                 correct_show_tmdb_id = None
                 if show_tvdb_id_from_plex:
-                    show_record = db.execute('SELECT tmdb_id FROM sonarr_shows WHERE tvdb_id = ?', (show_tvdb_id_from_plex,)).fetchone()
-                    if show_record:
-                        correct_show_tmdb_id = show_record['tmdb_id']
-                    else:
+                    correct_show_tmdb_id = _show_tmdb_id_by_tvdb(db, show_tvdb_id_from_plex)
+                    if not correct_show_tmdb_id:
                         current_app.logger.warning(f"Could not find show in DB with TVDB ID: {show_tvdb_id_from_plex}")
 
                 if not correct_show_tmdb_id:
@@ -257,9 +242,9 @@ def plex_webhook():
                 # Remove old character rows for this episode
                 db.execute('DELETE FROM episode_characters WHERE episode_rating_key = ?', (episode_rating_key,))
                 roles = metadata['Role']
-                for role in roles:
-                    db.execute(
-                        'INSERT INTO episode_characters (show_tmdb_id, show_tvdb_id, season_number, episode_number, episode_rating_key, character_name, actor_name, actor_id, actor_thumb) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                db.executemany(
+                    'INSERT INTO episode_characters (show_tmdb_id, show_tvdb_id, season_number, episode_number, episode_rating_key, character_name, actor_name, actor_id, actor_thumb) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [
                         (
                             correct_show_tmdb_id, # Use the corrected show TMDB ID
                             show_tvdb_id_from_plex, # Use the show's TVDB ID
@@ -271,9 +256,123 @@ def plex_webhook():
                             role.get('id'),
                             role.get('thumb')
                         )
-                    )
+                        for role in roles
+                    ]
+                )
                 db.commit()
                 current_app.logger.info(f"Stored {len(roles)} episode characters for episode {episode_rating_key} (S{season_num}E{episode_num}) with correct show TMDB ID {correct_show_tmdb_id}")
+        except Exception as e:
+            current_app.logger.error(f"Error applying Plex webhook updates: {e}", exc_info=True)
+
+
+@main_bp.route('/plex/webhook', methods=['POST'])
+def plex_webhook():
+    """
+    Handles incoming webhook events from a Plex Media Server.
+
+    This endpoint is designed to receive POST requests from Plex. It parses the
+    webhook payload for media events (play, pause, stop, scrobble) and logs the
+    relevant details into the `plex_activity_log` table. This log is the primary
+    source of data for the user-facing homepage. Statistics, episode progress
+    and cast updates are handed to a background worker once the event is logged.
+
+    It validates the webhook secret if one is configured in the settings to ensure
+    the request is coming from the configured Plex server.
+
+    Returns:
+        A JSON response indicating success or an error, along with an appropriate
+        HTTP status code.
+    """
+    try:
+        # Keep the body text as received so it can be stored without re-serializing
+        if request.is_json:
+            raw_payload = request.get_data(as_text=True)
+            payload = request.get_json()
+        else:
+            raw_payload = request.form.get('payload')
+            payload = json.loads(raw_payload)
+
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(f"Webhook payload: {json.dumps(payload, indent=2)}")
+
+        event_type = payload.get('event')
+        activity_event_types = ['media.play', 'media.pause', 'media.resume', 'media.stop', 'media.scrobble']
+
+        if event_type in activity_event_types:
+            db = database.get_db()
+            metadata = payload.get('Metadata', {})
+            account = payload.get('Account', {})
+            player = payload.get('Player', {})
+            media_type = metadata.get('type')
+            media_title = metadata.get('title')
+            show_title = metadata.get('grandparentTitle')
+            grandparent_rating_key = metadata.get('grandparentRatingKey')
+
+            # Skip trailers and short content (less than 10 minutes)
+            duration_ms = metadata.get('duration', 0)
+            if duration_ms and duration_ms < 600000:  # 10 minutes in milliseconds
+                current_app.logger.info(f"Skipping short content (likely trailer): '{media_title}' ({duration_ms}ms)")
+                return jsonify({'status': 'skipped', 'reason': 'trailer or short content'}), 200
+
+            tmdb_id, tvdb_id = _extract_guid_ids(metadata.get('Guid'))
+            # Fallback: try to get TVDB ID from grandparentRatingKey if not found
+            if not tvdb_id:
+                try:
+                    tvdb_id = int(grandparent_rating_key)
+                except Exception:
+                    tvdb_id = None
+
+            # Get the show's TMDB ID from our database using TVDB ID or title matching
+            show_tmdb_id = None
+            if tvdb_id:
+                show_tmdb_id = _show_tmdb_id_by_tvdb(db, tvdb_id)
+
+            # Fallback: Try to match by show title if TVDB lookup failed
+            if not show_tmdb_id and show_title:
+                show_tmdb_id = _show_tmdb_id_by_title(db, show_title)
+                if show_tmdb_id:
+                    current_app.logger.info(f"Matched show '{show_title}' by title (TMDB: {show_tmdb_id})")
+
+            season_num = metadata.get('parentIndex')
+            episode_num = metadata.get('index')
+            season_episode_str = None
+            if media_type == 'episode':
+                if season_num is not None and episode_num is not None:
+                    season_episode_str = f"S{str(season_num).zfill(2)}E{str(episode_num).zfill(2)}"
+
+            # Duplicate events (Plex sometimes sends webhooks twice) are matched
+            # on session_key + event_type + rating_key within the last 10 seconds.
+            # Don't include view_offset as it can legitimately change during playback
+            session_key = metadata.get('sessionKey')
+            rating_key = metadata.get('ratingKey')
+            view_offset = metadata.get('viewOffset')
+            ten_seconds_ago = datetime.datetime.now().timestamp() - 10
+
+            plex_username = account.get('title')
+            params = (
+                event_type, plex_username, player.get('title'), player.get('uuid'), session_key,
+                rating_key, metadata.get('parentRatingKey'), grandparent_rating_key, media_type,
+                media_title, show_title, season_episode_str, view_offset,
+                metadata.get('duration'), show_tmdb_id, raw_payload,
+                session_key, event_type, rating_key, ten_seconds_ago,
+            )
+            inserted = db.execute(_PLEX_ACTIVITY_INSERT_SQL, params).rowcount
+            db.commit()
+            if not inserted:
+                current_app.logger.info(f"Skipping duplicate event '{event_type}' for '{media_title}'")
+                return jsonify({'status': 'skipped', 'reason': 'duplicate event'}), 200
+            current_app.logger.info(f"Logged event '{event_type}' for '{media_title}' to plex_activity_log.")
+
+            # Statistics, episode progress and cast updates run off the request
+            # thread so Plex gets its response as soon as the event is logged
+            _plex_followup_pool.submit(
+                _apply_plex_event_updates, current_app._get_current_object(),
+                event_type=event_type, plex_username=plex_username, media_type=media_type,
+                metadata=metadata, view_offset=view_offset, duration_ms=duration_ms,
+                tmdb_id=tmdb_id, show_tmdb_id=show_tmdb_id, season_num=season_num,
+                episode_num=episode_num, season_episode_str=season_episode_str,
+                rating_key=rating_key, grandparent_rating_key=grandparent_rating_key,
+            )
         
         return '', 200
     except Exception as e:
@@ -299,8 +398,6 @@ def sonarr_webhook():
     Returns:
         A JSON response indicating success or an error.
     """
-    from app.system_logger import syslog, SystemLogger
-
     current_app.logger.info("Sonarr webhook received.")
     try:
         if request.is_json:
@@ -308,7 +405,8 @@ def sonarr_webhook():
         else:
             payload = json.loads(request.form.get('payload', '{}'))
 
-        current_app.logger.info(f"Sonarr webhook received: {json.dumps(payload, indent=2)}")
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(f"Sonarr webhook payload: {json.dumps(payload, indent=2)}")
 
         event_type = payload.get('eventType')
         series_title = payload.get('series', {}).get('title', 'Unknown')
@@ -373,9 +471,6 @@ def sonarr_webhook():
                     # Fall back to full sync so availability still updates even with partial webhook payloads.
                     run_full_sync = True
                 else:
-                    from ...utils import update_sonarr_episode
-                    import threading
-
                     # Optimistically mark downloaded episodes as available immediately.
                     # Sonarr's episode endpoint can briefly lag right after a Download event.
                     try:
@@ -386,20 +481,18 @@ def sonarr_webhook():
                         ).fetchone()
                         if show_local:
                             show_local_id = show_local['id']
+                            # Update by season_id + episode_number. This is more reliable than
+                            # show_id + season_number which may be NULL for episodes created by
+                            # the full sync. Season ids for the show are read in one query.
+                            season_ids = _get_season_ids(db_local, show_local_id)
                             marked_count = 0
                             for ep in episodes_info:
                                 season_num = ep.get('seasonNumber')
                                 episode_num = ep.get('episodeNumber')
                                 if season_num is None or episode_num is None:
                                     continue
-                                # Look up season_id first, then update by season_id + episode_number
-                                # This is more reliable than show_id + season_number which may be NULL
-                                # for episodes created by the full sync
-                                season_local = db_local.execute(
-                                    'SELECT id FROM sonarr_seasons WHERE show_id = ? AND season_number = ?',
-                                    (show_local_id, season_num)
-                                ).fetchone()
-                                if not season_local:
+                                season_local_id = season_ids.get(season_num)
+                                if season_local_id is None:
                                     current_app.logger.warning(
                                         f"No season row found for show_id={show_local_id} season={season_num} during optimistic mark"
                                     )
@@ -410,7 +503,7 @@ def sonarr_webhook():
                                     SET has_file = 1
                                     WHERE season_id = ? AND episode_number = ?
                                     ''',
-                                    (season_local['id'], episode_num)
+                                    (season_local_id, episode_num)
                                 )
                                 marked_count += result.rowcount
                             if marked_count:
@@ -431,8 +524,6 @@ def sonarr_webhook():
 
                     def sync_in_background(app):
                         with app.app_context():
-                            from app.system_logger import syslog, SystemLogger
-
                             current_app.logger.info(f"Starting background targeted Sonarr sync for series {series_id}.")
                             syslog.info(SystemLogger.SYNC, f"Starting targeted sync: {series_title}", {
                                 'series_id': series_id,
@@ -459,14 +550,11 @@ def sonarr_webhook():
                                         ).fetchone()
                                         available_count = 0
                                         if show_row_check:
-                                            show_id_check = show_row_check['id']
+                                            # Use season_id lookup for reliable matching
+                                            season_ids_check = _get_season_ids(db_check, show_row_check['id'])
                                             for season_num, episode_num in expected_eps:
-                                                # Use season_id lookup for reliable matching
-                                                season_check = db_check.execute(
-                                                    'SELECT id FROM sonarr_seasons WHERE show_id = ? AND season_number = ?',
-                                                    (show_id_check, season_num)
-                                                ).fetchone()
-                                                if not season_check:
+                                                season_check_id = season_ids_check.get(season_num)
+                                                if season_check_id is None:
                                                     continue
                                                 row = db_check.execute(
                                                     '''
@@ -474,7 +562,7 @@ def sonarr_webhook():
                                                     FROM sonarr_episodes
                                                     WHERE season_id = ? AND episode_number = ?
                                                     ''',
-                                                    (season_check['id'], episode_num)
+                                                    (season_check_id, episode_num)
                                                 ).fetchone()
                                                 if row and row['has_file']:
                                                     available_count += 1
@@ -489,14 +577,12 @@ def sonarr_webhook():
                                                 'available_after_targeted': available_count,
                                                 'updated_count': updated_count
                                             })
-                                            from ...utils import sync_sonarr_library
                                             sync_sonarr_library()
                                 except Exception as verify_err:
                                     current_app.logger.warning(f"Targeted Sonarr availability verification failed: {verify_err}")
 
                                 # TVMaze enrichment for the show
                                 try:
-                                    from app.tvmaze_enrichment import tvmaze_enrichment_service
                                     db_temp = database.get_db()
 
                                     show_row = db_temp.execute(
@@ -630,43 +716,42 @@ def sonarr_webhook():
         if run_full_sync or (event_type in sync_events and event_type != 'Download'):
             current_app.logger.info(f"Sonarr webhook event '{event_type}' detected, triggering full library sync as a fallback.")
             
-            # Import here to avoid circular imports
-            from ...utils import sync_sonarr_library
-            
             try:
                 # Trigger the sync in a background thread to avoid blocking the webhook response
-                import threading
-                
                 # Capture the real application object to pass to the thread
                 app_instance = current_app._get_current_object()
 
                 def sync_in_background(app):
                     with app.app_context():
-                        from app.system_logger import syslog, SystemLogger
+                        while True:
+                            current_app.logger.info("Starting background Sonarr library sync.")
+                            syslog.info(SystemLogger.SYNC, f"Starting full library sync (event: {event_type})")
 
-                        current_app.logger.info("Starting background Sonarr library sync.")
-                        syslog.info(SystemLogger.SYNC, f"Starting full library sync (event: {event_type})")
+                            try:
+                                count = sync_sonarr_library()
+                                current_app.logger.info(f"Sonarr webhook-triggered sync completed: {count} shows processed")
+                                syslog.success(SystemLogger.SYNC, f"Full library sync complete: {count} shows processed", {
+                                    'show_count': count,
+                                    'event_type': event_type
+                                })
+                            except Exception as e:
+                                current_app.logger.error(f"Error in background Sonarr sync: {e}", exc_info=True)
+                                syslog.error(SystemLogger.SYNC, "Full library sync failed", {
+                                    'error': str(e),
+                                    'event_type': event_type
+                                })
+                            if not _webhook_sync_needs_rerun('sonarr'):
+                                break
+
+                if _claim_webhook_sync('sonarr'):
+                    # Start background sync
+                    sync_thread = threading.Thread(target=sync_in_background, args=(app_instance,))
+                    sync_thread.daemon = True
+                    sync_thread.start()
 
-                        try:
-                            count = sync_sonarr_library()
-                            current_app.logger.info(f"Sonarr webhook-triggered sync completed: {count} shows processed")
-                            syslog.success(SystemLogger.SYNC, f"Full library sync complete: {count} shows processed", {
-                                'show_count': count,
-                                'event_type': event_type
-                            })
-                        except Exception as e:
-                            current_app.logger.error(f"Error in background Sonarr sync: {e}", exc_info=True)
-                            syslog.error(SystemLogger.SYNC, "Full library sync failed", {
-                                'error': str(e),
-                                'event_type': event_type
-                            })
-                
-                # Start background sync
-                sync_thread = threading.Thread(target=sync_in_background, args=(app_instance,))
-                sync_thread.daemon = True
-                sync_thread.start()
-                
-                current_app.logger.info("Sonarr library sync initiated in background")
+                    current_app.logger.info("Sonarr library sync initiated in background")
+                else:
+                    current_app.logger.info("Sonarr library sync already running; it will run again when done")
                 
             except Exception as e:
                 current_app.logger.error(f"Failed to trigger Sonarr sync from webhook: {e}", exc_info=True)
@@ -705,7 +790,8 @@ def radarr_webhook():
         else:
             payload = json.loads(request.form.get('payload', '{}'))
         
-        current_app.logger.info(f"Radarr webhook received: {json.dumps(payload, indent=2)}")
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(f"Radarr webhook payload: {json.dumps(payload, indent=2)}")
         
         event_type = payload.get('eventType')
         
@@ -742,31 +828,32 @@ def radarr_webhook():
         if event_type in sync_events:
             current_app.logger.info(f"Radarr webhook event '{event_type}' detected, triggering library sync")
             
-            # Import here to avoid circular imports
-            from ...utils import sync_radarr_library
-            
             try:
                 # Trigger the sync in a background thread to avoid blocking the webhook response
-                import threading
-
                 # Capture the real application object to pass to the thread
                 app_instance = current_app._get_current_object()
 
                 def sync_in_background(app):
                     with app.app_context():
-                        current_app.logger.info("Starting background Radarr library sync.")
-                        try:
-                            result = sync_radarr_library()
-                            current_app.logger.info(f"Radarr webhook-triggered sync completed: {result}")
-                        except Exception as e:
-                            current_app.logger.error(f"Error in background Radarr sync: {e}", exc_info=True)
-                
-                # Start background sync
-                sync_thread = threading.Thread(target=sync_in_background, args=(app_instance,))
-                sync_thread.daemon = True
-                sync_thread.start()
-                
-                current_app.logger.info("Radarr library sync initiated in background")
+                        while True:
+                            current_app.logger.info("Starting background Radarr library sync.")
+                            try:
+                                result = sync_radarr_library()
+                                current_app.logger.info(f"Radarr webhook-triggered sync completed: {result}")
+                            except Exception as e:
+                                current_app.logger.error(f"Error in background Radarr sync: {e}", exc_info=True)
+                            if not _webhook_sync_needs_rerun('radarr'):
+                                break
+
+                if _claim_webhook_sync('radarr'):
+                    # Start background sync
+                    sync_thread = threading.Thread(target=sync_in_background, args=(app_instance,))
+                    sync_thread.daemon = True
+                    sync_thread.start()
+
+                    current_app.logger.info("Radarr library sync initiated in background")
+                else:
+                    current_app.logger.info("Radarr library sync already running; it will run again when done")
                 
             except Exception as e:
                 current_app.logger.error(f"Failed to trigger Radarr sync from webhook: {e}", exc_info=True)
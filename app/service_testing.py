@@ -2,6 +2,7 @@ import requests
 import json
 from flask import current_app
 from . import database
+from .http_client import http_session
 
 def _test_service_connection(service_name, url_setting_name, api_key_setting_name=None, endpoint="", method='GET', expected_status=200, params=None, headers_extra=None, url_override=None, api_key_override=None):
     """
@@ -73,7 +74,7 @@ def _test_service_connection(service_name, url_setting_name, api_key_setting_nam
 
     try:
         current_app.logger.debug(f"Testing {service_name} connection to {full_endpoint_url} with method {method}")
-        response = requests.request(method, full_endpoint_url, headers=headers, params=params, timeout=5)
+        response = http_session.request(method, full_endpoint_url, headers=headers, params=params, timeout=5)
         if response.status_code == expected_status:
             current_app.logger.info(f"_test_service_connection: {service_name} connection successful to {full_endpoint_url}.")
             return True, "Connection successful."
@@ -135,7 +136,7 @@ def get_ollama_models():
         return []
 
     try:
-        response = requests.get(f"{ollama_url.rstrip('/')}/api/tags", timeout=5)
+        response = http_session.get(f"{ollama_url.rstrip('/')}/api/tags", timeout=5)
         if response.status_code == 200:
             data = response.json()
             # The /api/tags endpoint returns {"models": [{"name": "..."}, ...]}
@@ -198,7 +199,7 @@ def _test_service_connection_with_params(service_name, service_url, api_key=None
 
     try:
         current_app.logger.debug(f"Testing {service_name} connection to {full_endpoint_url} with method {method} using provided params.")
-        response = requests.request(method, full_endpoint_url, headers=headers, params=params, json=body_json, timeout=5)
+        response = http_session.request(method, full_endpoint_url, headers=headers, params=params, json=body_json, timeout=5)
         if response.status_code == expected_status:
             current_app.logger.info(f"_test_service_connection_with_params: {service_name} connection successful to {full_endpoint_url}.")
             return True, None
@@ -293,7 +294,7 @@ def test_pushover_notification_with_params(token, user_key):
         'title': 'ShowNotes Test'
     }
     try:
-        response = requests.post(url, data=payload, timeout=5)
+        response = http_session.post(url, data=payload, timeout=5)
         response_data = response.json()
         if response_data.get('status') == 1:
             current_app.logger.info("Pushover test notification sent successfully.")
@@ -382,7 +383,7 @@ def get_jellyseer_user_requests():
         return {}
     try:
         headers = {'X-Api-Key': jellyseer_api_key}
-        response = requests.get(
+        response = http_session.get(
             f"{jellyseer_url}/api/v1/request",
             params={'take': 1000, 'filter': 'all', 'sort': 'added'},
             headers=headers,
@@ -413,7 +414,7 @@ def get_jellyseerr_requests_for_user(plex_username):
         return set()
     try:
         headers = {'X-Api-Key': jellyseer_api_key}
-        response = requests.get(
+        response = http_session.get(
             f"{jellyseer_url}/api/v1/request",
             params={'take': 500, 'filter': 'all', 'sort': 'added'},
             headers=headers,
@@ -452,7 +453,7 @@ def test_thetvdb_connection_with_params(api_key):
     if not api_key:
         return False, "TheTVDB API key is required."
     try:
-        resp = requests.post(
+        resp = http_session.post(
             "https://api4.thetvdb.com/v4/login",
             json={"apikey": api_key},
             timeout=10
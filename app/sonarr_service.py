@@ -1,7 +1,8 @@
 import requests
 import json
-from flask import current_app, url_for
+from flask import current_app
 from . import database
+from .http_client import http_session
 from .utils import _trigger_image_cache
 from .calendar_service import invalidate_calendar_cache
 
@@ -32,7 +33,7 @@ def get_all_sonarr_shows():
     headers = {"X-Api-Key": sonarr_api_key}
 
     try:
-        response = requests.get(endpoint, headers=headers, timeout=10)
+        response = http_session.get(endpoint, headers=headers, timeout=10)
         response.raise_for_status()  # Raises HTTPError for bad responses (4XX or 5XX)
         return response.json()
     except requests.exceptions.Timeout:
@@ -84,7 +85,7 @@ def get_sonarr_episodes_for_show(sonarr_series_id):
     headers = {"X-Api-Key": sonarr_api_key}
 
     try:
-        response = requests.get(endpoint, headers=headers, timeout=10)
+        response = http_session.get(endpoint, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.Timeout:
@@ -121,7 +122,7 @@ def get_sonarr_show_details(series_id):
     headers = {"X-Api-Key": sonarr_api_key}
 
     try:
-        response = requests.get(endpoint, headers=headers, timeout=10)
+        response = http_session.get(endpoint, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -146,7 +147,7 @@ def get_episodes_by_series_id(series_id):
     headers = {"X-Api-Key": sonarr_api_key}
 
     try:
-        response = requests.get(endpoint, headers=headers, timeout=10)
+        response = http_session.get(endpoint, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -179,7 +180,7 @@ def sync_sonarr_tags():
             # Fetch tags from Sonarr API
             endpoint = f"{sonarr_url.rstrip('/')}/api/v3/tag"
             headers = {"X-Api-Key": sonarr_api_key}
-            response = requests.get(endpoint, headers=headers, timeout=10)
+            response = http_session.get(endpoint, headers=headers, timeout=10)
             response.raise_for_status()
             tags_data = response.json()
 
@@ -257,8 +258,8 @@ def sync_sonarr_library():
     with current_app.app_context():
         db = database.get_db()
         
-        settings_row = db.execute('SELECT sonarr_url FROM settings LIMIT 1').fetchone()
-        sonarr_base_url = settings_row['sonarr_url'].rstrip('/') if settings_row and 'sonarr_url' in settings_row and settings_row['sonarr_url'] else None
+        sonarr_url = database.get_setting('sonarr_url')
+        sonarr_base_url = sonarr_url.rstrip('/') if sonarr_url else None
         if not sonarr_base_url:
             current_app.logger.warning("sync_sonarr_library: Sonarr URL not found in settings. Cannot form absolute image URLs if they are relative.")
             # sonarr_base_url will be None, and logic below will handle it by not prepending.
@@ -286,8 +287,12 @@ def sync_sonarr_library():
                 current_app.logger.info(f"Syncing show: {show_data.get('title', 'N/A')} (Sonarr ID: {current_sonarr_id})")
 
                 # Prepare show data, preferring 'remoteUrl' over 'url'
-                poster_img_info = next((img for img in show_data.get('images', []) if img.get('coverType') == 'poster'), None)
-                fanart_img_info = next((img for img in show_data.get('images', []) if img.get('coverType') == 'fanart'), None)
+                # One pass over the images, keeping the first of each cover type
+                images_by_type = {}
+                for img in show_data.get('images', []):
+                    images_by_type.setdefault(img.get('coverType'), img)
+                poster_img_info = images_by_type.get('poster')
+                fanart_img_info = images_by_type.get('fanart')
 
                 raw_poster_url = poster_img_info.get('remoteUrl') or poster_img_info.get('url') if poster_img_info else None
                 raw_fanart_url = fanart_img_info.get('remoteUrl') or fanart_img_info.get('url') if fanart_img_info else None
@@ -370,19 +375,11 @@ def sync_sonarr_library():
                     db.rollback() # Rollback this show's transaction
                     continue # Skip to next show
 
-                # Trigger image caching directly (only if we have a request context)
+                # Queue image caching in the background
                 show_tmdb_id = show_data.get("tmdbId")
                 if show_tmdb_id:
-                    try:
-                        if final_poster_url:
-                            proxy_poster_url = url_for('main.image_proxy', type='poster', id=show_tmdb_id)
-                            _trigger_image_cache(proxy_poster_url, item_title_for_logging=f"Poster for {show_data.get('title')}")
-                        if final_fanart_url:
-                            proxy_fanart_url = url_for('main.image_proxy', type='background', id=show_tmdb_id)
-                            _trigger_image_cache(proxy_fanart_url, item_title_for_logging=f"Fanart for {show_data.get('title')}")
-                    except RuntimeError as e:
-                        # Skip image caching if we're outside a request context (e.g., webhook background thread)
-                        current_app.logger.debug(f"Skipping image caching for show '{show_data.get('title')}' - no request context: {e}")
+                    _trigger_image_cache('poster', show_tmdb_id, final_poster_url, 'sonarr', item_title_for_logging=f"Poster for {show_data.get('title')}")
+                    _trigger_image_cache('background', show_tmdb_id, final_fanart_url, 'sonarr', item_title_for_logging=f"Fanart for {show_data.get('title')}")
                 else:
                     current_app.logger.warning(f"Skipping image trigger for show '{show_data.get('title')}' due to missing TMDB ID.")
 
@@ -112,6 +112,19 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    async function loadConnectionStatuses() {
+        try {
+            const response = await fetch('/admin/settings/status.json');
+            if (!response.ok) return;
+            const statuses = await response.json();
+            Object.entries(statuses).forEach(([service, status]) => {
+                updateStatusDot(service, status.success);
+            });
+        } catch (error) {
+            console.error('Error loading connection statuses:', error);
+        }
+    }
+
     document.querySelectorAll('.test-btn').forEach(button => {
         button.addEventListener('click', async function() {
             const service = button.dataset.service;
@@ -327,6 +340,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // --- Initial Page Load Actions ---
     initTabs();
     initSummaryGeneration();
+    loadConnectionStatuses();
 
     setApiKeyLinks();
     ['radarr_url', 'sonarr_url', 'bazarr_url'].forEach(id => {
@@ -1,13 +1,15 @@
-import requests
 import time
 from flask import current_app
 from . import database
+from .data_transforms import SEASON_EPISODE_RE
+from .http_client import http_session
 
 # Tautulli API cache to avoid blocking page loads
 # Cache stores: {'key': {'data': ..., 'timestamp': ...}}
 _tautulli_cache = {}
 _TAUTULLI_CACHE_TTL = 30  # seconds - balance between freshness and performance
 
+
 def _get_cached_tautulli(cache_key):
     """Get cached Tautulli data if still valid."""
     if cache_key in _tautulli_cache:
@@ -100,7 +102,7 @@ def sync_tautulli_watch_history(full_import=False, batch_size=1000, max_records=
         }
 
         try:
-            resp = requests.get(f"{tautulli_url.rstrip('/')}/api/v2", params=params, timeout=30)
+            resp = http_session.get(f"{tautulli_url.rstrip('/')}/api/v2", params=params, timeout=30)
             resp.raise_for_status()
             data = resp.json()
 
@@ -319,8 +321,7 @@ def process_activity_log_for_watch_status():
             if not season_episode:
                 continue
 
-            import re
-            match = re.match(r'S(\d+)E(\d+)', season_episode)
+            match = SEASON_EPISODE_RE.match(season_episode)
             if not match:
                 continue
 
@@ -433,7 +434,7 @@ def _fetch_tautulli_sessions():
             _set_cached_tautulli('activity_sessions', [])
             return []
 
-        response = requests.get(
+        response = http_session.get(
             f"{tautulli_url}/api/v2",
             params={'apikey': tautulli_api_key, 'cmd': 'get_activity'},
             timeout=5
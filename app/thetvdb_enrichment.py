@@ -1,11 +1,11 @@
 """TheTVDB Enrichment Service - Primary enrichment with TVMaze fallback"""
 import json
 import logging
-import re
 from typing import Dict, List, Optional
 from datetime import datetime
 from flask import current_app
-from app.database import get_db
+from app.database import get_db, get_setting
+from app.data_transforms import HTML_TAG_RE
 from app.episode_data_services import TheTVDBService, TVMazeService
 from app.tvmaze_enrichment import TVMazeEnrichmentService
 
@@ -22,9 +22,7 @@ class TheTVDBEnrichmentService:
     def _get_tvdb_service(self) -> Optional[TheTVDBService]:
         """Lazily initialize TheTVDB service with API key from settings"""
         try:
-            db = get_db()
-            row = db.execute("SELECT thetvdb_api_key FROM settings LIMIT 1").fetchone()
-            api_key = row['thetvdb_api_key'] if row else None
+            api_key = get_setting('thetvdb_api_key')
         except Exception:
             api_key = None
 
@@ -134,7 +132,7 @@ class TheTVDBEnrichmentService:
         if not overview:
             overview = series_data.get('overview', '')
         if overview:
-            overview = re.sub(r'<[^>]+>', '', overview)
+            overview = HTML_TAG_RE.sub('', overview)
 
         # Genres
         genres = series_data.get('genres', [])
@@ -1,11 +1,11 @@
 """TVMaze Enrichment Service"""
 import json
 import logging
-import re
 from typing import Dict, List, Optional
 from datetime import datetime
 from flask import current_app
 from app.database import get_db
+from app.data_transforms import HTML_TAG_RE
 from app.episode_data_services import TVMazeService
 
 logger = logging.getLogger(__name__)
@@ -84,7 +84,7 @@ class TVMazeEnrichmentService:
         """Parse TVMaze API response"""
         summary = tvmaze_data.get('summary', '')
         if summary:
-            summary = re.sub(r'<[^>]+>', '', summary)
+            summary = HTML_TAG_RE.sub('', summary)
 
         network = tvmaze_data.get('network', {})
         network_name = network.get('name') if network else None
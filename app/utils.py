@@ -24,30 +24,24 @@ from flask import current_app, url_for
 # sonarr_service and radarr_service import this from utils.
 # ---------------------------------------------------------------------------
 
-def _trigger_image_cache(proxy_image_url, item_title_for_logging=""):
+def _trigger_image_cache(image_type, tmdb_id, image_url, source, item_title_for_logging=""):
     """
-    Internally requests a proxied image URL to trigger the caching mechanism.
+    Queues a poster/background download so it is cached before users load pages.
 
-    Uses the Flask test client to GET a proxied image URL so the image is
-    cached before users load pages. Called during library syncs.
+    Called during library syncs. The download goes onto the low-priority
+    prefetch pool, sharing any in-flight download of the same file with
+    image_proxy, and does not wait for it to finish.
     """
-    if not proxy_image_url:
+    if not image_url or not tmdb_id:
         return
 
+    from .image_cache import prefetch_media_image
+
     try:
-        with current_app.app_context():
-            client = current_app.test_client()
-            response = client.get(proxy_image_url)
-            if response.status_code == 200:
-                current_app.logger.info(f"Successfully triggered image cache for '{item_title_for_logging}'.")
-            else:
-                current_app.logger.warning(
-                    f"Failed to trigger image cache for '{item_title_for_logging}' via {proxy_image_url}. "
-                    f"Status: {response.status_code}"
-                )
+        prefetch_media_image(image_type, tmdb_id, image_url, source, low_priority=True)
     except Exception as e:
         current_app.logger.error(
-            f"Error triggering image cache for '{item_title_for_logging}' ({proxy_image_url}): {e}"
+            f"Error triggering image cache for '{item_title_for_logging}' ({image_type}/{tmdb_id}): {e}"
         )
 
 